@@ -0,0 +1,118 @@
+"""
+Banc d'essai de la lecture CSV en flux
+Description: Rejoue une sortie ConvertTo-Csv enregistrée de 10k programmes
+(noms avec virgules, guillemets et retours à la ligne) et compare l'ancien
+analyseur (subprocess.run puis ligne.split(",")) à lire_csv_processus :
+délai avant la première ligne, durée totale et lignes mal découpées.
+
+    python benchmarks/bench_csv.py [--programmes 10000] [--debit 20000]
+
+--debit limite la sortie rejouée à N lignes par seconde (0 : sans limite),
+comme un PowerShell qui écrit au fil de la lecture du registre.
+"""
+
+import argparse
+import csv
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from systeme import lire_csv_processus  # noqa: E402
+
+# Rejoue le fichier argv[1] à argv[2] lignes par seconde au plus
+REJOUER = """
+import sys, time
+debit = int(sys.argv[2])
+debut = time.perf_counter()
+for i, ligne in enumerate(open(sys.argv[1], encoding="utf-8", newline="")):
+    sys.stdout.write(ligne)
+    if debit and i % 100 == 0:
+        sys.stdout.flush()
+        retard = i / debit - (time.perf_counter() - debut)
+        if retard > 0:
+            time.sleep(retard)
+"""
+
+
+def generer(nb):
+    """Sortie de Get-ItemProperty | ConvertTo-Csv pour nb programmes."""
+    aleatoire = random.Random(42)
+    tampon = io.StringIO(newline="")
+    ecrivain = csv.writer(tampon, quoting=csv.QUOTE_ALL, lineterminator="\r\n")
+    ecrivain.writerow(["DisplayName", "DisplayVersion", "InstallLocation"])
+    for i in range(nb):
+        nom = f"Programme {i}"
+        tirage = aleatoire.random()
+        if tirage < 0.05:
+            nom = f"Microsoft Visual C++ 2015-2022, x{i}"
+        elif tirage < 0.06:
+            nom = f'Outil "{i}"'
+        elif tirage < 0.065:
+            nom = f"Programme\r\n{i}"
+        ecrivain.writerow([nom, f"{i % 30}.{i % 7}.{i}", f"C:\\Program Files\\P{i}"])
+    return tampon.getvalue()
+
+
+def ancien(cmd):
+    debut = time.perf_counter()
+    resultat = subprocess.run(cmd, capture_output=True, text=True)
+    premier = None
+    programmes = []
+    lignes = [l for l in resultat.stdout.splitlines()
+              if l.strip() and not l.startswith("DisplayName")]
+    for ligne in lignes:
+        parts = ligne.split(",")
+        programmes.append((parts[0].strip('"'),
+                           parts[1].strip('"') if len(parts) > 1 else "",
+                           parts[2].strip('"') if len(parts) > 2 else ""))
+        if premier is None:
+            premier = time.perf_counter() - debut
+    return premier, time.perf_counter() - debut, programmes
+
+
+def flux(cmd):
+    debut = time.perf_counter()
+    premier = None
+    programmes = []
+    for ligne in lire_csv_processus(cmd):
+        programmes.append(tuple(ligne))
+        if premier is None:
+            premier = time.perf_counter() - debut
+    return premier, time.perf_counter() - debut, programmes
+
+
+def main():
+    parseur = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parseur.add_argument("--programmes", type=int, default=10_000)
+    parseur.add_argument("--debit", type=int, default=20_000)
+    args = parseur.parse_args()
+
+    texte = generer(args.programmes)
+    reference = [tuple(v.replace("\r\n", "\n") for v in ligne)
+                 for ligne in list(csv.reader(io.StringIO(texte, newline="")))[1:]]
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8",
+                                     newline="", delete=False) as f:
+        f.write(texte)
+    try:
+        cmd = [sys.executable, "-c", REJOUER, f.name, str(args.debit)]
+        print(f"{args.programmes} programmes, {len(texte) / 1024:.0f} Ko, "
+              f"{args.debit or 'sans limite'} lignes/s")
+        print(f"{'analyseur':22s} {'1re ligne':>10s} {'total':>8s} {'lignes':>7s} {'fausses':>8s}")
+        for nom, mesure in (("split(',')", ancien), ("lire_csv_processus", flux)):
+            premier, total, programmes = mesure(cmd)
+            # Lignes absentes de la référence (noms coupés, lignes en trop)
+            fausses = sum((Counter(programmes) - Counter(reference)).values())
+            print(f"{nom:22s} {premier:9.3f}s {total:7.3f}s {len(programmes):7d} {fausses:8d}")
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
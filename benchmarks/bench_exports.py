@@ -0,0 +1,47 @@
+"""
+Banc d'essai des exports de données
+Description: Débit d'ExportDonnees pour chaque format disponible (CSV, JSON
+Lines, gzip, zstd, Parquet) sur un jeu de --lignes lignes de 3 colonnes
+(texte, texte, entier), écrit dans --dossier, avec la taille du fichier.
+
+    python benchmarks/bench_exports.py [--lignes 1000000] [--dossier CHEMIN]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from exports import ENTIER, TEXTE, ExportDonnees, JeuDonnees, formats_disponibles  # noqa: E402
+
+
+def jeu(nb):
+    lignes = ((f"Programme {i}", f"C:\\Program Files\\Éditeur {i % 997}\\p{i}", i * 4096)
+              for i in range(nb))
+    return JeuDonnees("Banc d'essai", ["nom", "chemin", "taille"], lignes, nb,
+                      [TEXTE, TEXTE, ENTIER])
+
+
+def main():
+    parseur = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parseur.add_argument("--lignes", type=int, default=1_000_000)
+    parseur.add_argument("--dossier", default=tempfile.gettempdir())
+    args = parseur.parse_args()
+
+    print(f"{'format':18s} {'durée':>8s} {'lignes/s':>12s} {'taille':>10s}")
+    for libelle, extension in formats_disponibles():
+        fichier = os.path.join(args.dossier, f"bench_exports{extension}")
+        debut = time.perf_counter()
+        ExportDonnees(fichier, jeu(args.lignes)).executer()
+        duree = time.perf_counter() - debut
+        taille = os.path.getsize(fichier)
+        os.remove(fichier)
+        print(f"{libelle:18s} {duree:7.2f}s {args.lignes / duree:>12,.0f} "
+              f"{taille / 1024**2:8.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Banc d'essai des modèles de tables
+Description: Temps de chargement et de tri de ModeleGrosFichiers (stockage
+par colonnes, tri sur les octets) à 10k, 100k et 1M lignes, comparés à
+l'ancien QTableWidget (un QTableWidgetItem par cellule, tri sur le texte
+"1.20 Go") jusqu'à --max-widget lignes.
+
+    python benchmarks/bench_modeles.py [--lignes 10000,100000,1000000] [--max-widget 100000]
+
+Sans écran, lancer avec QT_QPA_PLATFORM=offscreen.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from PyQt5.QtCore import Qt  # noqa: E402
+from PyQt5.QtWidgets import QApplication, QTableView, QTableWidget, QTableWidgetItem  # noqa: E402
+
+from modeles import ModeleGrosFichiers, formater_horodatage, formater_taille_mo_go  # noqa: E402
+
+
+def generer(nb):
+    aleatoire = random.Random(42)
+    return [(f"fichier_{i}.bin", f"C:\\Données\\{i % 997}\\fichier_{i}.bin",
+             aleatoire.randrange(1, 50 * 1024**3), 1.6e9 + aleatoire.random() * 1e8)
+            for i in range(nb)]
+
+
+def chrono(fonction):
+    debut = time.perf_counter()
+    fonction()
+    return time.perf_counter() - debut
+
+
+def mesurer_modele(lignes):
+    modele = ModeleGrosFichiers()
+    vue = QTableView()
+    vue.setModel(modele)
+    charge = chrono(lambda: modele.definir_lignes(lignes))
+    tri_taille = chrono(lambda: modele.sort(2, Qt.DescendingOrder))
+    tri_nom = chrono(lambda: modele.sort(0, Qt.AscendingOrder))
+    return charge, tri_taille, tri_nom
+
+
+def mesurer_widget(lignes):
+    table = QTableWidget()
+    table.setColumnCount(4)
+
+    def charger():
+        table.setRowCount(len(lignes))
+        for i, (nom, chemin, taille, mtime) in enumerate(lignes):
+            table.setItem(i, 0, QTableWidgetItem(nom))
+            table.setItem(i, 1, QTableWidgetItem(chemin))
+            table.setItem(i, 2, QTableWidgetItem(formater_taille_mo_go(taille)))
+            table.setItem(i, 3, QTableWidgetItem(formater_horodatage(mtime)))
+
+    charge = chrono(charger)
+    tri_taille = chrono(lambda: table.sortItems(2, Qt.DescendingOrder))
+    tri_nom = chrono(lambda: table.sortItems(0, Qt.AscendingOrder))
+    return charge, tri_taille, tri_nom
+
+
+def main():
+    parseur = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parseur.add_argument("--lignes", default="10000,100000,1000000")
+    parseur.add_argument("--max-widget", type=int, default=100_000)
+    args = parseur.parse_args()
+    app = QApplication(sys.argv)  # noqa: F841
+
+    print(f"{'lignes':>9s} {'table':14s} {'chargement':>11s} {'tri taille':>11s} {'tri nom':>9s}")
+    for nb in (int(n) for n in args.lignes.split(",")):
+        lignes = generer(nb)
+        mesures = [("ModeleColonnes", mesurer_modele(lignes))]
+        if nb <= args.max_widget:
+            mesures.append(("QTableWidget", mesurer_widget(lignes)))
+        for nom, (charge, tri_taille, tri_nom) in mesures:
+            print(f"{nb:>9,d} {nom:14s} {charge:10.3f}s {tri_taille:10.3f}s {tri_nom:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
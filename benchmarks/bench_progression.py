@@ -0,0 +1,114 @@
+"""
+Banc d'essai de la progression
+Description: Coût, pour la boucle d'événements Qt, des signaux de progression
+d'un parcours synthétique de --dossiers dossiers (10 sous-dossiers découverts
+par dossier traité). Trois variantes : un signal par dossier, un signal à
+chaque changement de valeur, et SuiviProgression + EmetteurProgression
+(au plus ~30 envois par seconde).
+
+    python benchmarks/bench_progression.py [--dossiers 1000000]
+
+Pour chaque variante : signaux reçus par l'interface, durée du travail,
+délai jusqu'au traitement du dernier signal, pire retard d'une minuterie de
+10 ms (réactivité de la fenêtre). QCoreApplication : aucun écran n'est
+nécessaire.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal  # noqa: E402
+
+from progression import EmetteurProgression, SuiviProgression  # noqa: E402
+
+
+class Travail(QObject):
+    progress = pyqtSignal(int)
+    fini = pyqtSignal()
+
+
+def parcours_synthetique(nb):
+    """(dossiers traités - 1, dossiers découverts) après chaque dossier."""
+    decouverts = 1
+    for i in range(nb):
+        decouverts = min(nb, decouverts + 10)
+        yield i, decouverts
+
+
+def par_dossier(emettre, nb):
+    for i, decouverts in parcours_synthetique(nb):
+        emettre(int(100 * (i + 1) / decouverts))
+
+
+def valeur_changee(emettre, nb):
+    derniere = 0
+    for i, decouverts in parcours_synthetique(nb):
+        valeur = min(99, int(100 * (i + 1) / decouverts))
+        if valeur > derniere:
+            derniere = valeur
+            emettre(valeur)
+
+
+def coalescent(emettre, nb):
+    suivi = SuiviProgression(EmetteurProgression(emettre))
+    for _, decouverts in parcours_synthetique(nb):
+        suivi.decouvrir(decouverts)
+        suivi.avancer()
+
+
+def mesurer(app, nom, fonction, nb):
+    travail = Travail()
+    recus = [0]
+    retards = []
+    fin = {}
+    travail.progress.connect(lambda valeur: recus.__setitem__(0, recus[0] + 1))
+
+    minuterie = QTimer()
+    minuterie.setInterval(10)
+    precedent = [time.perf_counter()]
+
+    def tic():
+        maintenant = time.perf_counter()
+        retards.append(maintenant - precedent[0] - 0.010)
+        precedent[0] = maintenant
+
+    def terminer():
+        fin['interface'] = time.perf_counter()
+        app.quit()
+
+    def executer():
+        fonction(travail.progress.emit, nb)
+        fin['travail'] = time.perf_counter()
+        travail.fini.emit()
+
+    minuterie.timeout.connect(tic)
+    travail.fini.connect(terminer)
+    depart = time.perf_counter()
+    minuterie.start()
+    threading.Thread(target=executer, daemon=True).start()
+    app.exec_()
+    minuterie.stop()
+    print(f"{nom:16s} {recus[0]:>9,d} {fin['travail'] - depart:8.2f}s "
+          f"{fin['interface'] - depart:9.2f}s {max(retards, default=0) * 1000:10.1f}ms")
+
+
+def main():
+    parseur = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parseur.add_argument("--dossiers", type=int, default=1_000_000)
+    args = parseur.parse_args()
+    app = QCoreApplication(sys.argv)
+
+    print(f"{'variante':16s} {'signaux':>9s} {'travail':>9s} {'interface':>10s} {'retard max':>12s}")
+    for nom, fonction in (("par dossier", par_dossier),
+                          ("valeur changée", valeur_changee),
+                          ("coalescent", coalescent)):
+        mesurer(app, nom, fonction, args.dossiers)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,54 @@
+import sys
+
+# Mode ligne de commande (python -m OutilMaintenance scan|disk|cleanup|...) :
+# aiguillé avant l'import de PyQt5 et de reportlab, inutiles sans interface
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from cli import main
+    sys.exit(main(sys.argv[1:]))
+
+from demarrage import chrono_demarrage
+
+# Imports lourds chronométrés pour le rapport de démarrage (reportlab n'est
+# chargé qu'au premier export PDF)
+chrono_demarrage.importer(
+    "PyQt5.QtWidgets", "PyQt5.QtCore", "PyQt5.QtGui", "index_fichiers",
+    "analyse_dossiers", "nettoyage", "programmes", "securite", "modeles")
+
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QProgressBar, QTableWidget, QTableWidgetItem, QFileDialog,
+    QPushButton, QProgressBar, QTableWidget, QTableWidgetItem, QTableView, QFileDialog,
     QMessageBox, QLineEdit, QLabel, QHeaderView, QMenuBar, QAction, QAbstractItemView, QComboBox, QMenu, QInputDialog, QTextEdit, QCheckBox, QFrame
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QFont, QColor, QPalette
-import sys
 import os
 import platform
 import subprocess
-import webbrowser
-import fnmatch
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
 import logging
-import shutil
-from datetime import datetime
 import json
+import sqlite3
+import time
+from datetime import datetime
+from index_fichiers import IndexFichiers
+from flux import EmetteurLots
+from progression import EmetteurProgression, SuiviProgression, format_duree
+from analyse_dossiers import (
+    RechercheDossiersVides, AnalyseDisque, format_taille,
+    supprimer_arborescence_vide
+)
+from nettoyage import Nettoyage, LIBELLES_OPTIONS
+from programmes import ListeProgrammes
+from cache_programmes import ouvrir_cache_programmes
+from securite import AnalyseSecurite
+from desinstallation import ANNULE, ECHEC, FileDesinstallation
+from gestionnaire_taches import (
+    GestionnaireTaches, IO, CPU, PRIORITE_HAUTE, PRIORITE_NORMALE, PRIORITE_BASSE)
+from exports import (
+    ExportDonnees, formats_disponibles, format_fichier, jeu_programmes,
+    jeu_dossiers_vides, jeux_disque, jeu_nettoyage, jeu_securite)
+from modeles import (
+    ModeleProgrammes, ModeleDossiers, ModeleGrosFichiers, ModeleArbre
+)
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO,
@@ -31,742 +61,388 @@ Version: 1.0.2
 Description: Application PyQt5 pour gérer les programmes installés et détecter les dossiers vides.
 """
 
-# Helper pour masquer la fenêtre console sur Windows
-def get_subprocess_startupinfo():
-    """Retourne les paramètres pour masquer la fenêtre console sur Windows."""
-    if platform.system() == "Windows":
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        startupinfo.wShowWindow = subprocess.SW_HIDE
-        return startupinfo
-    return None
-
-def get_subprocess_creationflags():
-    """Retourne les flags de création pour masquer la console sur Windows."""
-    if platform.system() == "Windows":
-        return subprocess.CREATE_NO_WINDOW
-    return 0
+# ✅ Travaux de fond : chaque classe *Thread porte les signaux Qt d'une tâche ;
+# sa méthode run() est exécutée par le gestionnaire de tâches de la fenêtre
+# (les signaux émis depuis ses threads sont remis au thread de l'interface)
 
 # ✅ Thread pour le scan des dossiers
 
 
-class ScanThread(QThread):
+class ScanThread(QObject):
     """
-    Thread pour scanner les dossiers vides de manière asynchrone.
-    Émet des signaux de progression et de fin avec les résultats.
+    Thread pour scanner les dossiers vides de manière asynchrone
+    (RechercheDossiersVides). Émet la progression, les résultats par lots
+    pendant le scan, puis le nombre total de dossiers vides trouvés.
     """
     progress = pyqtSignal(int)
-    finished = pyqtSignal(list)
+    lot = pyqtSignal(list)
+    finished = pyqtSignal(int)
 
-    def __init__(self, chemin):
+    def __init__(self, chemin, utiliser_cache=True):
         super().__init__()
         self.chemin = chemin
-        self._is_running = True
+        self.tache = RechercheDossiersVides(chemin, utiliser_cache)
+
+    @property
+    def stats_cache(self):
+        return self.tache.stats_cache
+
+    @property
+    def restant(self):
+        return self.tache.suivi.restant if self.tache.suivi else None
 
     def run(self):
         """Exécute le scan des dossiers vides."""
-        dossiers_vides_local = []
-        try:
-            total_dossiers = sum(len(dirs)
-                                 for _, dirs, _ in os.walk(self.chemin)) + 1
-            compteur = 0
-            for dossier, sous_dossiers, fichiers in os.walk(self.chemin):
-                if not self._is_running:
-                    break
-                compteur += 1
-                self.progress.emit(int((compteur / total_dossiers) * 100))
-                if not sous_dossiers and not fichiers:
-                    taille = self.taille_dossier(dossier)
-                    dossiers_vides_local.append(
-                        (dossier, self.format_taille(taille)))
-        except (PermissionError, OSError) as e:
-            logging.error(f"Erreur lors du scan: {e}")
-        finally:
-            self.progress.emit(100)
-            self.finished.emit(dossiers_vides_local)
-
-    def taille_dossier(self, path):
-        """Calcule la taille totale d'un dossier en octets."""
-        total = 0
-        for root, dirs, files in os.walk(path):
-            for f in files:
-                try:
-                    total += os.path.getsize(os.path.join(root, f))
-                except (OSError, PermissionError) as e:
-                    logging.warning(
-                        f"Impossible d'accéder à {os.path.join(root, f)}: {e}")
-        return total
+        taille_vide = format_taille(0)
+        total = self.tache.executer(
+            EmetteurProgression(self.progress.emit),
+            lambda chemins: self.lot.emit(
+                [(chemin, taille_vide) for chemin in chemins]))
+        self.finished.emit(total)
 
     def stop(self):
         """Arrête le thread proprement."""
-        self._is_running = False
-
-    def format_taille(self, octets):
-        for unit in ['octets', 'Ko', 'Mo', 'Go', 'To']:
-            if octets < 1024:
-                return f"{octets:.2f} {unit}"
-            octets /= 1024
-        return f"{octets:.2f} To"
+        self.tache.stop()
 
 # ✅ Thread pour la liste des programmes
 
 
-class ProgramThread(QThread):
+class ProgramThread(QObject):
     """
-    Thread pour lister les programmes installés de manière asynchrone.
-    Compatible Windows et Linux.
+    Thread pour lister les programmes installés de manière asynchrone
+    (ListeProgrammes). Compatible Windows et Linux.
     """
     progress = pyqtSignal(int)
+    lot = pyqtSignal(list)
     finished = pyqtSignal(list)
 
     def __init__(self):
         super().__init__()
-        self._is_running = True
+        self.tache = ListeProgrammes()
 
     def run(self):
-        """Récupère la liste des programmes installés."""
-        programmes = []
-        systeme = platform.system()
-        try:
-            if systeme == "Windows":
-                ps_script = r"""
-                $paths = @(
-                    'HKLM:\Software\Microsoft\Windows\CurrentVersion\Uninstall',
-                    'HKLM:\Software\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall'
-                )
-                foreach ($path in $paths) {
-                    Get-ItemProperty -Path $path\* |
-                    Where-Object { $_.DisplayName } |
-                    Select-Object DisplayName, DisplayVersion, InstallLocation |
-                    ConvertTo-Csv -NoTypeInformation
-                }
-                """
-                cmd = ["powershell", "-Command", ps_script]
-                result = subprocess.run(
-                    cmd, 
-                    capture_output=True, 
-                    text=True,
-                    startupinfo=get_subprocess_startupinfo(),
-                    creationflags=get_subprocess_creationflags()
-                )
-                lignes = [l for l in result.stdout.splitlines(
-                ) if l.strip() and not l.startswith("DisplayName")]
-                total = len(lignes) or 1
-                for i, ligne in enumerate(lignes):
-                    parts = ligne.split(",")
-                    nom = parts[0].strip('"')
-                    version = parts[1].strip('"') if len(parts) > 1 else ""
-                    chemin = parts[2].strip('"') if len(parts) > 2 else ""
-                    programmes.append((nom, version, chemin))
-                    self.progress.emit(int((i + 1) / total * 100))
-            elif systeme == "Linux":
-                result = subprocess.run(
-                    ["dpkg-query", "-W", "-f=${Package},${Version}\n"], capture_output=True, text=True)
-                lignes = result.stdout.splitlines()
-                total = len(lignes) or 1
-                for i, ligne in enumerate(lignes):
-                    parts = ligne.split(",")
-                    nom = parts[0]
-                    version = parts[1] if len(parts) > 1 else ""
-                    programmes.append((nom, version, "/usr/bin"))
-                    self.progress.emit(int((i + 1) / total * 100))
-        except (subprocess.SubprocessError, OSError) as e:
-            logging.error(
-                f"Erreur lors de la récupération des programmes: {e}")
-            programmes = []
-        finally:
-            self.progress.emit(100)
-            self.finished.emit(programmes)
+        """Récupère la liste des programmes installés, par lots."""
+        self.finished.emit(self.tache.executer(
+            EmetteurProgression(self.progress.emit), self.lot.emit))
 
     def stop(self):
         """Arrête le thread proprement."""
-        self._is_running = False
+        self.tache.stop()
 
 # ✅ Thread pour la recherche globale dans C:
 
 
-class GlobalSearchThread(QThread):
+class GlobalSearchThread(QObject):
     """
     Thread pour effectuer une recherche globale de fichiers.
-    Limite les résultats pour éviter la surcharge mémoire.
+    Interroge l'index persistant des noms de fichiers : le premier lancement
+    construit l'index, les suivants répondent immédiatement. Le
+    rafraîchissement de l'index est un travail séparé (IndexRefreshThread).
     """
     progress = pyqtSignal(int)
-    finished = pyqtSignal(list)
-    MAX_RESULTS = 1000  # Limite de sécurité
-
-    def __init__(self, mot_cle, chemin_base="C:\\"):
+    lot = pyqtSignal(list)
+    finished = pyqtSignal(int)
+    DOSSIERS_EXCLUS = ['$Recycle.Bin',
+                       'Windows\\WinSxS', 'System Volume Information']
+    # Attente maximale (s) de l'arrêt d'un rafraîchissement annulé
+    DELAI_ATTENTE_INDEX = 5.0
+
+    def __init__(self, mot_cle, chemin_base="C:\\", rafraichissement=None):
         super().__init__()
         self.mot_cle = mot_cle.lower()
         self.chemin_base = chemin_base
+        # Rafraîchissement de l'index annulé au lancement de la recherche
+        self.rafraichissement = rafraichissement
+        self.suivi = None
+        self._progression = EmetteurProgression(self.progress.emit)
         self._is_running = True
 
     def run(self):
-        """Exécute la recherche globale avec limite de résultats."""
-        resultats = []
-        compteur = 0
-        dossiers_exclus = ['$Recycle.Bin',
-                           'Windows\\WinSxS', 'System Volume Information']
+        """Exécute la recherche globale dans l'index, résultats par lots."""
+        emetteur = EmetteurLots(self.lot.emit)
+        if self.rafraichissement is not None:
+            # Éviter deux écritures concurrentes dans la base de l'index
+            self.rafraichissement.attendre(self.DELAI_ATTENTE_INDEX)
+        index = None
+        try:
+            index = IndexFichiers()
+            if not index.est_construit(self.chemin_base):
+                self._mettre_a_jour_index(index)
+            emetteur.etendre(
+                index.rechercher(self.mot_cle, self.chemin_base))
+        except (sqlite3.Error, OSError) as e:
+            logging.error(f"Erreur de l'index de recherche: {e}")
+        finally:
+            if index is not None:
+                index.fermer()
+
+        emetteur.vider()
+        self._progression(100)
+        self.finished.emit(emetteur.total)
+
+    @property
+    def restant(self):
+        return self.suivi.restant if self.suivi else None
 
+    @property
+    def arretee(self):
+        return not self._is_running
+
+    def _mettre_a_jour_index(self, index):
+        self._progression(0)
+        self.suivi = SuiviProgression(
+            self._progression, cle=f"index:{self.chemin_base}")
+        mettre_a_jour_index(index, self.chemin_base,
+                            lambda: self._is_running, self.suivi)
+
+    def stop(self):
+        """Arrête le thread proprement."""
+        self._is_running = False
+
+
+def mettre_a_jour_index(index, chemin_base, doit_continuer, suivi=None):
+    """Met à jour l'index de chemin_base, sans les dossiers système exclus."""
+    return index.mettre_a_jour(
+        chemin_base,
+        exclure=lambda d: any(
+            exclu in d.path for exclu in GlobalSearchThread.DOSSIERS_EXCLUS),
+        doit_continuer=doit_continuer,
+        suivi=suivi)
+
+
+class IndexRefreshThread(QObject):
+    """
+    Rafraîchit l'index de la recherche globale en tâche de fond, après une
+    recherche. Travail de basse priorité, annulé par la recherche suivante ;
+    ignoré si l'index a été rafraîchi il y a moins de DELAI_MINIMUM secondes.
+    """
+    DELAI_MINIMUM = 15 * 60
+
+    def __init__(self, chemin_base="C:\\"):
+        super().__init__()
+        self.chemin_base = chemin_base
+        self._is_running = True
+
+    def run(self):
+        """Met l'index à jour s'il n'est pas récent."""
+        index = None
         try:
-            for root, dirs, files in os.walk(self.chemin_base, topdown=True):
-                if not self._is_running or len(resultats) >= self.MAX_RESULTS:
-                    break
-
-                # Exclure certains dossiers système
-                dirs[:] = [d for d in dirs if not any(
-                    exclu in os.path.join(root, d) for exclu in dossiers_exclus)]
-
-                compteur += 1
-                self.progress.emit(compteur % 100)
-
-                for name in files:
-                    if self.mot_cle in name.lower():
-                        chemin_complet = os.path.join(root, name)
-                        resultats.append(chemin_complet)
-                        if len(resultats) >= self.MAX_RESULTS:
-                            break
-        except (PermissionError, OSError) as e:
-            logging.warning(f"Accès refusé à certains dossiers: {e}")
+            index = IndexFichiers()
+            derniere_maj = index.derniere_maj(self.chemin_base)
+            if (derniere_maj is not None
+                    and time.time() - derniere_maj < self.DELAI_MINIMUM):
+                logging.info(f"Index {self.chemin_base} récent, pas de mise à jour")
+                return
+            mettre_a_jour_index(index, self.chemin_base,
+                                lambda: self._is_running)
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Mise à jour de l'index interrompue: {e}")
         finally:
-            self.finished.emit(resultats)
+            if index is not None:
+                index.fermer()
 
     def stop(self):
         """Arrête le thread proprement."""
         self._is_running = False
 
 
-class DiskAnalysisThread(QThread):
+class DiskAnalysisThread(QObject):
     """
-    Thread pour analyser l'espace disque et trouver les gros fichiers.
+    Thread pour analyser l'espace disque et trouver les gros fichiers
+    (AnalyseDisque). Le classement courant des gros fichiers est émis
+    périodiquement pendant l'analyse, chaque émission remplaçant la
+    précédente ; le signal de fin transmet le dict des résultats
+    (partitions, gros fichiers, arbre des tailles de dossiers).
     """
     progress = pyqtSignal(int)
+    classement = pyqtSignal(list)
     finished = pyqtSignal(dict)
 
-    def __init__(self, chemin, taille_min_mo=100):
+    def __init__(self, chemin, taille_min_mo=100, nb_max=500, utiliser_cache=True):
         super().__init__()
         self.chemin = chemin
-        self.taille_min = taille_min_mo * 1024 * 1024
-        self._is_running = True
+        self.tache = AnalyseDisque(chemin, taille_min_mo, nb_max, utiliser_cache)
+
+    @property
+    def restant(self):
+        return self.tache.suivi.restant if self.tache.suivi else None
 
     def run(self):
         """Analyse les disques et trouve les gros fichiers."""
-        resultats = {
-            'partitions': [],
-            'gros_fichiers': []
-        }
-
-        try:
-            # Analyse des partitions
-            if platform.system() == "Windows":
-                import string
-                for lettre in string.ascii_uppercase:
-                    disque = f"{lettre}:\\"
-                    if os.path.exists(disque):
-                        try:
-                            usage = shutil.disk_usage(disque)
-                            resultats['partitions'].append({
-                                'nom': lettre,
-                                'total': usage.total,
-                                'utilise': usage.used,
-                                'libre': usage.free,
-                                'pourcentage': (usage.used / usage.total * 100) if usage.total > 0 else 0
-                            })
-                        except (OSError, PermissionError):
-                            pass
-            else:
-                usage = shutil.disk_usage("/")
-                resultats['partitions'].append({
-                    'nom': '/',
-                    'total': usage.total,
-                    'utilise': usage.used,
-                    'libre': usage.free,
-                    'pourcentage': (usage.used / usage.total * 100) if usage.total > 0 else 0
-                })
-
-            self.progress.emit(30)
-
-            # Recherche des gros fichiers
-            compteur = 0
-            for root, dirs, files in os.walk(self.chemin):
-                if not self._is_running or len(resultats['gros_fichiers']) >= 500:
-                    break
-
-                # Exclure les dossiers système
-                dirs[:] = [d for d in dirs if d not in [
-                    '$Recycle.Bin', 'System Volume Information', 'Windows']]
-
-                compteur += 1
-                if compteur % 100 == 0:
-                    self.progress.emit(30 + (compteur % 70))
-
-                for fichier in files:
-                    try:
-                        chemin_complet = os.path.join(root, fichier)
-                        taille = os.path.getsize(chemin_complet)
-                        if taille >= self.taille_min:
-                            resultats['gros_fichiers'].append({
-                                'chemin': chemin_complet,
-                                'nom': fichier,
-                                'taille': taille,
-                                'date_modif': datetime.fromtimestamp(os.path.getmtime(chemin_complet))
-                            })
-                    except (OSError, PermissionError):
-                        pass
-
-            # Trier par taille décroissante
-            resultats['gros_fichiers'].sort(
-                key=lambda x: x['taille'], reverse=True)
-
-        except Exception as e:
-            logging.error(f"Erreur analyse disque: {e}")
-        finally:
-            self.progress.emit(100)
-            self.finished.emit(resultats)
+        self.finished.emit(self.tache.executer(
+            EmetteurProgression(self.progress.emit), self.classement.emit))
 
     def stop(self):
         """Arrête le thread proprement."""
-        self._is_running = False
+        self.tache.stop()
 
 
-class CleanupThread(QThread):
+class CleanupThread(QObject):
     """
-    Thread pour nettoyer les fichiers temporaires et le cache système.
+    Thread pour nettoyer les fichiers temporaires et le cache système
+    (Nettoyage).
     """
     progress = pyqtSignal(int, str)
     finished = pyqtSignal(dict)
 
-    def __init__(self, options):
+    def __init__(self, options, tache=None):
         super().__init__()
         self.options = options
-        self._is_running = True
+        # tache estimée au préalable : suppression de son relevé
+        self.tache = tache or Nettoyage(options)
 
     def run(self):
         """Exécute le nettoyage selon les options."""
-        resultats = {
-            'fichiers_supprimes': 0,
-            'espace_libere': 0,
-            'erreurs': 0,
-            'details': []
-        }
+        self.finished.emit(self.tache.executer(EmetteurProgression(self.progress.emit)))
 
-        try:
-            if self.options.get('temp_windows'):
-                self.progress.emit(10, "Nettoyage dossier Temp Windows...")
-                self._nettoyer_dossier(os.environ.get('TEMP', ''), resultats)
-                self._nettoyer_dossier(os.environ.get('TMP', ''), resultats)
-
-            if self.options.get('temp_user'):
-                self.progress.emit(30, "Nettoyage dossier Temp utilisateur...")
-                temp_user = os.path.join(os.environ.get(
-                    'USERPROFILE', ''), 'AppData', 'Local', 'Temp')
-                self._nettoyer_dossier(temp_user, resultats)
-
-            if self.options.get('prefetch'):
-                self.progress.emit(50, "Nettoyage Prefetch...")
-                prefetch = r'C:\Windows\Prefetch'
-                if os.path.exists(prefetch):
-                    self._nettoyer_dossier(prefetch, resultats)
-
-            if self.options.get('recycle_bin'):
-                self.progress.emit(70, "Vidage de la corbeille...")
-                self._vider_corbeille(resultats)
-
-            if self.options.get('browser_cache'):
-                self.progress.emit(85, "Nettoyage cache navigateurs...")
-                self._nettoyer_cache_navigateurs(resultats)
+    def stop(self):
+        """Arrête le thread proprement."""
+        self.tache.stop()
 
-        except Exception as e:
-            logging.error(f"Erreur nettoyage: {e}")
-            resultats['erreurs'] += 1
-        finally:
-            self.progress.emit(100, "Nettoyage terminé")
-            self.finished.emit(resultats)
 
-    def _nettoyer_dossier(self, chemin, resultats):
-        """Nettoie un dossier de ses fichiers temporaires."""
-        if not os.path.exists(chemin):
-            return
+class CleanupEstimateThread(QObject):
+    """
+    Thread pour estimer l'espace récupérable avant le nettoyage, sans
+    rien supprimer (Nettoyage.estimer).
+    """
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(dict)
 
-        for root, dirs, files in os.walk(chemin):
-            if not self._is_running:
-                break
-            for fichier in files:
-                try:
-                    chemin_fichier = os.path.join(root, fichier)
-                    taille = os.path.getsize(chemin_fichier)
-                    os.remove(chemin_fichier)
-                    resultats['fichiers_supprimes'] += 1
-                    resultats['espace_libere'] += taille
-                    resultats['details'].append(f"Supprimé: {fichier}")
-                except (OSError, PermissionError) as e:
-                    resultats['erreurs'] += 1
-                    logging.warning(f"Impossible de supprimer {fichier}: {e}")
+    def __init__(self, options, tous_profils=False):
+        super().__init__()
+        self.options = options
+        self.tache = Nettoyage(options, tous_profils=tous_profils)
 
-    def _vider_corbeille(self, resultats):
-        """Vide la corbeille Windows."""
-        try:
-            if platform.system() == "Windows":
-                import winshell
-                winshell.recycle_bin().empty(confirm=False, show_progress=False, sound=False)
-                resultats['details'].append("Corbeille vidée")
-            else:
-                # Linux
-                corbeille = os.path.expanduser('~/.local/share/Trash/files')
-                if os.path.exists(corbeille):
-                    self._nettoyer_dossier(corbeille, resultats)
-        except Exception as e:
-            logging.error(f"Erreur vidage corbeille: {e}")
-            resultats['erreurs'] += 1
-
-    def _nettoyer_cache_navigateurs(self, resultats):
-        """Nettoie les caches des navigateurs populaires."""
-        userprofile = os.environ.get('USERPROFILE', '')
-        caches = [
-            os.path.join(userprofile, 'AppData', 'Local', 'Google',
-                         'Chrome', 'User Data', 'Default', 'Cache'),
-            os.path.join(userprofile, 'AppData', 'Local', 'Microsoft',
-                         'Edge', 'User Data', 'Default', 'Cache'),
-            os.path.join(userprofile, 'AppData', 'Local',
-                         'Mozilla', 'Firefox', 'Profiles')
-        ]
-
-        for cache in caches:
-            if os.path.exists(cache):
-                self._nettoyer_dossier(cache, resultats)
+    def run(self):
+        """Relève le contenu de chaque catégorie cochée."""
+        self.finished.emit(self.tache.estimer(EmetteurProgression(self.progress.emit)))
 
     def stop(self):
         """Arrête le thread proprement."""
-        self._is_running = False
+        self.tache.stop()
 
 
-class UninstallThread(QThread):
+class UninstallThread(QObject):
     """
-    Thread pour désinstaller un programme de manière asynchrone.
+    Thread pour désinstaller une sélection de programmes (FileDesinstallation).
+    statut(nom, état, message) transmet l'état de chaque programme.
     """
     progress = pyqtSignal(int, str)
-    finished = pyqtSignal(bool, str)
+    statut = pyqtSignal(str, str, str)
+    finished = pyqtSignal(list)
 
-    def __init__(self, programme_nom, display_name):
+    def __init__(self, elements):
         super().__init__()
-        self.programme_nom = programme_nom
-        self.display_name = display_name
-        self._is_running = True
+        self.tache = FileDesinstallation(elements)
 
     def run(self):
-        """Exécute la désinstallation du programme."""
+        """Exécute la file de désinstallation."""
         try:
-            if platform.system() == "Windows":
-                self.progress.emit(10, f"Recherche de {self.display_name}...")
-                
-                # Recherche du programme dans le registre pour trouver la commande de désinstallation
-                ps_script = r"""
-                $paths = @(
-                    'HKLM:\Software\Microsoft\Windows\CurrentVersion\Uninstall',
-                    'HKLM:\Software\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall',
-                    'HKCU:\Software\Microsoft\Windows\CurrentVersion\Uninstall'
-                )
-                foreach ($path in $paths) {
-                    Get-ItemProperty -Path $path\* |
-                    Where-Object { $_.DisplayName -eq '""" + self.display_name + r"""' } |
-                    Select-Object UninstallString, QuietUninstallString |
-                    ConvertTo-Csv -NoTypeInformation
-                }
-                """
-                
-                self.progress.emit(30, "Récupération des informations de désinstallation...")
-                cmd = ["powershell", "-Command", ps_script]
-                result = subprocess.run(
-                    cmd, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=30,
-                    startupinfo=get_subprocess_startupinfo(),
-                    creationflags=get_subprocess_creationflags()
-                )
-                
-                uninstall_cmd = None
-                lines = [l for l in result.stdout.splitlines() if l.strip() and not l.startswith('"UninstallString"')]
-                
-                if lines:
-                    parts = lines[0].split(',', 1)
-                    # Utiliser QuietUninstallString si disponible, sinon UninstallString
-                    if len(parts) > 1 and parts[1].strip().strip('"'):
-                        uninstall_cmd = parts[1].strip().strip('"')
-                    elif parts[0].strip().strip('"'):
-                        uninstall_cmd = parts[0].strip().strip('"')
-                
-                if not uninstall_cmd:
-                    self.finished.emit(False, f"Impossible de trouver la commande de désinstallation pour {self.display_name}")
-                    return
-                
-                self.progress.emit(50, f"Désinstallation de {self.display_name}...")
-                logging.info(f"Commande de désinstallation: {uninstall_cmd}")
-                
-                # Vérifier si le désinstalleur existe réellement
-                # Extraire le chemin de l'exécutable de la commande
-                exe_path_to_check = None
-                if uninstall_cmd.startswith('"'):
-                    # Commande avec guillemets
-                    end_quote = uninstall_cmd.find('"', 1)
-                    if end_quote > 0:
-                        exe_path_to_check = uninstall_cmd[1:end_quote]
-                elif '.exe' in uninstall_cmd.lower():
-                    # Commande sans guillemets
-                    exe_end = uninstall_cmd.lower().find('.exe') + 4
-                    # Prendre jusqu'à l'exe, en séparant sur le premier espace après
-                    cmd_part = uninstall_cmd[:exe_end]
-                    if ' /' in cmd_part or ' -' in cmd_part:
-                        # Il y a des arguments avant .exe, prendre seulement le début
-                        exe_path_to_check = cmd_part.split()[0] if ' ' in cmd_part else cmd_part
-                    else:
-                        exe_path_to_check = cmd_part
-                
-                # Vérifier l'existence pour les chemins non-msiexec
-                if exe_path_to_check and 'msiexec' not in exe_path_to_check.lower():
-                    if not os.path.exists(exe_path_to_check):
-                        self.finished.emit(False, 
-                            f"Le désinstalleur n'existe pas: {exe_path_to_check}\n\n"
-                            f"Le programme a peut-être été déplacé ou désinstallé manuellement.\n"
-                            f"Vous pouvez supprimer l'entrée du registre manuellement.")
-                        logging.warning(f"Désinstalleur introuvable: {exe_path_to_check}")
-                        return
-                
-                # Préparer la commande de désinstallation
-                # Certaines commandes incluent des arguments, d'autres non
-                if 'msiexec' in uninstall_cmd.lower():
-                    # Pour les installations MSI, ajouter /quiet pour une désinstallation silencieuse
-                    if '/quiet' not in uninstall_cmd.lower() and '/qn' not in uninstall_cmd.lower():
-                        uninstall_cmd += ' /quiet /norestart'
-                
-                # Détecter si la commande commence par un chemin (sans guillemets) avec des espaces
-                # et l'entourer de guillemets si nécessaire
-                if uninstall_cmd and not uninstall_cmd.startswith('"'):
-                    # Chercher si c'est un chemin avec .exe
-                    if '.exe' in uninstall_cmd.lower():
-                        # Séparer le chemin de l'exe et les arguments
-                        exe_end = uninstall_cmd.lower().find('.exe') + 4
-                        exe_path = uninstall_cmd[:exe_end]
-                        args = uninstall_cmd[exe_end:]
-                        
-                        # Si le chemin contient des espaces, ajouter des guillemets
-                        if ' ' in exe_path and not exe_path.startswith('"'):
-                            uninstall_cmd = f'"{exe_path}"{args}'
-                
-                self.progress.emit(70, "Exécution de la désinstallation...")
-                logging.info(f"Commande finale: {uninstall_cmd}")
-                
-                # Exécuter avec un timeout de 5 minutes
-                # Utiliser Popen pour pouvoir vérifier si le processus est toujours en cours
-                import time
-                process = subprocess.Popen(
-                    uninstall_cmd,
-                    shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    startupinfo=get_subprocess_startupinfo(),
-                    creationflags=get_subprocess_creationflags()
-                )
-                
-                # Attendre que le processus se termine (avec timeout)
-                try:
-                    stdout, stderr = process.communicate(timeout=300)
-                    returncode = process.returncode
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                    self.finished.emit(False, "La désinstallation a pris trop de temps (timeout de 5 minutes).")
-                    return
-                
-                self.progress.emit(100, "Désinstallation terminée")
-                
-                # Vérifier le code de retour
-                if returncode == 0 or returncode == 3010:  # 3010 = reboot required
-                    message = f"Programme '{self.display_name}' désinstallé avec succès."
-                    if returncode == 3010:
-                        message += " Un redémarrage peut être nécessaire."
-                    self.finished.emit(True, message)
-                elif returncode == 1602 or returncode == 1223:
-                    # 1602/1223 = User cancelled
-                    self.finished.emit(False, "Désinstallation annulée par l'utilisateur.")
-                else:
-                    error_msg = stderr[:200] if stderr else "Aucun message d'erreur"
-                    self.finished.emit(False, f"Erreur lors de la désinstallation (code {returncode}).\n{error_msg}")
-                    
-            else:
-                # Pour Linux
-                self.progress.emit(50, f"Désinstallation de {self.programme_nom}...")
-                cmd = ["sudo", "apt-get", "remove", "-y", self.programme_nom]
-                process = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-                
-                if process.returncode == 0:
-                    self.finished.emit(True, f"Programme '{self.programme_nom}' désinstallé avec succès.")
-                else:
-                    self.finished.emit(False, f"Erreur lors de la désinstallation: {process.stderr[:200]}")
-                    
-        except subprocess.TimeoutExpired:
-            self.finished.emit(False, "La désinstallation a pris trop de temps (timeout).")
+            resultats = self.tache.executer(
+                EmetteurProgression(self.progress.emit), self.statut.emit)
         except Exception as e:
             logging.error(f"Erreur désinstallation: {e}")
-            self.finished.emit(False, f"Erreur: {str(e)}")
+            resultats = [{'cle': cle, 'nom': nom, 'succes': False, 'etat': ECHEC,
+                          'message': f"Erreur: {str(e)}"}
+                         for cle, nom, _ in self.tache.elements]
+        self.finished.emit(resultats)
 
     def stop(self):
         """Arrête le thread proprement."""
-        self._is_running = False
+        self.tache.stop()
 
 
-class SecurityAnalysisThread(QThread):
+class ExportThread(QObject):
     """
-    Thread pour analyser la sécurité du système.
+    Thread pour exporter un jeu de données en CSV, JSON Lines ou Parquet
+    (ExportDonnees) sans bloquer la fenêtre.
     """
     progress = pyqtSignal(int)
-    finished = pyqtSignal(dict)
+    finished = pyqtSignal(bool, str)
 
-    def __init__(self):
+    def __init__(self, fichier, jeu):
         super().__init__()
+        self.tache = ExportDonnees(fichier, jeu)
         self._is_running = True
 
     def run(self):
-        """Analyse la sécurité du système."""
-        resultats = {
-            'programmes_demarrage': [],
-            'programmes_obsoletes': [],
-            'ports_ouverts': [],
-            'services_suspects': []
-        }
-
+        """Écrit le fichier d'export."""
         try:
-            self.progress.emit(20)
-            # Programmes au démarrage
-            if platform.system() == "Windows":
-                resultats['programmes_demarrage'] = self._get_startup_programs()
+            nb = self.tache.executer(EmetteurProgression(self.progress.emit))
+            if self._is_running:
+                self.finished.emit(True, f"{nb} lignes exportées dans : {self.tache.fichier}")
+            else:
+                self.finished.emit(False, "Export annulé.")
+        except Exception as e:
+            logging.error(f"Erreur export: {e}")
+            self.finished.emit(False, str(e))
 
-            self.progress.emit(50)
-            # Programmes potentiellement obsolètes (> 5 ans)
-            resultats['programmes_obsoletes'] = self._check_obsolete_programs()
+    def stop(self):
+        """Arrête le thread proprement."""
+        self._is_running = False
+        self.tache.stop()
 
-            self.progress.emit(80)
-            # Services Windows suspects
-            resultats['services_suspects'] = self._check_suspicious_services()
 
-        except Exception as e:
-            logging.error(f"Erreur analyse sécurité: {e}")
-        finally:
-            self.progress.emit(100)
-            self.finished.emit(resultats)
+class PdfExportThread(QObject):
+    """
+    Thread pour exporter un tableau en PDF (ExportPdf) sans bloquer la
+    fenêtre ; reportlab n'est importé qu'au premier export.
+    """
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, fichier, titre, entetes, largeurs, lignes):
+        super().__init__()
+        self.parametres = (fichier, titre, entetes, largeurs, lignes)
+        self.tache = None
+        self._is_running = True
 
-    def _get_startup_programs(self):
-        """Récupère les programmes au démarrage Windows."""
-        startup_progs = []
+    def run(self):
+        """Écrit le document PDF."""
+        fichier, titre, entetes, largeurs, lignes = self.parametres
         try:
-            import winreg
-            keys = [
-                (winreg.HKEY_CURRENT_USER,
-                 r"Software\Microsoft\Windows\CurrentVersion\Run"),
-                (winreg.HKEY_LOCAL_MACHINE,
-                 r"Software\Microsoft\Windows\CurrentVersion\Run")
-            ]
-
-            for hkey, subkey in keys:
-                try:
-                    key = winreg.OpenKey(hkey, subkey)
-                    i = 0
-                    while True:
-                        try:
-                            name, value, _ = winreg.EnumValue(key, i)
-                            startup_progs.append(
-                                {'nom': name, 'chemin': value})
-                            i += 1
-                        except WindowsError:
-                            break
-                    winreg.CloseKey(key)
-                except WindowsError:
-                    pass
+            from export_pdf import ExportPdf
+            self.tache = ExportPdf(fichier, titre, entetes, largeurs, lignes,
+                                   total=len(lignes))
+            if not self._is_running:
+                self.tache.stop()
+            nb = self.tache.executer(EmetteurProgression(self.progress.emit))
+            if self._is_running:
+                self.finished.emit(True, f"{nb} lignes exportées dans : {fichier}")
+            else:
+                self.finished.emit(False, "Export annulé.")
         except Exception as e:
-            logging.error(f"Erreur lecture démarrage: {e}")
-
-        return startup_progs
+            logging.error(f"Erreur export PDF: {e}")
+            self.finished.emit(False, str(e))
 
-    def _check_obsolete_programs(self):
-        """Vérifie les programmes potentiellement obsolètes."""
-        obsoletes = []
-        # Liste de programmes couramment obsolètes
-        obsolete_patterns = ['java 6', 'java 7', 'flash',
-                             'silverlight', 'quicktime', 'realplayer']
+    def stop(self):
+        """Arrête le thread proprement."""
+        self._is_running = False
+        if self.tache:
+            self.tache.stop()
 
-        try:
-            if platform.system() == "Windows":
-                ps_script = r"""
-                $paths = @(
-                    'HKLM:\Software\Microsoft\Windows\CurrentVersion\Uninstall',
-                    'HKLM:\Software\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall'
-                )
-                foreach ($path in $paths) {
-                    Get-ItemProperty -Path $path\* |
-                    Where-Object { $_.DisplayName } |
-                    Select-Object DisplayName, DisplayVersion, InstallDate |
-                    ConvertTo-Csv -NoTypeInformation
-                }
-                """
-                cmd = ["powershell", "-Command", ps_script]
-                result = subprocess.run(
-                    cmd, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=30,
-                    startupinfo=get_subprocess_startupinfo(),
-                    creationflags=get_subprocess_creationflags()
-                )
-
-                for ligne in result.stdout.splitlines():
-                    if any(pattern in ligne.lower() for pattern in obsolete_patterns):
-                        parts = ligne.split(",")
-                        if len(parts) >= 2:
-                            obsoletes.append({
-                                'nom': parts[0].strip('"'),
-                                'version': parts[1].strip('"') if len(parts) > 1 else 'N/A',
-                                'raison': 'Programme obsolète ou non maintenu'
-                            })
-        except Exception as e:
-            logging.error(f"Erreur check obsoletes: {e}")
 
-        return obsoletes[:20]  # Limiter à 20 résultats
+class SecurityAnalysisThread(QObject):
+    """
+    Thread pour analyser la sécurité du système (AnalyseSecurite).
+    collecte(cle, elements, mesure) est émis à la fin de chaque collecteur.
+    """
+    progress = pyqtSignal(int)
+    collecte = pyqtSignal(str, list, dict)
+    finished = pyqtSignal(dict)
 
-    def _check_suspicious_services(self):
-        """Vérifie les services Windows suspects."""
-        suspects = []
-        try:
-            if platform.system() == "Windows":
-                result = subprocess.run(
-                    ["powershell", "-Command",
-                        "Get-Service | Where-Object {$_.Status -eq 'Running'} | Select-Object Name, DisplayName | ConvertTo-Csv -NoTypeInformation"],
-                    capture_output=True, 
-                    text=True, 
-                    timeout=15,
-                    startupinfo=get_subprocess_startupinfo(),
-                    creationflags=get_subprocess_creationflags()
-                )
-
-                # Services souvent inutiles ou suspects
-                suspicious_names = ['telemetry',
-                                    'diagtrack', 'dmwappush', 'remoteregistry']
-
-                for ligne in result.stdout.splitlines()[1:]:  # Skip header
-                    if any(susp in ligne.lower() for susp in suspicious_names):
-                        parts = ligne.split(",")
-                        if len(parts) >= 2:
-                            suspects.append({
-                                'service': parts[0].strip('"'),
-                                'description': parts[1].strip('"'),
-                                'remarque': 'Service potentiellement inutile'
-                            })
-        except Exception as e:
-            logging.error(f"Erreur check services: {e}")
+    def __init__(self):
+        super().__init__()
+        self.tache = AnalyseSecurite()
 
-        return suspects[:15]  # Limiter à 15 résultats
+    def run(self):
+        """Analyse la sécurité du système."""
+        self.finished.emit(self.tache.executer(
+            EmetteurProgression(self.progress.emit), self.collecte.emit))
 
     def stop(self):
         """Arrête le thread proprement."""
-        self._is_running = False
+        self.tache.stop()
 
 
 # ✅ Interface principale
@@ -786,20 +462,19 @@ class MaintenanceTool(QMainWindow):
 
         # Attributs pour stocker les données (remplace les variables globales)
         self.tous_les_programmes = []
+        self.index_programmes = None
         self.dossiers_vides = []
+        self.apercu_recherche = []
         self.current_theme = "dark"
 
-        # Références aux threads pour pouvoir les arrêter
-        self.scan_thread = None
-        self.program_thread = None
-        self.global_thread = None
-        self.disk_thread = None
-        self.cleanup_thread = None
-        self.security_thread = None
-        self.uninstall_thread = None
+        # Travaux de fond : un gestionnaire unique, et le dernier travail
+        # lancé pour chaque clé (ses signaux et sa tâche)
+        self.taches = GestionnaireTaches()
+        self.travaux = {}
 
         # Données pour les nouvelles fonctionnalités
         self.disk_data = {}
+        self.cleanup_data = {}
         self.security_data = {}
 
         # ✅ Thème coloré amélioré
@@ -817,9 +492,9 @@ class MaintenanceTool(QMainWindow):
             "QPushButton:disabled { background-color: #2d2d42; color: #707070; }"
             "QLineEdit { background-color: #2d2d42; color: #f0f0f0; border: 1px solid #3a3a52; border-radius: 3px; padding: 5px; font-size: 9pt; selection-background-color: #3a4a7c; min-height: 26px; }"
             "QLineEdit:focus { border: 1px solid #64b5f6; color: #ffffff; }"
-            "QTableWidget { background-color: #2d2d42; alternate-background-color: #35354a; color: #f0f0f0; gridline-color: #3a3a52; font-size: 9pt; }"
-            "QTableWidget::item { padding: 4px; color: #f0f0f0; }"
-            "QTableWidget::item:selected { background-color: #3a4a7c; color: #ffffff; }"
+            "QTableView { background-color: #2d2d42; alternate-background-color: #35354a; color: #f0f0f0; gridline-color: #3a3a52; font-size: 9pt; }"
+            "QTableView::item { padding: 4px; color: #f0f0f0; }"
+            "QTableView::item:selected { background-color: #3a4a7c; color: #ffffff; }"
             "QHeaderView::section { background-color: #3a4a7c; color: #ffffff; padding: 5px; border: none; font-weight: bold; font-size: 9pt; }"
             "QProgressBar { background-color: #2d2d42; color: #f0f0f0; border: 1px solid #3a3a52; border-radius: 3px; text-align: center; font-size: 8pt; padding: 2px; height: 18px; }"
             "QProgressBar::chunk { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #64b5f6, stop:1 #42a5f5); border-radius: 2px; }"
@@ -854,6 +529,10 @@ class MaintenanceTool(QMainWindow):
         self.action_export = QAction("💾 Exporter la liste", self)
         self.action_export.setShortcut("Ctrl+E")
         self.action_export.triggered.connect(self.exporter_liste)
+        self.action_export_donnees = QAction(
+            "📤 Exporter les données de l'onglet", self)
+        self.action_export_donnees.setShortcut("Ctrl+Shift+E")
+        self.action_export_donnees.triggered.connect(self.exporter_donnees_onglet)
         self.action_export_pdf_prog = QAction(
             "📄 Exporter programmes en PDF", self)
         self.action_export_pdf_prog.triggered.connect(
@@ -870,6 +549,7 @@ class MaintenanceTool(QMainWindow):
         self.action_about.triggered.connect(self.show_about)
         self.addActions([
             self.action_export,
+            self.action_export_donnees,
             self.action_export_pdf_prog,
             self.action_export_pdf_dos,
             self.action_quit,
@@ -891,6 +571,8 @@ class MaintenanceTool(QMainWindow):
 
         header_layout.addWidget(make_header_button(
             "💾 Exporter la liste", self.exporter_liste))
+        header_layout.addWidget(make_header_button(
+            "📤 Exporter l'onglet", self.exporter_donnees_onglet))
         header_layout.addWidget(make_header_button(
             "📄 PDF Programmes", self.exporter_programmes_pdf))
         header_layout.addWidget(make_header_button(
@@ -914,12 +596,36 @@ class MaintenanceTool(QMainWindow):
         main_layout.addWidget(self.tabs)
         self.setCentralWidget(central)
 
-        # --- Onglet Programmes ---
-        tab_programmes = QWidget()
+        # ✅ Onglets : chacun est construit à sa première ouverture
+        self._onglets_a_construire = {}
+        for titre, construire in [
+                ("Programmes installés", self._construire_onglet_programmes),
+                ("Dossiers vides", self._construire_onglet_dossiers),
+                ("📊 Analyse Disque", self._construire_onglet_disque),
+                ("🗑️ Nettoyage", self._construire_onglet_nettoyage),
+                ("🔐 Analyse Sécurité", self._construire_onglet_securite)]:
+            onglet = QWidget()
+            self._onglets_a_construire[onglet] = construire
+            self.tabs.addTab(onglet, titre)
+        self.tabs.currentChanged.connect(self.construire_onglet)
+        self.construire_onglet(self.tabs.currentIndex())
+
+        # ✅ Configuration des polices (fenêtre et premier onglet)
+        self._setup_fonts()
+
+    def construire_onglet(self, index):
+        """Construit l'onglet d'indice donné s'il ne l'a pas encore été."""
+        onglet = self.tabs.widget(index)
+        construire = self._onglets_a_construire.pop(onglet, None)
+        if construire is not None:
+            construire(onglet)
+            self._setup_fonts(onglet)
+
+    def _construire_onglet_programmes(self, tab_programmes):
+        """Construit l'onglet Programmes installés."""
         layout_prog = QVBoxLayout(tab_programmes)
         layout_prog.setContentsMargins(10, 10, 10, 10)
         layout_prog.setSpacing(10)
-        self.tabs.addTab(tab_programmes, "Programmes installés")
 
         btn_layout = QHBoxLayout()
         self.btn_list = QPushButton("Lister les programmes")
@@ -927,10 +633,15 @@ class MaintenanceTool(QMainWindow):
         btn_layout.addWidget(self.btn_list)
 
         # ✅ Bouton désinstaller
-        self.btn_uninstall = QPushButton("Désinstaller le programme sélectionné")
+        self.btn_uninstall = QPushButton("Désinstaller la sélection")
         self.btn_uninstall.clicked.connect(self.desinstaller_programme)
         btn_layout.addWidget(self.btn_uninstall)
 
+        self.btn_historique_programmes = QPushButton("Historique des changements")
+        self.btn_historique_programmes.clicked.connect(
+            self.afficher_historique_programmes)
+        btn_layout.addWidget(self.btn_historique_programmes)
+
         # ✅ Bouton recherche globale
         self.btn_global_search = QPushButton("Recherche globale (C:)")
         self.btn_global_search.clicked.connect(self.lancer_recherche_globale)
@@ -944,7 +655,12 @@ class MaintenanceTool(QMainWindow):
         search_layout = QHBoxLayout()
         self.entry_filter = QLineEdit()
         self.entry_filter.setPlaceholderText("Filtrer par mot-clé...")
-        self.entry_filter.textChanged.connect(self.filtrer_programmes)
+        # Filtrage différé : on attend une courte pause dans la saisie
+        self.timer_filtre = QTimer(self)
+        self.timer_filtre.setSingleShot(True)
+        self.timer_filtre.setInterval(150)
+        self.timer_filtre.timeout.connect(self.filtrer_programmes)
+        self.entry_filter.textChanged.connect(self.timer_filtre.start)
         self.combo_filter = QComboBox()
         self.combo_filter.addItems(["Tous", "Programme", "Version", "Chemin"])
         self.combo_filter.currentIndexChanged.connect(self.filtrer_programmes)
@@ -954,13 +670,14 @@ class MaintenanceTool(QMainWindow):
         search_layout.addWidget(self.combo_filter)
         layout_prog.addLayout(search_layout)
 
-        self.table_programmes = QTableWidget(0, 3)
-        self.table_programmes.setHorizontalHeaderLabels(
-            ["Programme", "Version", "Chemin"])
+        self.modele_programmes = ModeleProgrammes(self)
+        self.table_programmes = QTableView()
+        self.table_programmes.setModel(self.modele_programmes)
         self.table_programmes.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_programmes.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table_programmes.setSortingEnabled(True)
         self.table_programmes.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.table_programmes.cellDoubleClicked.connect(self.ouvrir_programme)
+        self.table_programmes.doubleClicked.connect(self.ouvrir_programme)
         layout_prog.addWidget(self.table_programmes)
 
 
@@ -969,10 +686,12 @@ class MaintenanceTool(QMainWindow):
         self.table_programmes.customContextMenuRequested.connect(
             self.menu_contextuel_programmes)
 
-        # --- Onglet Dossiers ---
-        tab_dossiers = QWidget()
+        # Liste en cache affichée tout de suite, puis revalidée en arrière-plan
+        QTimer.singleShot(0, self.lancer_scan_programmes)
+
+    def _construire_onglet_dossiers(self, tab_dossiers):
+        """Construit l'onglet Dossiers vides."""
         layout_dos = QVBoxLayout(tab_dossiers)
-        self.tabs.addTab(tab_dossiers, "Dossiers vides")
 
         select_layout = QHBoxLayout()
         self.label_path = QLabel("Chemin du dossier :")
@@ -998,13 +717,17 @@ class MaintenanceTool(QMainWindow):
 
         self.progress_bar = QProgressBar()
         layout_dos.addWidget(self.progress_bar)
+        self.label_scan_status = QLabel("")
+        layout_dos.addWidget(self.label_scan_status)
 
-        self.table_dossiers = QTableWidget(0, 2)
-        self.table_dossiers.setHorizontalHeaderLabels(["Dossier", "Taille"])
+        self.modele_dossiers = ModeleDossiers(self)
+        self.table_dossiers = QTableView()
+        self.table_dossiers.setModel(self.modele_dossiers)
         self.table_dossiers.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_dossiers.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.table_dossiers.setSortingEnabled(True)
         self.table_dossiers.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.table_dossiers.cellDoubleClicked.connect(self.ouvrir_emplacement)
+        self.table_dossiers.doubleClicked.connect(self.ouvrir_emplacement)
         layout_dos.addWidget(self.table_dossiers)
 
 
@@ -1013,10 +736,9 @@ class MaintenanceTool(QMainWindow):
         self.table_dossiers.customContextMenuRequested.connect(
             self.menu_contextuel_dossiers)
 
-        # --- Onglet Analyse Disque ---
-        tab_disque = QWidget()
+    def _construire_onglet_disque(self, tab_disque):
+        """Construit l'onglet 📊 Analyse Disque."""
         layout_disque = QVBoxLayout(tab_disque)
-        self.tabs.addTab(tab_disque, "📊 Analyse Disque")
 
         btn_layout_disk = QHBoxLayout()
         self.btn_analyze_disk = QPushButton("Analyser l'espace disque")
@@ -1024,9 +746,20 @@ class MaintenanceTool(QMainWindow):
         self.label_disk_min_size = QLabel("Taille min (Mo):")
         self.entry_disk_min_size = QLineEdit("100")
         self.entry_disk_min_size.setMaximumWidth(80)
+        self.label_disk_max_files = QLabel("Nb max fichiers:")
+        self.entry_disk_max_files = QLineEdit("500")
+        self.entry_disk_max_files.setMaximumWidth(80)
         btn_layout_disk.addWidget(self.btn_analyze_disk)
         btn_layout_disk.addWidget(self.label_disk_min_size)
         btn_layout_disk.addWidget(self.entry_disk_min_size)
+        btn_layout_disk.addWidget(self.label_disk_max_files)
+        btn_layout_disk.addWidget(self.entry_disk_max_files)
+        self.check_disk_cache = QCheckBox("Réutiliser les dossiers inchangés")
+        self.check_disk_cache.setChecked(True)
+        self.check_disk_cache.setToolTip(
+            "Les dossiers dont la date de modification n'a pas changé depuis "
+            "l'analyse précédente ne sont pas réexaminés.")
+        btn_layout_disk.addWidget(self.check_disk_cache)
         self.progress_disk = QProgressBar()
         btn_layout_disk.addWidget(self.progress_disk)
         layout_disque.addLayout(btn_layout_disk)
@@ -1039,21 +772,47 @@ class MaintenanceTool(QMainWindow):
         layout_disque.addWidget(self.text_partitions)
 
         # Tableau gros fichiers
-        self.table_gros_fichiers = QTableWidget(0, 4)
-        self.table_gros_fichiers.setHorizontalHeaderLabels(
-            ["Fichier", "Chemin", "Taille", "Date modification"])
+        self.modele_gros_fichiers = ModeleGrosFichiers(self)
+        self.table_gros_fichiers = QTableView()
+        self.table_gros_fichiers.setModel(self.modele_gros_fichiers)
         self.table_gros_fichiers.horizontalHeader(
         ).setSectionResizeMode(QHeaderView.Stretch)
         self.table_gros_fichiers.setSortingEnabled(True)
         self.table_gros_fichiers.setEditTriggers(
             QAbstractItemView.NoEditTriggers)
-        layout_disque.addWidget(QLabel("Gros fichiers:"))
-        layout_disque.addWidget(self.table_gros_fichiers)
-
-        # --- Onglet Nettoyage ---
-        tab_cleanup = QWidget()
+        layout_resultats_disque = QHBoxLayout()
+        layout_gros_fichiers = QVBoxLayout()
+        layout_gros_fichiers.addWidget(QLabel("Gros fichiers:"))
+        layout_gros_fichiers.addWidget(self.table_gros_fichiers)
+        layout_resultats_disque.addLayout(layout_gros_fichiers)
+
+        # Exploration de l'arbre des tailles de dossiers
+        self.modele_arbre = ModeleArbre(self)
+        self.table_arbre = QTableView()
+        self.table_arbre.setModel(self.modele_arbre)
+        self.table_arbre.horizontalHeader(
+        ).setSectionResizeMode(QHeaderView.Stretch)
+        self.table_arbre.setColumnHidden(ModeleArbre.COLONNE_NOEUD, True)
+        self.table_arbre.setSortingEnabled(True)
+        self.table_arbre.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_arbre.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_arbre.doubleClicked.connect(self.descendre_arbre)
+        layout_arbre_entete = QHBoxLayout()
+        self.label_arbre = QLabel("Dossiers:")
+        self.btn_remonter_arbre = QPushButton("⬆ Remonter")
+        self.btn_remonter_arbre.clicked.connect(self.remonter_arbre)
+        layout_arbre_entete.addWidget(self.label_arbre)
+        layout_arbre_entete.addStretch()
+        layout_arbre_entete.addWidget(self.btn_remonter_arbre)
+        layout_arbre = QVBoxLayout()
+        layout_arbre.addLayout(layout_arbre_entete)
+        layout_arbre.addWidget(self.table_arbre)
+        layout_resultats_disque.addLayout(layout_arbre)
+        layout_disque.addLayout(layout_resultats_disque)
+
+    def _construire_onglet_nettoyage(self, tab_cleanup):
+        """Construit l'onglet 🗑️ Nettoyage."""
         layout_cleanup = QVBoxLayout(tab_cleanup)
-        self.tabs.addTab(tab_cleanup, "🗑️ Nettoyage")
 
         layout_cleanup.addWidget(
             QLabel("Sélectionnez les éléments à nettoyer:"))
@@ -1066,12 +825,15 @@ class MaintenanceTool(QMainWindow):
         self.check_prefetch = QCheckBox("Prefetch (requiert droits admin)")
         self.check_recycle_bin = QCheckBox("Vider la corbeille")
         self.check_browser_cache = QCheckBox("Cache des navigateurs")
+        self.check_tous_profils = QCheckBox(
+            "Temp et caches de tous les profils utilisateurs (requiert droits admin)")
 
         layout_cleanup.addWidget(self.check_temp_windows)
         layout_cleanup.addWidget(self.check_temp_user)
         layout_cleanup.addWidget(self.check_prefetch)
         layout_cleanup.addWidget(self.check_recycle_bin)
         layout_cleanup.addWidget(self.check_browser_cache)
+        layout_cleanup.addWidget(self.check_tous_profils)
 
         btn_layout_cleanup = QHBoxLayout()
         self.btn_cleanup = QPushButton("Lancer le nettoyage")
@@ -1089,10 +851,9 @@ class MaintenanceTool(QMainWindow):
         layout_cleanup.addWidget(QLabel("Résultats du nettoyage:"))
         layout_cleanup.addWidget(self.text_cleanup_results)
 
-        # --- Onglet Sécurité ---
-        tab_security = QWidget()
+    def _construire_onglet_securite(self, tab_security):
+        """Construit l'onglet 🔐 Analyse Sécurité."""
         layout_security = QVBoxLayout(tab_security)
-        self.tabs.addTab(tab_security, "🔐 Analyse Sécurité")
 
         btn_layout_security = QHBoxLayout()
         self.btn_analyze_security = QPushButton("Analyser la sécurité")
@@ -1122,6 +883,16 @@ class MaintenanceTool(QMainWindow):
         self.table_obsolete.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout_security.addWidget(self.table_obsolete)
 
+        # Ports ouverts
+        layout_security.addWidget(QLabel("🌐 Ports ouverts:"))
+        self.table_ports = QTableWidget(0, 5)
+        self.table_ports.setHorizontalHeaderLabels(
+            ["Protocole", "Adresse", "Port", "Processus", "Remarque"])
+        self.table_ports.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_ports.setMaximumHeight(200)
+        self.table_ports.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout_security.addWidget(self.table_ports)
+
         # Services suspects
         layout_security.addWidget(QLabel("🔍 Services suspects:"))
         self.table_services = QTableWidget(0, 3)
@@ -1131,9 +902,6 @@ class MaintenanceTool(QMainWindow):
         self.table_services.setEditTriggers(QAbstractItemView.NoEditTriggers)
         layout_security.addWidget(self.table_services)
 
-        # ✅ Configuration des polices (après création de tous les widgets)
-        self._setup_fonts()
-
     # ✅ Fonctions principales
 
 # ✅ Fonctions principales
@@ -1143,9 +911,8 @@ class MaintenanceTool(QMainWindow):
         copier_action = menu.addAction("Copier le chemin")
         action = menu.exec_(self.table_programmes.viewport().mapToGlobal(pos))
         if action == copier_action:
-            ligne = self.table_programmes.currentRow()
-            texte = self.table_programmes.item(
-                ligne, 2).text()  # Colonne Chemin
+            ligne = self.table_programmes.currentIndex().row()
+            texte = self.modele_programmes.texte(ligne, 2)  # Colonne Chemin
             QApplication.clipboard().setText(texte)
 
     def menu_contextuel_dossiers(self, pos):
@@ -1153,9 +920,8 @@ class MaintenanceTool(QMainWindow):
         copier_action = menu.addAction("Copier le chemin")
         action = menu.exec_(self.table_dossiers.viewport().mapToGlobal(pos))
         if action == copier_action:
-            ligne = self.table_dossiers.currentRow()
-            texte = self.table_dossiers.item(
-                ligne, 0).text()  # Colonne Dossier
+            ligne = self.table_dossiers.currentIndex().row()
+            texte = self.modele_dossiers.texte(ligne, 0)  # Colonne Dossier
             QApplication.clipboard().setText(texte)
 
     def show_about(self):
@@ -1174,86 +940,115 @@ class MaintenanceTool(QMainWindow):
             self.entry_path.setText(chemin)
 
     def lancer_scan_dossiers(self):
+        if self.travail_en_cours("scan", "Scan des dossiers"):
+            return
         chemin = self.entry_path.text()
         if not chemin:
             QMessageBox.critical(
                 self, "Erreur", "Veuillez sélectionner un dossier.")
             return
         self.progress_bar.setValue(0)
-        self.table_dossiers.setRowCount(0)
-        self.scan_thread = ScanThread(chemin)
-        self.scan_thread.progress.connect(self.progress_bar.setValue)
-        self.scan_thread.finished.connect(self.afficher_resultats_dossiers)
-        self.scan_thread.start()
-
-    def afficher_resultats_dossiers(self, resultats):
-        """Affiche les résultats du scan de dossiers vides dans le tableau."""
-        self.dossiers_vides = resultats
+        self.dossiers_vides = []
         self.table_dossiers.setSortingEnabled(False)
-        if self.dossiers_vides:
-            self.table_dossiers.setRowCount(len(self.dossiers_vides))
-            for row, (dossier, taille) in enumerate(self.dossiers_vides):
-                self.table_dossiers.setItem(row, 0, QTableWidgetItem(dossier))
-                self.table_dossiers.setItem(row, 1, QTableWidgetItem(taille))
-            self.table_dossiers.setSortingEnabled(True)
-            logging.info(f"{len(self.dossiers_vides)} dossiers vides trouvés.")
+        self.modele_dossiers.vider()
+        self.label_scan_status.setText("")
+        travail = ScanThread(chemin)
+        self.suivre_progression(self.progress_bar, travail)
+        travail.lot.connect(self.ajouter_lot_dossiers)
+        travail.finished.connect(self.afficher_resultats_dossiers)
+        self.lancer_travail("scan", travail)
+
+    def ajouter_lot_dossiers(self, lot):
+        """Ajoute un lot de dossiers vides au tableau pendant le scan."""
+        self.dossiers_vides.extend(lot)
+        self.modele_dossiers.ajouter_lignes(lot)
+
+    def afficher_resultats_dossiers(self, total):
+        """Termine l'affichage du scan de dossiers vides."""
+        self.table_dossiers.setSortingEnabled(True)
+        cache = self.travaux['scan'].stats_cache
+        self.label_scan_status.setText(
+            f"{total} dossiers vides — cache: {cache['succes']} dossiers "
+            f"réutilisés, {cache['echecs']} relus")
+        logging.info(
+            f"Scan: {cache['succes']} dossiers en cache, {cache['echecs']} relus")
+        if total:
+            logging.info(f"{total} dossiers vides trouvés.")
         else:
             QMessageBox.information(self, "Info", "Aucun dossier vide trouvé.")
 
     def lancer_scan_programmes(self):
+        if self.travail_en_cours("programmes", "Inventaire des programmes"):
+            return
         self.progress_prog.setValue(0)
-        self.table_programmes.setRowCount(0)
-        self.program_thread = ProgramThread()
-        self.program_thread.progress.connect(self.progress_prog.setValue)
-        self.program_thread.finished.connect(
+        self.modele_programmes.vider()
+        travail = ProgramThread()
+        travail.progress.connect(self.progress_prog.setValue)
+        travail.lot.connect(self.modele_programmes.ajouter_lignes)
+        travail.finished.connect(
             self.afficher_resultats_programmes)
-        self.program_thread.start()
+        self.lancer_travail("programmes", travail, PRIORITE_HAUTE)
 
     def afficher_resultats_programmes(self, programmes):
-        """Affiche les programmes installés dans le tableau."""
+        """
+        Affiche les programmes installés dans le tableau, complété ou
+        remplacé selon le delta avec la liste en cache déjà affichée.
+        """
         self.tous_les_programmes = programmes
         self.table_programmes.setSortingEnabled(False)
+        # Index construit sur les lignes du modèle, dans leur ordre de
+        # stockage, et non sur l'ordre de l'inventaire
+        self.index_programmes = self.modele_programmes.actualiser(
+            programmes, self.travaux['programmes'].tache.delta)
         if self.tous_les_programmes:
-            self.table_programmes.setRowCount(len(self.tous_les_programmes))
-            for row, prog in enumerate(self.tous_les_programmes):
-                for col, val in enumerate(prog):
-                    self.table_programmes.setItem(
-                        row, col, QTableWidgetItem(val))
             self.table_programmes.setSortingEnabled(True)
+            if self.entry_filter.text().strip():
+                self.filtrer_programmes()
             logging.info(
                 f"{len(self.tous_les_programmes)} programmes trouvés.")
         else:
             QMessageBox.information(
                 self, "Info", "Aucun programme trouvé ou système non supporté.")
 
+    def afficher_historique_programmes(self):
+        """Affiche les derniers changements de l'inventaire des programmes."""
+        cache = ouvrir_cache_programmes()
+        if cache is None:
+            QMessageBox.warning(self, "Historique", "Historique indisponible.")
+            return
+        with cache:
+            changements = cache.historique(limite=50)
+        if not changements:
+            QMessageBox.information(
+                self, "Historique", "Aucun changement enregistré pour l'instant.")
+            return
+
+        libelles = {'ajout': "➕", 'suppression': "➖", 'mise_a_jour': "🔄"}
+        lignes = []
+        for c in changements:
+            date = datetime.fromtimestamp(c['date']).strftime("%d/%m/%Y %H:%M")
+            if c['changement'] == 'mise_a_jour':
+                versions = f"{c['ancienne_version']} → {c['nouvelle_version']}"
+            else:
+                versions = c['nouvelle_version'] or c['ancienne_version'] or ""
+            lignes.append(f"{date}  {libelles[c['changement']]} {c['nom']} {versions}")
+        QMessageBox.information(
+            self, "Historique des programmes", "\n".join(lignes))
+
     def filtrer_programmes(self):
         """Filtre les programmes affichés selon les critères de recherche."""
-        texte = self.entry_filter.text().lower().strip()
+        self.timer_filtre.stop()
+        if self.index_programmes is None:
+            return
+        texte = self.entry_filter.text().strip()
         filtre_type = self.combo_filter.currentText()
-        self.table_programmes.setRowCount(0)
-        for prog in self.tous_les_programmes:
-            nom, version, chemin = prog
-            chemin_normalise = os.path.normpath(
-                os.path.abspath(chemin)).lower() if chemin else ""
-            match = False
-            if filtre_type == "Tous":
-                match = (fnmatch.fnmatch(nom.lower(), f"*{texte}*") or fnmatch.fnmatch(
-                    version.lower(), f"*{texte}*") or fnmatch.fnmatch(chemin_normalise, f"*{texte}*"))
-            elif filtre_type == "Programme":
-                match = fnmatch.fnmatch(nom.lower(), f"*{texte}*")
-            elif filtre_type == "Version":
-                match = fnmatch.fnmatch(version.lower(), f"*{texte}*")
-            elif filtre_type == "Chemin":
-                match = fnmatch.fnmatch(chemin_normalise, f"*{texte}*")
-            if match:
-                row = self.table_programmes.rowCount()
-                self.table_programmes.insertRow(row)
-                for col, val in enumerate(prog):
-                    self.table_programmes.setItem(
-                        row, col, QTableWidgetItem(val))
+        self.modele_programmes.filtrer(
+            self.index_programmes.filtrer(texte, filtre_type))
 
     def lancer_recherche_globale(self):
         """Lance une recherche globale de fichiers sur le disque C:\\."""
+        if self.travail_en_cours("recherche", "Recherche globale"):
+            return
         mot_cle, ok = QInputDialog.getText(
             self, "Recherche globale",
             "Entrer le mot-clé à rechercher:\n(Attention: cette opération peut être longue)")
@@ -1265,8 +1060,10 @@ class MaintenanceTool(QMainWindow):
 
         confirm = QMessageBox.question(
             self, "Confirmation",
-            f"La recherche de '{mot_cle}' sur tout le disque C:\\ peut prendre plusieurs minutes.\n"
-            f"Les résultats seront limités aux {GlobalSearchThread.MAX_RESULTS} premiers fichiers trouvés.\n\n"
+            f"Recherche de '{mot_cle}' sur le disque C:\\.\n"
+            "La première recherche construit l'index des fichiers et peut prendre "
+            "plusieurs minutes ; les suivantes sont immédiates.\n"
+            "Utilisez * et ? pour une recherche par motif (ex. rapport*.pdf).\n\n"
             "Voulez-vous continuer ?",
             QMessageBox.Yes | QMessageBox.No
         )
@@ -1275,34 +1072,53 @@ class MaintenanceTool(QMainWindow):
             return
 
         self.progress_prog.setValue(0)
-        self.global_thread = GlobalSearchThread(mot_cle.strip())
-        self.global_thread.progress.connect(self.progress_prog.setValue)
-        self.global_thread.finished.connect(self.afficher_resultats_globaux)
-        self.global_thread.start()
+        self.apercu_recherche = []
+        # Une nouvelle recherche passe avant le rafraîchissement de l'index
+        rafraichissement = self.taches.en_cours("index")
+        if rafraichissement is not None:
+            rafraichissement.annuler()
+        travail = GlobalSearchThread(mot_cle.strip(),
+                                     rafraichissement=rafraichissement)
+        self.suivre_progression(self.progress_prog, travail)
+        travail.lot.connect(self.ajouter_lot_recherche_globale)
+        travail.finished.connect(self.afficher_resultats_globaux)
+        travail.finished.connect(lambda _: self.rafraichir_index(travail))
+        self.lancer_travail("recherche", travail)
         logging.info(f"Recherche globale lancée pour: {mot_cle}")
 
-    def afficher_resultats_globaux(self, resultats):
+    def rafraichir_index(self, recherche):
+        """Rafraîchit l'index de recherche en tâche de fond, après la recherche."""
+        if recherche.arretee:
+            return
+        self.lancer_travail("index", IndexRefreshThread(recherche.chemin_base),
+                            PRIORITE_BASSE)
+
+    def ajouter_lot_recherche_globale(self, lot):
+        """Conserve uniquement les 50 premiers résultats pour l'aperçu."""
+        manquants = 50 - len(self.apercu_recherche)
+        if manquants > 0:
+            self.apercu_recherche.extend(lot[:manquants])
+
+    def afficher_resultats_globaux(self, total):
         """Affiche les résultats de la recherche globale."""
-        if not resultats:
+        if not total:
             QMessageBox.information(self, "Info", "Aucun fichier trouvé.")
             return
 
-        message_limite = ""
-        if len(resultats) >= GlobalSearchThread.MAX_RESULTS:
-            message_limite = f"\n\n⚠️ Limite de {GlobalSearchThread.MAX_RESULTS} résultats atteinte. Affinez votre recherche pour voir plus de fichiers."
-
         # Limiter l'affichage à 50 résultats dans la boîte de dialogue
-        texte = "\n".join(resultats[:50])
-        if len(resultats) > 50:
-            texte += f"\n\n... et {len(resultats) - 50} autres fichiers"
+        texte = "\n".join(self.apercu_recherche)
+        if total > 50:
+            texte += f"\n\n... et {total - 50} autres fichiers"
 
         QMessageBox.information(
             self, "Résultats",
-            f"Fichiers trouvés ({len(resultats)} total):\n{texte}{message_limite}")
-        logging.info(f"Recherche terminée: {len(resultats)} fichiers trouvés.")
+            f"Fichiers trouvés ({total} total):\n{texte}")
+        logging.info(f"Recherche terminée: {total} fichiers trouvés.")
 
     def desinstaller_programme(self):
-        """Désinstalle le programme sélectionné dans le tableau."""
+        """Désinstalle les programmes sélectionnés dans le tableau."""
+        if self.travail_en_cours("desinstallation", "Désinstallation"):
+            return
         selection = self.table_programmes.selectionModel().selectedRows()
         if not selection:
             QMessageBox.warning(
@@ -1310,18 +1126,30 @@ class MaintenanceTool(QMainWindow):
                 "Veuillez sélectionner un programme à désinstaller.")
             return
 
-        # Récupérer le nom du programme sélectionné
-        row = selection[0].row()
-        programme_nom = self.table_programmes.item(row, 0).text()
-        programme_version = self.table_programmes.item(row, 1).text() if self.table_programmes.item(row, 1) else "N/A"
+        # Programmes sélectionnés (nom, version, chemin), sans doublon de nom
+        elements = {}
+        for index in sorted(selection, key=lambda i: i.row()):
+            row = index.row()
+            nom = self.modele_programmes.texte(row, 0)
+            elements.setdefault(nom, (
+                self.modele_programmes.texte(row, 1) or "N/A",
+                self.modele_programmes.texte(row, 2)))
+
+        if len(elements) == 1:
+            nom, (version, _) = next(iter(elements.items()))
+            description = f"Programme : {nom}\nVersion : {version}"
+        else:
+            noms = [f"• {nom} ({version})" for nom, (version, _) in elements.items()]
+            if len(noms) > 20:
+                noms = noms[:20] + [f"... et {len(noms) - 20} autres"]
+            description = f"{len(elements)} programmes :\n" + "\n".join(noms)
 
         # Demander confirmation
         confirm = QMessageBox.question(
             self, "Confirmation de désinstallation",
             f"⚠️ ATTENTION ⚠️\n\n"
             f"Vous êtes sur le point de désinstaller :\n\n"
-            f"Programme : {programme_nom}\n"
-            f"Version : {programme_version}\n\n"
+            f"{description}\n\n"
             f"Cette action peut ne pas être réversible.\n"
             f"Voulez-vous continuer ?",
             QMessageBox.Yes | QMessageBox.No
@@ -1330,45 +1158,71 @@ class MaintenanceTool(QMainWindow):
         if confirm != QMessageBox.Yes:
             return
 
-        # Lancer la désinstallation
+        # Lancer la file de désinstallation
         self.progress_prog.setValue(0)
         self.btn_uninstall.setEnabled(False)
-        
-        self.uninstall_thread = UninstallThread(programme_nom, programme_nom)
-        self.uninstall_thread.progress.connect(self.update_uninstall_progress)
-        self.uninstall_thread.finished.connect(self.afficher_resultat_desinstallation)
-        self.uninstall_thread.start()
-        logging.info(f"Désinstallation lancée pour: {programme_nom}")
+        self.modele_programmes.effacer_statuts()
+
+        travail = UninstallThread(
+            [(nom, nom, chemin) for nom, (_, chemin) in elements.items()])
+        travail.progress.connect(self.update_uninstall_progress)
+        travail.statut.connect(self.update_uninstall_statut)
+        travail.finished.connect(self.afficher_resultat_desinstallation)
+        self.lancer_travail("desinstallation", travail, PRIORITE_HAUTE)
+        logging.info(f"Désinstallation lancée pour: {', '.join(elements)}")
 
     def update_uninstall_progress(self, value, message):
         """Met à jour la progression de la désinstallation."""
         self.progress_prog.setValue(value)
         self.statusBar().showMessage(message, 3000)
 
-    def afficher_resultat_desinstallation(self, success, message):
-        """Affiche le résultat de la désinstallation."""
+    def update_uninstall_statut(self, nom, etat, message):
+        """Affiche l'état d'un programme de la file dans la colonne Statut."""
+        self.modele_programmes.definir_statut(nom, etat)
+
+    def afficher_resultat_desinstallation(self, resultats):
+        """Affiche le résultat de la file de désinstallation."""
         self.btn_uninstall.setEnabled(True)
         self.progress_prog.setValue(0)
-        
-        if success:
+
+        reussis = [r for r in resultats if r['succes']]
+        echecs = [r for r in resultats if r['etat'] == ECHEC]
+        annules = [r for r in resultats if r['etat'] == ANNULE]
+
+        if reussis and not echecs:
+            texte = "\n".join(f"✅ {r['message']}" for r in reussis)
+            if annules:
+                texte += f"\n\n{len(annules)} désinstallation(s) annulée(s)."
             QMessageBox.information(
                 self, "Succès",
-                f"✅ {message}\n\nLa liste des programmes va être actualisée.")
-            logging.info(f"Désinstallation réussie: {message}")
-            # Rafraîchir automatiquement la liste des programmes
-            self.lancer_scan_programmes()
-        else:
+                f"{texte}\n\nLa liste des programmes va être actualisée.")
+        elif annules and not echecs:
+            QMessageBox.information(
+                self, "Désinstallation annulée",
+                f"{len(annules)} désinstallation(s) annulée(s).")
+        elif echecs:
+            texte = "\n\n".join(f"❌ {r['nom']} : {r['message']}" for r in echecs)
+            if reussis:
+                texte = (f"{len(reussis)} programme(s) désinstallé(s), "
+                         f"{len(echecs)} échec(s).\n\n{texte}")
             QMessageBox.critical(
                 self, "Erreur",
-                f"❌ Échec de la désinstallation\n\n{message}\n\n"
+                f"❌ Échec de la désinstallation\n\n{texte}\n\n"
                 f"Note: Certains programmes nécessitent des droits administrateur ou un désinstalleur manuel.")
-            logging.error(f"Échec désinstallation: {message}")
+        logging.info(
+            f"Désinstallation terminée: {len(reussis)} réussie(s), "
+            f"{len(echecs)} échec(s), {len(annules)} annulée(s)")
+
+        if reussis:
+            # Rafraîchir automatiquement la liste des programmes
+            self.lancer_scan_programmes()
 
-    def ouvrir_programme(self, row, col):
+    def ouvrir_programme(self, index):
         """Ouvre l'emplacement du programme sélectionné."""
-        chemin = self.table_programmes.item(row, 2).text()
+        chemin = self.modele_programmes.texte(index.row(), 2)
         try:
             if chemin.startswith("http://") or chemin.startswith("https://"):
+                import webbrowser
                 webbrowser.open(chemin)
             elif chemin and os.path.exists(chemin):
                 if platform.system() == "Windows":
@@ -1383,9 +1237,9 @@ class MaintenanceTool(QMainWindow):
                 self, "Erreur", f"Impossible d'ouvrir le chemin: {e}")
             logging.error(f"Erreur lors de l'ouverture: {e}")
 
-    def ouvrir_emplacement(self, row, col):
+    def ouvrir_emplacement(self, index):
         """Ouvre le dossier sélectionné dans l'explorateur."""
-        dossier = self.table_dossiers.item(row, 0).text()
+        dossier = self.modele_dossiers.texte(index.row(), 0)
         try:
             if os.path.exists(dossier):
                 if platform.system() == "Windows":
@@ -1401,16 +1255,24 @@ class MaintenanceTool(QMainWindow):
 
     def lancer_analyse_disque(self):
         """Lance l'analyse de l'espace disque et la recherche de gros fichiers."""
+        if self.travail_en_cours("disque", "Analyse disque"):
+            return
         try:
             taille_min = int(self.entry_disk_min_size.text())
         except ValueError:
             QMessageBox.warning(
                 self, "Erreur", "Veuillez entrer une taille valide en Mo.")
             return
+        try:
+            nb_max = int(self.entry_disk_max_files.text())
+        except ValueError:
+            QMessageBox.warning(
+                self, "Erreur", "Veuillez entrer un nombre de fichiers valide.")
+            return
 
         confirm = QMessageBox.question(
             self, "Confirmation",
-            f"L'analyse va rechercher tous les fichiers de plus de {taille_min} Mo.\n"
+            f"L'analyse va rechercher les {nb_max} plus gros fichiers de plus de {taille_min} Mo.\n"
             "Cette opération peut prendre plusieurs minutes.\n\n"
             "Continuer ?",
             QMessageBox.Yes | QMessageBox.No
@@ -1420,13 +1282,18 @@ class MaintenanceTool(QMainWindow):
             return
 
         self.progress_disk.setValue(0)
-        self.table_gros_fichiers.setRowCount(0)
+        self.table_gros_fichiers.setSortingEnabled(False)
+        self.modele_gros_fichiers.vider()
+        self.modele_arbre.vider()
+        self.label_arbre.setText("Dossiers:")
         self.text_partitions.clear()
 
-        self.disk_thread = DiskAnalysisThread("C:\\", taille_min)
-        self.disk_thread.progress.connect(self.progress_disk.setValue)
-        self.disk_thread.finished.connect(self.afficher_resultats_disque)
-        self.disk_thread.start()
+        travail = DiskAnalysisThread(
+            "C:\\", taille_min, nb_max, self.check_disk_cache.isChecked())
+        self.suivre_progression(self.progress_disk, travail)
+        travail.classement.connect(self.afficher_classement_gros_fichiers)
+        travail.finished.connect(self.afficher_resultats_disque)
+        self.lancer_travail("disque", travail)
         logging.info(f"Analyse disque lancée (taille min: {taille_min} Mo)")
 
     def afficher_resultats_disque(self, resultats):
@@ -1446,39 +1313,70 @@ class MaintenanceTool(QMainWindow):
             info_partitions += f"   Libre: {libre_gb:.2f} Go\n"
             info_partitions += f"   {'🔴' if part['pourcentage'] > 90 else '🟡' if part['pourcentage'] > 75 else '🟢'}\n\n"
 
-        self.text_partitions.setPlainText(info_partitions)
+        if resultats.get('total_fichiers'):
+            info_partitions += "=== ANALYSE ===\n\n"
+            info_partitions += (
+                f"📁 {resultats['total_fichiers']} fichiers analysés, "
+                f"{resultats['total_octets'] / (1024**3):.2f} Go\n")
+            cache = resultats.get('cache', {})
+            info_partitions += (
+                f"♻️ Cache: {cache.get('succes', 0)} dossiers réutilisés, "
+                f"{cache.get('echecs', 0)} relus\n")
+            for dossier in resultats.get('gros_dossiers', [])[:10]:
+                info_partitions += (
+                    f"   {dossier['taille'] / (1024**3):.2f} Go "
+                    f"({dossier['nb_fichiers']} fichiers) {dossier['chemin']}\n")
 
-        # Afficher les gros fichiers
-        self.table_gros_fichiers.setSortingEnabled(False)
-        if resultats['gros_fichiers']:
-            self.table_gros_fichiers.setRowCount(
-                len(resultats['gros_fichiers']))
-            for row, fichier in enumerate(resultats['gros_fichiers']):
-                self.table_gros_fichiers.setItem(
-                    row, 0, QTableWidgetItem(fichier['nom']))
-                self.table_gros_fichiers.setItem(
-                    row, 1, QTableWidgetItem(fichier['chemin']))
-
-                taille_mb = fichier['taille'] / (1024**2)
-                if taille_mb >= 1024:
-                    taille_str = f"{taille_mb / 1024:.2f} Go"
-                else:
-                    taille_str = f"{taille_mb:.2f} Mo"
-                self.table_gros_fichiers.setItem(
-                    row, 2, QTableWidgetItem(taille_str))
+        self.text_partitions.setPlainText(info_partitions)
 
-                date_str = fichier['date_modif'].strftime("%Y-%m-%d %H:%M")
-                self.table_gros_fichiers.setItem(
-                    row, 3, QTableWidgetItem(date_str))
+        if resultats.get('arbre') is not None and len(resultats['arbre']):
+            self.afficher_noeud_arbre(resultats['arbre'], 0)
 
+        # Afficher les gros fichiers (liste finale triée)
+        self.afficher_classement_gros_fichiers(resultats['gros_fichiers'])
+        if resultats['gros_fichiers']:
             self.table_gros_fichiers.setSortingEnabled(True)
             logging.info(
                 f"{len(resultats['gros_fichiers'])} gros fichiers trouvés.")
         else:
             QMessageBox.information(self, "Info", "Aucun gros fichier trouvé.")
 
+    def afficher_classement_gros_fichiers(self, classement):
+        """Remplace le tableau par le classement courant des gros fichiers."""
+        self.table_gros_fichiers.setSortingEnabled(False)
+        self.modele_gros_fichiers.vider()
+        self.modele_gros_fichiers.ajouter_fichiers(classement)
+
+    def afficher_noeud_arbre(self, arbre, noeud):
+        """Affiche les sous-dossiers d'un nœud de l'arbre des tailles."""
+        self.table_arbre.setSortingEnabled(False)
+        self.modele_arbre.afficher_noeud(arbre, noeud)
+        self.table_arbre.setSortingEnabled(True)
+        self.table_arbre.sortByColumn(1, Qt.DescendingOrder)
+        self.label_arbre.setText(
+            f"Dossiers: {arbre.chemin(noeud)} "
+            f"({arbre.octets[noeud] / (1024**3):.2f} Go, "
+            f"{arbre.fichiers[noeud]} fichiers)")
+
+    def descendre_arbre(self, index):
+        """Descend dans le sous-dossier double-cliqué."""
+        if self.modele_arbre.arbre is None:
+            return
+        noeud = self.modele_arbre.valeur(index.row(), ModeleArbre.COLONNE_NOEUD)
+        self.afficher_noeud_arbre(self.modele_arbre.arbre, noeud)
+
+    def remonter_arbre(self):
+        """Revient au dossier parent dans l'arbre des tailles."""
+        arbre = self.modele_arbre.arbre
+        if arbre is None or self.modele_arbre.noeud == 0:
+            return
+        self.afficher_noeud_arbre(arbre, arbre.parents[self.modele_arbre.noeud])
+
     def lancer_nettoyage(self):
         """Lance le nettoyage du système selon les options sélectionnées."""
+        if (self.travail_en_cours("estimation_nettoyage", "Estimation du nettoyage")
+                or self.travail_en_cours("nettoyage", "Nettoyage")):
+            return
         options = {
             'temp_windows': self.check_temp_windows.isChecked(),
             'temp_user': self.check_temp_user.isChecked(),
@@ -1492,26 +1390,55 @@ class MaintenanceTool(QMainWindow):
                                 "Veuillez sélectionner au moins une option.")
             return
 
+        self.progress_cleanup.setValue(0)
+        self.text_cleanup_results.clear()
+        self.label_cleanup_status.setText("Estimation en cours...")
+        self.btn_cleanup.setEnabled(False)
+
+        travail = CleanupEstimateThread(
+            options, self.check_tous_profils.isChecked())
+        travail.progress.connect(self.update_cleanup_progress)
+        travail.finished.connect(self.confirmer_nettoyage)
+        self.lancer_travail("estimation_nettoyage", travail)
+        logging.info("Estimation du nettoyage lancée")
+
+    def confirmer_nettoyage(self, estimation):
+        """Affiche l'estimation puis lance la suppression si confirmée."""
+        self.btn_cleanup.setEnabled(True)
+        tache = self.travaux['estimation_nettoyage'].tache
+
+        apercu = "=== ESTIMATION AVANT NETTOYAGE ===\n\n"
+        for option, compteurs in estimation['categories'].items():
+            apercu += (f"• {LIBELLES_OPTIONS.get(option, option)}: "
+                       f"{compteurs['fichiers']} fichiers, "
+                       f"{format_taille(compteurs['octets'])}\n")
+        apercu += (f"\nTotal: {estimation['fichiers']} fichiers, "
+                   f"{format_taille(estimation['octets'])}")
+        self.text_cleanup_results.setPlainText(apercu)
+        self.label_cleanup_status.setText(
+            f"Estimation terminée ({estimation['duree']:.1f} s)")
+
         confirm = QMessageBox.question(
             self, "Confirmation",
             "⚠️ ATTENTION ⚠️\n\n"
-            "Le nettoyage va supprimer définitivement des fichiers.\n"
+            f"Le nettoyage va supprimer définitivement {estimation['fichiers']} "
+            f"fichiers ({format_taille(estimation['octets'])}).\n"
             "Certaines applications devront peut-être être redémarrées.\n\n"
             "Voulez-vous continuer ?",
             QMessageBox.Yes | QMessageBox.No
         )
 
         if confirm != QMessageBox.Yes:
+            self.label_cleanup_status.setText("Nettoyage annulé")
             return
 
         self.progress_cleanup.setValue(0)
-        self.text_cleanup_results.clear()
         self.label_cleanup_status.setText("Nettoyage en cours...")
 
-        self.cleanup_thread = CleanupThread(options)
-        self.cleanup_thread.progress.connect(self.update_cleanup_progress)
-        self.cleanup_thread.finished.connect(self.afficher_resultats_nettoyage)
-        self.cleanup_thread.start()
+        travail = CleanupThread(tache.options, tache)
+        travail.progress.connect(self.update_cleanup_progress)
+        travail.finished.connect(self.afficher_resultats_nettoyage)
+        self.lancer_travail("nettoyage", travail)
         logging.info("Nettoyage lancé")
 
     def update_cleanup_progress(self, value, message):
@@ -1521,6 +1448,7 @@ class MaintenanceTool(QMainWindow):
 
     def afficher_resultats_nettoyage(self, resultats):
         """Affiche les résultats du nettoyage."""
+        self.cleanup_data = resultats
         self.label_cleanup_status.setText("Nettoyage terminé !")
 
         espace_mb = resultats['espace_libere'] / (1024**2)
@@ -1532,15 +1460,28 @@ class MaintenanceTool(QMainWindow):
         rapport = f"=== RAPPORT DE NETTOYAGE ===\n\n"
         rapport += f"✅ Fichiers supprimés: {resultats['fichiers_supprimes']}\n"
         rapport += f"💾 Espace libéré: {espace_str}\n"
-        rapport += f"❌ Erreurs: {resultats['erreurs']}\n\n"
+        rapport += f"❌ Erreurs: {resultats['erreurs']}\n"
+        rapport += (f"⏱️ Durée: {resultats['duree']:.1f} s "
+                    f"({resultats['debit']:.0f} fichiers/s)\n\n")
+
+        if resultats['categories']:
+            rapport += "=== PAR CATÉGORIE ===\n\n"
+            for option, compteurs in resultats['categories'].items():
+                rapport += (
+                    f"• {LIBELLES_OPTIONS.get(option, option)}: "
+                    f"{compteurs['fichiers']} fichiers, "
+                    f"{compteurs['octets'] / (1024**2):.2f} Mo, "
+                    f"{compteurs['dossiers']} dossiers, "
+                    f"{compteurs['erreurs']} erreurs "
+                    f"({compteurs['duree']:.1f} s)\n")
+            rapport += "\n"
 
         if resultats['details']:
             rapport += "=== DÉTAILS ===\n\n"
-            # Limiter à 100 lignes pour éviter la surcharge
-            for detail in resultats['details'][:100]:
+            for detail in resultats['details']:
                 rapport += f"• {detail}\n"
-            if len(resultats['details']) > 100:
-                rapport += f"\n... et {len(resultats['details']) - 100} autres opérations"
+            if resultats['details_omis']:
+                rapport += f"\n... et {resultats['details_omis']} autres opérations"
 
         self.text_cleanup_results.setPlainText(rapport)
 
@@ -1556,11 +1497,14 @@ class MaintenanceTool(QMainWindow):
 
     def lancer_analyse_securite(self):
         """Lance l'analyse de sécurité du système."""
+        if self.travail_en_cours("securite", "Analyse de sécurité"):
+            return
         confirm = QMessageBox.question(
             self, "Confirmation",
             "L'analyse de sécurité va examiner:\n"
             "• Les programmes au démarrage\n"
             "• Les logiciels potentiellement obsolètes\n"
+            "• Les ports ouverts\n"
             "• Les services Windows suspects\n\n"
             "Cette opération peut prendre quelques minutes.\n\n"
             "Continuer ?",
@@ -1573,74 +1517,70 @@ class MaintenanceTool(QMainWindow):
         self.progress_security.setValue(0)
         self.table_startup.setRowCount(0)
         self.table_obsolete.setRowCount(0)
+        self.table_ports.setRowCount(0)
         self.table_services.setRowCount(0)
 
-        self.security_thread = SecurityAnalysisThread()
-        self.security_thread.progress.connect(self.progress_security.setValue)
-        self.security_thread.finished.connect(self.afficher_resultats_securite)
-        self.security_thread.start()
+        travail = SecurityAnalysisThread()
+        travail.progress.connect(self.progress_security.setValue)
+        travail.collecte.connect(self.afficher_collecte_securite)
+        travail.finished.connect(self.afficher_resultats_securite)
+        self.lancer_travail("securite", travail)
         logging.info("Analyse de sécurité lancée")
 
+    def afficher_collecte_securite(self, cle, elements, mesure):
+        """Remplit la table d'un collecteur dès qu'il a terminé."""
+        tables = {
+            'programmes_demarrage': (self.table_startup, ['nom', 'chemin']),
+            'programmes_obsoletes': (self.table_obsolete, ['nom', 'version', 'raison']),
+            'ports_ouverts': (
+                self.table_ports, ['protocole', 'adresse', 'port', 'processus', 'remarque']),
+            'services_suspects': (
+                self.table_services, ['service', 'description', 'remarque']),
+        }
+        if cle not in tables:
+            return
+        table, champs = tables[cle]
+        table.setSortingEnabled(False)
+        table.setRowCount(len(elements))
+        for row, element in enumerate(elements):
+            for colonne, champ in enumerate(champs):
+                table.setItem(row, colonne, QTableWidgetItem(str(element[champ])))
+        table.setSortingEnabled(True)
+
     def afficher_resultats_securite(self, resultats):
-        """Affiche les résultats de l'analyse de sécurité."""
+        """Affiche le résumé de l'analyse de sécurité."""
         self.security_data = resultats
 
-        # Programmes au démarrage
-        self.table_startup.setSortingEnabled(False)
-        if resultats['programmes_demarrage']:
-            self.table_startup.setRowCount(
-                len(resultats['programmes_demarrage']))
-            for row, prog in enumerate(resultats['programmes_demarrage']):
-                self.table_startup.setItem(
-                    row, 0, QTableWidgetItem(prog['nom']))
-                self.table_startup.setItem(
-                    row, 1, QTableWidgetItem(prog['chemin']))
-            self.table_startup.setSortingEnabled(True)
-
-        # Programmes obsolètes
-        self.table_obsolete.setSortingEnabled(False)
-        if resultats['programmes_obsoletes']:
-            self.table_obsolete.setRowCount(
-                len(resultats['programmes_obsoletes']))
-            for row, prog in enumerate(resultats['programmes_obsoletes']):
-                self.table_obsolete.setItem(
-                    row, 0, QTableWidgetItem(prog['nom']))
-                self.table_obsolete.setItem(
-                    row, 1, QTableWidgetItem(prog['version']))
-                self.table_obsolete.setItem(
-                    row, 2, QTableWidgetItem(prog['raison']))
-            self.table_obsolete.setSortingEnabled(True)
-
-        # Services suspects
-        self.table_services.setSortingEnabled(False)
-        if resultats['services_suspects']:
-            self.table_services.setRowCount(
-                len(resultats['services_suspects']))
-            for row, service in enumerate(resultats['services_suspects']):
-                self.table_services.setItem(
-                    row, 0, QTableWidgetItem(service['service']))
-                self.table_services.setItem(
-                    row, 1, QTableWidgetItem(service['description']))
-                self.table_services.setItem(
-                    row, 2, QTableWidgetItem(service['remarque']))
-            self.table_services.setSortingEnabled(True)
-
         # Résumé
         nb_startup = len(resultats['programmes_demarrage'])
         nb_obsoletes = len(resultats['programmes_obsoletes'])
+        nb_ports = len(resultats['ports_ouverts'])
         nb_services = len(resultats['services_suspects'])
 
         message = f"Analyse de sécurité terminée !\n\n"
         message += f"📊 Programmes au démarrage: {nb_startup}\n"
         message += f"⚠️ Programmes obsolètes: {nb_obsoletes}\n"
+        message += f"🌐 Ports ouverts: {nb_ports}\n"
         message += f"🔍 Services suspects: {nb_services}\n"
 
+        # Durée et état de chaque vérification
+        mesures = self.travaux['securite'].tache.mesures if 'securite' in self.travaux else {}
+        if mesures:
+            message += "\n⏱️ Vérifications:\n"
+            for cle, mesure in mesures.items():
+                ligne = f"  {cle}: {mesure['duree']:.1f} s"
+                if mesure['etat'] != "ok":
+                    ligne += f" ({mesure['etat']}"
+                    ligne += f": {mesure['erreur']})" if mesure['erreur'] else ")"
+                message += ligne + "\n"
+
         if nb_obsoletes > 0 or nb_services > 0:
             message += "\n⚠️ Attention: Des éléments nécessitent votre vigilance."
 
         QMessageBox.information(self, "Analyse terminée", message)
         logging.info(
-            f"Analyse sécurité terminée: {nb_startup} démarrage, {nb_obsoletes} obsolètes, {nb_services} services")
+            f"Analyse sécurité terminée: {nb_startup} démarrage, {nb_obsoletes} obsolètes, "
+            f"{nb_ports} ports, {nb_services} services")
 
     def supprimer_selection(self):
         """Supprime les dossiers vides sélectionnés."""
@@ -1661,10 +1601,10 @@ class MaintenanceTool(QMainWindow):
             supprime = 0
             erreurs = 0
             for index in sorted(selection, reverse=True):  # Supprimer en ordre inverse
-                dossier = self.table_dossiers.item(index.row(), 0).text()
+                dossier = self.modele_dossiers.texte(index.row(), 0)
                 try:
-                    os.rmdir(dossier)
-                    self.table_dossiers.removeRow(index.row())
+                    supprimer_arborescence_vide(dossier)
+                    self.modele_dossiers.retirer_ligne(index.row())
                     supprime += 1
                     logging.info(f"Dossier supprimé: {dossier}")
                 except (OSError, PermissionError) as e:
@@ -1700,6 +1640,75 @@ class MaintenanceTool(QMainWindow):
                     self, "Erreur", f"Impossible d'exporter la liste: {e}")
                 logging.error(f"Erreur d'export: {e}")
 
+    def _jeux_onglet(self, index):
+        """Jeux de données exportables de l'onglet donné."""
+        titre = self.tabs.tabText(index)
+        if titre == "Programmes installés" and self.tous_les_programmes:
+            return [jeu_programmes(self.tous_les_programmes)]
+        if titre == "Dossiers vides" and self.dossiers_vides:
+            return [jeu_dossiers_vides(list(self.dossiers_vides))]
+        if titre == "📊 Analyse Disque":
+            return jeux_disque(self.disk_data)
+        if titre == "🗑️ Nettoyage" and self.cleanup_data.get('categories'):
+            return [jeu_nettoyage(self.cleanup_data)]
+        if titre == "🔐 Analyse Sécurité" and any(self.security_data.values()):
+            return [jeu_securite(self.security_data)]
+        return []
+
+    def exporter_donnees_onglet(self):
+        """Exporte les données de l'onglet courant (CSV, JSON Lines, Parquet)."""
+        jeux = self._jeux_onglet(self.tabs.currentIndex())
+        if not jeux:
+            QMessageBox.information(
+                self, "Info", "Aucune donnée à exporter dans cet onglet.")
+            return
+
+        jeu = jeux[0]
+        if len(jeux) > 1:
+            nom, ok = QInputDialog.getItem(
+                self, "Exporter", "Données à exporter :",
+                [j.nom for j in jeux], 0, False)
+            if not ok:
+                return
+            jeu = next(j for j in jeux if j.nom == nom)
+
+        if self.travail_en_cours("export", "Un export"):
+            return
+
+        formats = formats_disponibles()
+        filtres = [f"{libelle} (*{extension})" for libelle, extension in formats]
+        fichier, filtre = QFileDialog.getSaveFileName(
+            self, f"Exporter : {jeu.nom}", "", ";;".join(filtres))
+        if not fichier:
+            return
+        try:
+            format_fichier(fichier)
+        except ValueError:
+            # Extension absente ou inconnue : celle du filtre choisi
+            fichier += formats[filtres.index(filtre)][1] if filtre in filtres else ".csv"
+
+        try:
+            travail = ExportThread(fichier, jeu)
+        except ValueError as e:
+            QMessageBox.critical(self, "Erreur", str(e))
+            return
+        self.action_export_donnees.setEnabled(False)
+        travail.progress.connect(
+            lambda valeur: self.statusBar().showMessage(f"Export : {valeur} %"))
+        travail.finished.connect(self.afficher_resultat_export)
+        self.lancer_travail("export", travail, classe=CPU)
+        logging.info(f"Export lancé: {jeu.nom} -> {fichier}")
+
+    def afficher_resultat_export(self, succes, message):
+        """Affiche le résultat de l'export des données."""
+        self.action_export_donnees.setEnabled(True)
+        self.statusBar().clearMessage()
+        if succes:
+            QMessageBox.information(self, "Succès", f"Export terminé : {message}")
+            logging.info(f"Export terminé: {message}")
+        else:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de l'export : {message}")
+
     def exporter_programmes_pdf(self):
         """Exporte la liste des programmes installés en PDF."""
         if not self.tous_les_programmes:
@@ -1710,40 +1719,10 @@ class MaintenanceTool(QMainWindow):
         fichier, _ = QFileDialog.getSaveFileName(
             self, "Exporter en PDF", "", "Fichier PDF (*.pdf)")
         if fichier:
-            try:
-                doc = SimpleDocTemplate(
-                    fichier, pagesize=A4, leftMargin=30, rightMargin=30, topMargin=30, bottomMargin=30)
-                styles = getSampleStyleSheet()
-                elements = []
-                elements.append(
-                    Paragraph("Liste des programmes installés", styles['Title']))
-                elements.append(Spacer(1, 12))
-
-                data = [["Programme", "Version", "Chemin"]]
-                for prog in self.tous_les_programmes:
-                    nom = Paragraph(prog[0], styles['Normal'])
-                    version = Paragraph(prog[1], styles['Normal'])
-                    chemin = Paragraph(prog[2], styles['Normal'])
-                    data.append([nom, version, chemin])
-
-                table = Table(data, colWidths=[150, 80, 250])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                ]))
-
-                elements.append(table)
-                doc.build(elements)
-                QMessageBox.information(
-                    self, "Succès", f"PDF exporté dans : {fichier}")
-            except Exception as e:
-                QMessageBox.critical(
-                    self, "Erreur", f"Erreur lors de l'export PDF : {e}")
+            self._lancer_export_pdf(
+                fichier, "Liste des programmes installés",
+                ["Programme", "Version", "Chemin"], [150, 80, 250],
+                [prog[:3] for prog in self.tous_les_programmes])
 
     def exporter_dossiers_pdf(self):
         """Exporte la liste des dossiers vides en PDF."""
@@ -1754,84 +1733,81 @@ class MaintenanceTool(QMainWindow):
         fichier, _ = QFileDialog.getSaveFileName(
             self, "Exporter en PDF", "", "Fichier PDF (*.pdf)")
         if fichier:
-            try:
-                doc = SimpleDocTemplate(
-                    fichier, pagesize=A4, leftMargin=30, rightMargin=30, topMargin=30, bottomMargin=30)
-                styles = getSampleStyleSheet()
-                elements = []
-                elements.append(
-                    Paragraph("Liste des dossiers vides", styles['Title']))
-                elements.append(Spacer(1, 12))
-
-                data = [["Dossier", "Taille"]]
-                for dossier, taille in self.dossiers_vides:
-                    d = Paragraph(dossier, styles['Normal'])
-                    t = Paragraph(taille, styles['Normal'])
-                    data.append([d, t])
-
-                table = Table(data, colWidths=[350, 100])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                ]))
-
-                elements.append(table)
-                doc.build(elements)
-                QMessageBox.information(
-                    self, "Succès", f"PDF exporté dans : {fichier}")
-                logging.info(f"PDF dossiers exporté: {fichier}")
-            except Exception as e:
-                QMessageBox.critical(
-                    self, "Erreur", f"Impossible d'exporter en PDF: {e}")
-                logging.error(f"Erreur export PDF dossiers: {e}")
-
-    def closeEvent(self, event):
-        """Gère la fermeture de l'application en arrêtant proprement les threads."""
-        # Arrêter tous les threads en cours
-        if self.scan_thread and self.scan_thread.isRunning():
-            self.scan_thread.stop()
-            self.scan_thread.wait(1000)
-
-        if self.program_thread and self.program_thread.isRunning():
-            self.program_thread.stop()
-            self.program_thread.wait(1000)
+            self._lancer_export_pdf(
+                fichier, "Liste des dossiers vides", ["Dossier", "Taille"],
+                [350, 100], list(self.dossiers_vides))
 
-        if self.global_thread and self.global_thread.isRunning():
-            self.global_thread.stop()
-            self.global_thread.wait(1000)
-
-        if self.disk_thread and self.disk_thread.isRunning():
-            self.disk_thread.stop()
-            self.disk_thread.wait(1000)
-
-        if self.cleanup_thread and self.cleanup_thread.isRunning():
-            self.cleanup_thread.stop()
-            self.cleanup_thread.wait(1000)
+    def _lancer_export_pdf(self, fichier, titre, entetes, largeurs, lignes):
+        """Écrit le PDF en arrière-plan ; une copie des lignes est exportée."""
+        if self.travail_en_cours("export_pdf", "Un export PDF"):
+            return
 
-        if self.security_thread and self.security_thread.isRunning():
-            self.security_thread.stop()
-            self.security_thread.wait(1000)
+        self.action_export_pdf_prog.setEnabled(False)
+        self.action_export_pdf_dos.setEnabled(False)
+        travail = PdfExportThread(fichier, titre, entetes, largeurs, lignes)
+        travail.progress.connect(
+            lambda valeur: self.statusBar().showMessage(f"Export PDF : {valeur} %"))
+        travail.finished.connect(self.afficher_resultat_export_pdf)
+        self.lancer_travail("export_pdf", travail, classe=CPU)
+        logging.info(f"Export PDF lancé: {fichier} ({len(lignes)} lignes)")
+
+    def afficher_resultat_export_pdf(self, succes, message):
+        """Affiche le résultat de l'export PDF."""
+        self.action_export_pdf_prog.setEnabled(True)
+        self.action_export_pdf_dos.setEnabled(True)
+        self.statusBar().clearMessage()
+        if succes:
+            QMessageBox.information(self, "Succès", f"PDF exporté : {message}")
+            logging.info(f"PDF exporté: {message}")
+        else:
+            QMessageBox.critical(
+                self, "Erreur", f"Erreur lors de l'export PDF : {message}")
+            logging.error(f"Erreur export PDF: {message}")
+
+    def suivre_progression(self, barre, travail):
+        """Relie la progression d'un travail à une barre, avec le temps restant estimé."""
+        def afficher(valeur):
+            barre.setValue(valeur)
+            restant = travail.restant
+            barre.setFormat(f"%p% — environ {format_duree(restant)} restantes"
+                            if restant and valeur < 100 else "%p%")
+        barre.setFormat("%p%")
+        travail.progress.connect(afficher)
+
+    def travail_en_cours(self, cle, libelle):
+        """True (avec un message) si un travail de cette clé est déjà lancé."""
+        if self.taches.en_cours(cle) is None:
+            return False
+        self.statusBar().showMessage(f"{libelle} déjà en cours", 3000)
+        return True
+
+    def lancer_travail(self, cle, travail, priorite=PRIORITE_NORMALE, classe=IO):
+        """Confie un travail (ScanThread, CleanupThread...) au gestionnaire de tâches."""
+        self.travaux[cle] = travail
+        self.taches.soumettre(cle, travail.run, priorite=priorite, classe=classe,
+                              arret=travail.stop)
 
-        if self.uninstall_thread and self.uninstall_thread.isRunning():
-            self.uninstall_thread.stop()
-            self.uninstall_thread.wait(1000)
+    def closeEvent(self, event):
+        """Gère la fermeture de l'application en arrêtant proprement les travaux."""
+        # Tous les travaux sont annulés ensemble, attente totale bornée
+        self.taches.arreter(delai=2.0)
 
         logging.info("Application fermée.")
         event.accept()
 
-    def _setup_fonts(self):
-        """Configure les polices et réduit les espacements pour une meilleure apparence."""
+    def _setup_fonts(self, racine=None):
+        """
+        Configure les polices et réduit les espacements pour une meilleure
+        apparence, sur toute la fenêtre ou sur un onglet qui vient d'être
+        construit (racine).
+        """
+        racine = racine or self
         # Augmenter les marges et espacements des layouts
-        for layout in self.findChildren(QVBoxLayout):
+        for layout in racine.findChildren(QVBoxLayout):
             layout.setContentsMargins(10, 10, 10, 10)
             layout.setSpacing(12)
 
-        for layout in self.findChildren(QHBoxLayout):
+        for layout in racine.findChildren(QHBoxLayout):
             layout.setContentsMargins(10, 10, 10, 10)
             layout.setSpacing(12)
 
@@ -1849,32 +1825,39 @@ class MaintenanceTool(QMainWindow):
         font_mono.setStyleStrategy(QFont.PreferAntialias)
 
         # Appliquer les polices à la fenêtre principale
-        self.setFont(font_normal)
+        if racine is self:
+            self.setFont(font_normal)
 
         # Trouver tous les widgets et appliquer les polices appropriées
-        for widget in self.findChildren(QLabel):
+        for widget in racine.findChildren(QLabel):
             widget.setFont(font_normal)
 
-        for widget in self.findChildren(QPushButton):
+        for widget in racine.findChildren(QPushButton):
             widget.setFont(font_bold)
 
-        for widget in self.findChildren(QLineEdit):
+        for widget in racine.findChildren(QLineEdit):
             widget.setFont(font_normal)
 
-        for widget in self.findChildren(QTableWidget):
+        for widget in racine.findChildren(QTableView):
             widget.setFont(font_normal)
             widget.setAlternatingRowColors(True)
 
-        for widget in self.findChildren(QTextEdit):
+        for widget in racine.findChildren(QTextEdit):
             widget.setFont(font_mono)
 
-        for widget in self.findChildren(QCheckBox):
+        for widget in racine.findChildren(QCheckBox):
             widget.setFont(font_normal)
 
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MaintenanceTool()
+    chrono_demarrage.etape("fenêtre construite")
     window.show()
     logging.info("Application démarrée.")
+
+    def fin_demarrage():
+        chrono_demarrage.etape("première fenêtre affichée")
+        chrono_demarrage.journaliser()
+    QTimer.singleShot(0, fin_demarrage)
     sys.exit(app.exec_())
@@ -0,0 +1,370 @@
+"""
+Analyse des dossiers
+Description: Recherche des dossiers vides et analyse de l'espace disque, sans
+dépendance à Qt. Les threads de l'interface (ScanThread, DiskAnalysisThread)
+et le mode ligne de commande exécutent ces tâches en leur passant des
+callbacks de progression et de résultats.
+"""
+
+import heapq
+import logging
+import os
+import platform
+import shutil
+import time
+from datetime import datetime
+from stat import S_ISREG
+
+from arbre_disque import ArbreDossiers
+from cache_parcours import SEUIL_GROS_FICHIER, ouvrir_cache
+from flux import EmetteurLots
+from parcours import ParcoursParallele
+from progression import SuiviProgression
+from stockage import dossier_donnees
+
+
+# Fichiers examinés entre deux vérifications d'annulation dans un même dossier
+ANNULATION_FICHIERS = 256
+
+# Intervalle minimal (s) entre deux instantanés du classement des gros fichiers
+INTERVALLE_CLASSEMENT = 1.0
+
+
+def _ignorer(*args):
+    pass
+
+
+def format_taille(octets):
+    for unit in ['octets', 'Ko', 'Mo', 'Go', 'To']:
+        if octets < 1024:
+            return f"{octets:.2f} {unit}"
+        octets /= 1024
+    return f"{octets:.2f} To"
+
+
+def supprimer_arborescence_vide(dossier):
+    """
+    Supprime un dossier vide et ses sous-dossiers vides, du bas vers le haut.
+    os.rmdir échoue si un fichier est apparu entre-temps : rien n'est perdu.
+    """
+    for root, dirs, files in os.walk(dossier, topdown=False):
+        os.rmdir(root)
+
+
+class RechercheDossiersVides:
+    """
+    Recherche des dossiers vides d'une arborescence.
+    Les dossiers inchangés depuis le scan précédent ne sont pas relus (cache
+    de parcours) ; stats_cache indique les dossiers réutilisés et relus.
+    """
+
+    def __init__(self, chemin, utiliser_cache=True):
+        self.chemin = chemin
+        self.utiliser_cache = utiliser_cache
+        self.stats_cache = {'succes': 0, 'echecs': 0}
+        self.suivi = None
+        self._is_running = True
+
+    def executer(self, progression=None, lot=None):
+        """
+        Exécute le scan des dossiers vides en une seule passe ascendante.
+
+        Un dossier est vide s'il ne contient aucun fichier et que tous ses
+        sous-dossiers sont eux-mêmes vides. Seuls les dossiers vides les plus
+        hauts de chaque arborescence sont retournés, par lots de chemins via
+        lot(liste). Retourne le nombre total de dossiers vides trouvés.
+        """
+        progression = progression or _ignorer
+        emetteur = EmetteurLots(lot or _ignorer)
+        try:
+            self._dossiers_vides(
+                self.chemin, emetteur.ajouter, emetteur.rythmer, progression)
+        except (PermissionError, OSError) as e:
+            logging.error(f"Erreur lors du scan: {e}")
+        finally:
+            emetteur.vider()
+            progression(100)
+        return emetteur.total
+
+    def _dossiers_vides(self, racine, signaler, rythmer, progression):
+        """
+        Détecte les dossiers vides à partir du parcours parallèle et appelle
+        signaler(chemin) dès qu'un dossier vide est confirmé.
+
+        Chaque dossier en cours garde : sous-dossiers restants, indicateur de
+        vacuité, sous-dossiers vides en attente et parent. Quand tous ses
+        sous-dossiers sont traités, le résultat remonte au parent. La
+        progression compte les dossiers traités, rapportés aux dossiers déjà
+        découverts ou au total du scan précédent de la même racine, sans
+        parcours préalable de comptage.
+        """
+        noeuds = {}
+        suivi = self.suivi = SuiviProgression(progression, cle=f"vides:{racine}")
+        cache = ouvrir_cache("vides") if self.utiliser_cache else None
+
+        try:
+            with ParcoursParallele(
+                    racine, doit_continuer=lambda: self._is_running,
+                    cache=cache) as parcours:
+                for entree in parcours:
+                    if entree.cache is not None:
+                        nb_fichiers = entree.cache.nb_fichiers
+                    else:
+                        nb_fichiers = len(entree.fichiers)
+                        if entree.erreur is not None:
+                            # Un dossier illisible n'est jamais considéré comme vide
+                            logging.warning(
+                                f"Impossible d'accéder à {entree.chemin}: {entree.erreur}")
+                        elif cache is not None and entree.mtime is not None:
+                            cache.enregistrer(
+                                entree.chemin, entree.mtime,
+                                [d.name for d in entree.dossiers], nb_fichiers)
+                    noeuds[entree.chemin] = [
+                        len(entree.dossiers),
+                        entree.erreur is None and not nb_fichiers,
+                        [],
+                        entree.parent,
+                    ]
+
+                    chemin = entree.chemin
+                    while chemin is not None and noeuds[chemin][0] == 0:
+                        _, est_vide, enfants_vides, parent = noeuds.pop(chemin)
+                        if parent is None:
+                            for vide in [chemin] if est_vide else enfants_vides:
+                                signaler(vide)
+                        else:
+                            noeud_parent = noeuds[parent]
+                            noeud_parent[0] -= 1
+                            if est_vide:
+                                noeud_parent[2].append(chemin)
+                            else:
+                                noeud_parent[1] = False
+                                for vide in enfants_vides:
+                                    signaler(vide)
+                        chemin = parent
+
+                    rythmer()
+                    suivi.decouvrir(parcours.dossiers_decouverts)
+                    suivi.avancer()
+        finally:
+            if cache is not None:
+                cache.fermer()
+        suivi.terminer(complet=self._is_running)
+        self.stats_cache = {
+            'succes': parcours.dossiers_en_cache,
+            'echecs': parcours.dossiers_traites - parcours.dossiers_en_cache,
+        }
+
+    def stop(self):
+        """Arrête la tâche proprement."""
+        self._is_running = False
+
+
+class AnalyseDisque:
+    """
+    Analyse de l'espace disque et recherche des gros fichiers.
+    Conserve les nb_max plus gros fichiers de tout le disque dans un tas
+    (mémoire en O(nb_max)). Pendant l'analyse, le classement courant est
+    transmis trié, au plus toutes les INTERVALLE_CLASSEMENT secondes : chaque
+    instantané remplace le précédent, un fichier évincé du tas disparaît
+    donc de l'affichage. Le résultat contient les
+    partitions, la liste finale triée et l'arbre des tailles de dossiers
+    (ArbreDossiers), également enregistré dans un instantané binaire.
+    Les dossiers inchangés depuis l'analyse précédente sont repris du cache
+    de parcours sans examiner leurs fichiers.
+    """
+    NB_GROS_DOSSIERS = 20
+
+    def __init__(self, chemin, taille_min_mo=100, nb_max=500, utiliser_cache=True):
+        self.chemin = chemin
+        self.taille_min = taille_min_mo * 1024 * 1024
+        self.nb_max = max(1, nb_max)
+        self.utiliser_cache = utiliser_cache
+        self.suivi = None
+        self._is_running = True
+
+    def executer(self, progression=None, classement=None):
+        """
+        Analyse les disques et trouve les gros fichiers ; retourne un dict.
+        classement(liste) reçoit les instantanés triés du tas des gros fichiers.
+        """
+        progression = progression or _ignorer
+        resultats = {
+            'partitions': [],
+            'gros_fichiers': [],
+            'gros_dossiers': [],
+            'total_octets': 0,
+            'total_fichiers': 0,
+            'arbre': None,
+            'cache': {'succes': 0, 'echecs': 0}
+        }
+
+        try:
+            # Analyse des partitions
+            if platform.system() == "Windows":
+                import string
+                for lettre in string.ascii_uppercase:
+                    disque = f"{lettre}:\\"
+                    if os.path.exists(disque):
+                        try:
+                            usage = shutil.disk_usage(disque)
+                            resultats['partitions'].append({
+                                'nom': lettre,
+                                'total': usage.total,
+                                'utilise': usage.used,
+                                'libre': usage.free,
+                                'pourcentage': (usage.used / usage.total * 100) if usage.total > 0 else 0
+                            })
+                        except (OSError, PermissionError):
+                            pass
+            else:
+                usage = shutil.disk_usage("/")
+                resultats['partitions'].append({
+                    'nom': '/',
+                    'total': usage.total,
+                    'utilise': usage.used,
+                    'libre': usage.free,
+                    'pourcentage': (usage.used / usage.total * 100) if usage.total > 0 else 0
+                })
+
+            progression(30)
+
+            # Recherche des gros fichiers : tas min des nb_max plus gros
+            # (taille, chemin, nom, mtime) et des dossiers les plus lourds
+            # (taille des fichiers directs, nombre de fichiers, chemin)
+            tas_fichiers = []
+            # Tas modifié depuis le dernier instantané transmis
+            modifie = False
+            dernier_instantane = time.monotonic()
+            tas_dossiers = []
+            arbre = ArbreDossiers(self.chemin)
+            # Parcours de 30 à 100 %, en dossiers traités
+            suivi = self.suivi = SuiviProgression(
+                progression, cle=f"disque:{self.chemin}", debut=30)
+            dossiers_exclus = {'$Recycle.Bin', 'System Volume Information', 'Windows'}
+            # Le résumé en cache ne garde que les fichiers de plus de
+            # SEUIL_GROS_FICHIER : inutilisable pour un seuil inférieur
+            cache = (ouvrir_cache("disque")
+                     if self.utiliser_cache and self.taille_min >= SEUIL_GROS_FICHIER
+                     else None)
+            try:
+                with ParcoursParallele(
+                        self.chemin,
+                        exclure=lambda d: d.name in dossiers_exclus,
+                        doit_continuer=lambda: self._is_running,
+                        cache=cache) as parcours:
+                    for entree in parcours:
+                        suivi.decouvrir(parcours.dossiers_decouverts)
+                        suivi.avancer()
+                        if (classement and modifie and time.monotonic()
+                                - dernier_instantane >= INTERVALLE_CLASSEMENT):
+                            classement(self._classement(tas_fichiers))
+                            modifie = False
+                            dernier_instantane = time.monotonic()
+
+                        if entree.cache is not None:
+                            taille_dossier = entree.cache.octets
+                            nb_fichiers = entree.cache.nb_fichiers
+                            gros = entree.cache.gros
+                        else:
+                            taille_dossier, nb_fichiers, gros = self._examiner_fichiers(entree)
+                            if (cache is not None and entree.erreur is None
+                                    and entree.mtime is not None and self._is_running):
+                                cache.enregistrer(
+                                    entree.chemin, entree.mtime,
+                                    [d.name for d in entree.dossiers],
+                                    nb_fichiers, taille_dossier, gros)
+
+                        for nom, taille, mtime in gros:
+                            if taille < self.taille_min:
+                                continue
+                            element = (taille, os.path.join(entree.chemin, nom), nom, mtime)
+                            if len(tas_fichiers) < self.nb_max:
+                                heapq.heappush(tas_fichiers, element)
+                            elif element > tas_fichiers[0]:
+                                heapq.heapreplace(tas_fichiers, element)
+                            else:
+                                continue
+                            modifie = True
+
+                        resultats['total_octets'] += taille_dossier
+                        resultats['total_fichiers'] += nb_fichiers
+                        arbre.ajouter_dossier(
+                            entree.chemin, entree.dossiers, taille_dossier, nb_fichiers)
+                        element = (taille_dossier, nb_fichiers, entree.chemin)
+                        if len(tas_dossiers) < self.NB_GROS_DOSSIERS:
+                            heapq.heappush(tas_dossiers, element)
+                        elif element > tas_dossiers[0]:
+                            heapq.heapreplace(tas_dossiers, element)
+            finally:
+                if cache is not None:
+                    cache.fermer()
+            suivi.terminer(complet=self._is_running)
+            resultats['cache'] = {
+                'succes': parcours.dossiers_en_cache,
+                'echecs': parcours.dossiers_traites - parcours.dossiers_en_cache,
+            }
+
+            arbre.finaliser()
+            resultats['arbre'] = arbre
+            try:
+                arbre.sauvegarder(os.path.join(dossier_donnees(), "arbre_disque.bin"))
+            except OSError as e:
+                logging.warning(f"Instantané de l'arbre non enregistré: {e}")
+
+            # Trier par taille décroissante
+            resultats['gros_fichiers'] = self._classement(tas_fichiers)
+            resultats['gros_dossiers'] = [
+                {'chemin': chemin, 'taille': taille, 'nb_fichiers': nb}
+                for taille, nb, chemin in sorted(tas_dossiers, reverse=True)]
+
+        except Exception as e:
+            logging.error(f"Erreur analyse disque: {e}")
+        finally:
+            progression(100)
+        return resultats
+
+    def _classement(self, tas_fichiers):
+        """Gros fichiers du tas, par taille décroissante."""
+        return [self._gros_fichier(element)
+                for element in sorted(tas_fichiers, reverse=True)]
+
+    def _examiner_fichiers(self, entree):
+        """
+        Examine les fichiers directs d'un dossier relu. Retourne la taille
+        totale, le nombre de fichiers et les fichiers d'au moins
+        min(taille_min, SEUIL_GROS_FICHIER) octets en (nom, taille, mtime).
+        """
+        seuil = min(self.taille_min, SEUIL_GROS_FICHIER)
+        taille_dossier = 0
+        nb_fichiers = 0
+        gros = []
+        for compteur, fichier in enumerate(entree.fichiers):
+            # Un stat par fichier : dans un très grand dossier, l'annulation
+            # est vérifiée en cours de route (résumé alors incomplet)
+            if compteur % ANNULATION_FICHIERS == 0 and not self._is_running:
+                break
+            try:
+                infos = fichier.stat(follow_symlinks=False)
+            except (OSError, PermissionError):
+                continue
+            if not S_ISREG(infos.st_mode):
+                continue
+            taille_dossier += infos.st_size
+            nb_fichiers += 1
+            if infos.st_size >= seuil:
+                gros.append((fichier.name, infos.st_size, infos.st_mtime))
+        return taille_dossier, nb_fichiers, gros
+
+    def _gros_fichier(self, element):
+        taille, chemin, nom, mtime = element
+        return {
+            'chemin': chemin,
+            'nom': nom,
+            'taille': taille,
+            'date_modif': datetime.fromtimestamp(mtime)
+        }
+
+    def stop(self):
+        """Arrête la tâche proprement."""
+        self._is_running = False
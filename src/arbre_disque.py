@@ -0,0 +1,209 @@
+"""
+Arbre des tailles de dossiers
+Description: Arbre compact construit pendant l'analyse disque. Chaque dossier
+est un nœud numéroté ; les données sont rangées dans des tableaux parallèles
+(parent, nom interné, octets, fichiers, plus gros enfant) plutôt que dans un
+dict par nœud. Les totaux sont agrégés en une seule passe post-ordre et
+l'arbre peut être enregistré dans un instantané binaire. Il alimente le
+tableau d'exploration de l'onglet Analyse disque et peut servir de source à
+une vue treemap ou sunburst (enfants triés par taille).
+"""
+
+import os
+import struct
+import sys
+from array import array
+
+MAGIQUE = b"OMARB1\0\0"
+ENTETE = struct.Struct("<8sqqq")
+
+# Budget par défaut : environ 45 octets par nœud, soit ~45 Mo pour 1M dossiers
+NB_MAX_NOEUDS = 1_000_000
+
+
+class ArbreDossiers:
+    """
+    Arbre de dossiers à tableaux parallèles indexés par numéro de nœud.
+    Le nœud 0 est la racine ; un parent a toujours un numéro inférieur à
+    celui de ses enfants.
+
+    Au-delà de nb_max_noeuds, les dossiers ne reçoivent plus de nœud : leurs
+    fichiers sont comptés dans l'ancêtre le plus proche qui en a un, si bien
+    que les totaux restent exacts dans un budget mémoire fixe.
+    """
+
+    def __init__(self, racine, nb_max_noeuds=NB_MAX_NOEUDS):
+        self.racine = racine
+        self.nb_max_noeuds = nb_max_noeuds
+        self.parents = array("i")
+        self.noms = array("i")
+        self.octets_directs = array("q")
+        self.fichiers_directs = array("i")
+        self.octets = array("q")
+        self.fichiers = array("i")
+        self.plus_gros_enfant = array("i")
+        self.debut_enfants = array("i")
+        self.enfants = array("i")
+        self.table_noms = []
+        self._index_noms = {}
+        self._noeud_en_attente = {}
+
+    def __len__(self):
+        return len(self.parents)
+
+    def _interner(self, nom):
+        index = self._index_noms.get(nom)
+        if index is None:
+            index = len(self.table_noms)
+            self._index_noms[nom] = index
+            self.table_noms.append(nom)
+        return index
+
+    # --- Construction ---
+
+    def ajouter_dossier(self, chemin, sous_dossiers, octets, nb_fichiers):
+        """
+        Enregistre un dossier parcouru (EntreeParcours.chemin, ses
+        sous-dossiers os.DirEntry et la taille/le nombre de ses fichiers
+        directs). La racine doit être ajoutée en premier.
+        """
+        if not self.parents:
+            noeud = self._nouveau_noeud(-1, self.racine)
+        else:
+            parent = self._noeud_en_attente.pop(chemin, 0)
+            if len(self.parents) < self.nb_max_noeuds:
+                noeud = self._nouveau_noeud(parent, os.path.basename(chemin))
+            else:
+                noeud = parent
+        self.octets_directs[noeud] += octets
+        self.fichiers_directs[noeud] += nb_fichiers
+        for sous_dossier in sous_dossiers:
+            self._noeud_en_attente[sous_dossier.path] = noeud
+        return noeud
+
+    def _nouveau_noeud(self, parent, nom):
+        self.parents.append(parent)
+        self.noms.append(self._interner(nom))
+        self.octets_directs.append(0)
+        self.fichiers_directs.append(0)
+        return len(self.parents) - 1
+
+    def finaliser(self):
+        """
+        Agrège les totaux en une passe post-ordre (les enfants ont des
+        numéros supérieurs à leur parent : un parcours à rebours suffit),
+        puis construit la liste compacte des enfants de chaque nœud.
+        """
+        self._index_noms = {}
+        self._noeud_en_attente = {}
+        n = len(self.parents)
+        self.octets = array("q", self.octets_directs)
+        self.fichiers = array("i", self.fichiers_directs)
+        self.plus_gros_enfant = array("i", [-1]) * n
+        parents, octets, fichiers, plus_gros = (
+            self.parents, self.octets, self.fichiers, self.plus_gros_enfant)
+        for noeud in range(n - 1, 0, -1):
+            parent = parents[noeud]
+            octets[parent] += octets[noeud]
+            fichiers[parent] += fichiers[noeud]
+            actuel = plus_gros[parent]
+            if actuel < 0 or octets[noeud] > octets[actuel]:
+                plus_gros[parent] = noeud
+        self._indexer_enfants()
+
+    def _indexer_enfants(self):
+        """Range les enfants par parent (tri par comptage, format CSR)."""
+        n = len(self.parents)
+        debut = array("i", [0]) * (n + 1)
+        for noeud in range(1, n):
+            debut[self.parents[noeud] + 1] += 1
+        for i in range(n):
+            debut[i + 1] += debut[i]
+        position = array("i", debut)
+        enfants = array("i", [0]) * max(0, n - 1)
+        for noeud in range(1, n):
+            parent = self.parents[noeud]
+            enfants[position[parent]] = noeud
+            position[parent] += 1
+        self.debut_enfants = debut
+        self.enfants = enfants
+
+    # --- Consultation ---
+
+    def nom(self, noeud):
+        return self.table_noms[self.noms[noeud]]
+
+    def chemin(self, noeud):
+        """Reconstitue le chemin complet d'un nœud."""
+        parties = []
+        while noeud > 0:
+            parties.append(self.nom(noeud))
+            noeud = self.parents[noeud]
+        return os.path.join(self.racine, *reversed(parties))
+
+    def liste_enfants(self, noeud):
+        """Enfants d'un nœud, du plus lourd au plus léger."""
+        enfants = self.enfants[self.debut_enfants[noeud]:self.debut_enfants[noeud + 1]]
+        return sorted(enfants, key=self.octets.__getitem__, reverse=True)
+
+    def parcourir(self):
+        """
+        Génère (nœud, chemin) en préordre ; seuls les chemins de la branche
+        en cours sont gardés, quelle que soit la taille de l'arbre.
+        """
+        if not self.parents:
+            return
+        pile = [(0, self.racine)]
+        while pile:
+            noeud, chemin = pile.pop()
+            yield noeud, chemin
+            debut, fin = self.debut_enfants[noeud], self.debut_enfants[noeud + 1]
+            for enfant in reversed(self.enfants[debut:fin]):
+                pile.append((enfant, os.path.join(chemin, self.nom(enfant))))
+
+    # --- Instantané binaire ---
+
+    def sauvegarder(self, chemin_fichier):
+        """Écrit l'arbre finalisé dans un fichier binaire compact."""
+        noms = "\0".join(self.table_noms).encode("utf-8")
+        racine = self.racine.encode("utf-8")
+        with open(chemin_fichier, "wb") as f:
+            f.write(ENTETE.pack(MAGIQUE, len(self.parents), len(racine), len(noms)))
+            f.write(racine)
+            f.write(noms)
+            for tableau in (self.parents, self.noms, self.octets_directs,
+                            self.fichiers_directs):
+                if sys.byteorder != "little":
+                    tableau = array(tableau.typecode, tableau)
+                    tableau.byteswap()
+                tableau.tofile(f)
+
+    @classmethod
+    def charger(cls, chemin_fichier):
+        """
+        Relit un instantané écrit par sauvegarder() et le finalise.
+        ValueError si le fichier est corrompu ou tronqué.
+        """
+        with open(chemin_fichier, "rb") as f:
+            try:
+                magique, n, taille_racine, taille_noms = ENTETE.unpack(
+                    f.read(ENTETE.size))
+                if magique != MAGIQUE or min(n, taille_racine, taille_noms) < 0:
+                    raise ValueError(f"Instantané d'arbre invalide: {chemin_fichier}")
+                racine = f.read(taille_racine)
+                noms = f.read(taille_noms)
+                if len(racine) < taille_racine or len(noms) < taille_noms:
+                    raise EOFError
+                arbre = cls(racine.decode("utf-8"))
+                arbre.table_noms = noms.decode("utf-8").split("\0") if n else []
+                for nom_attribut in ("parents", "noms", "octets_directs",
+                                     "fichiers_directs"):
+                    tableau = getattr(arbre, nom_attribut)
+                    tableau.fromfile(f, n)
+                    if sys.byteorder != "little":
+                        tableau.byteswap()
+            except (struct.error, EOFError, UnicodeDecodeError) as e:
+                raise ValueError(
+                    f"Instantané d'arbre tronqué ou illisible: {chemin_fichier}") from e
+        arbre.finaliser()
+        return arbre
@@ -0,0 +1,153 @@
+"""
+Cache persistant des parcours de dossiers
+Description: Mémorise, pour chaque dossier parcouru, sa date de modification,
+la liste de ses sous-dossiers et un résumé de ses fichiers (nombre, taille
+totale, gros fichiers). Lors d'un nouveau parcours, un dossier dont la date
+n'a pas changé n'est ni relu (os.scandir) ni ses fichiers réexaminés
+(stat) : le résumé en cache est réutilisé. Ses sous-dossiers restent
+vérifiés un par un, la date d'un dossier ne reflétant que ses entrées
+directes.
+
+Chaque profil (scan des dossiers vides, analyse disque) a ses propres
+entrées, car les dossiers exclus et le résumé conservé diffèrent.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+from stockage import dossier_donnees
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_dossiers (
+    profil TEXT NOT NULL,
+    chemin TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    sous_dossiers TEXT NOT NULL,
+    nb_fichiers INTEGER NOT NULL,
+    octets INTEGER NOT NULL,
+    gros TEXT,
+    PRIMARY KEY (profil, chemin)
+) WITHOUT ROWID;
+"""
+
+# Taille à partir de laquelle un fichier est conservé dans le résumé d'un
+# dossier (liste des gros fichiers de l'analyse disque)
+SEUIL_GROS_FICHIER = 1024 * 1024
+
+# Nombre d'écritures entre deux validations de transaction
+TAILLE_LOT = 2000
+
+# Résumé d'un dossier en cache ; gros : liste de (nom, taille, mtime)
+EntreeCache = namedtuple(
+    "EntreeCache", ["mtime", "sous_dossiers", "nb_fichiers", "octets", "gros"])
+
+
+class CacheParcours:
+    """
+    Cache des dossiers d'un profil donné.
+
+    lire() peut être appelé depuis les workers de ParcoursParallele (une
+    connexion en lecture par thread) ; enregistrer() doit être appelé depuis
+    un seul thread, celui qui consomme le parcours.
+    """
+
+    def __init__(self, profil, chemin_db=None):
+        self.profil = profil
+        self.chemin_db = chemin_db or os.path.join(
+            dossier_donnees(), "cache_parcours.db")
+        self._local = threading.local()
+        self._connexions = []
+        self._verrou = threading.Lock()
+        self._ecritures = 0
+        self.connexion = self._connexion()
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        self.connexion.executescript(SCHEMA)
+
+    def _connexion(self):
+        connexion = getattr(self._local, "connexion", None)
+        if connexion is None:
+            connexion = sqlite3.connect(self.chemin_db, check_same_thread=False)
+            self._local.connexion = connexion
+            with self._verrou:
+                self._connexions.append(connexion)
+        return connexion
+
+    def fermer(self):
+        """Valide les écritures en attente et ferme toutes les connexions."""
+        try:
+            self.connexion.commit()
+        except sqlite3.Error as e:
+            logging.error(f"Erreur d'écriture du cache de parcours: {e}")
+        with self._verrou:
+            for connexion in self._connexions:
+                connexion.close()
+            self._connexions = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def lire(self, chemin):
+        """Retourne l'EntreeCache d'un dossier, ou None s'il est inconnu."""
+        try:
+            ligne = self._connexion().execute(
+                "SELECT mtime, sous_dossiers, nb_fichiers, octets, gros "
+                "FROM cache_dossiers WHERE profil = ? AND chemin = ?",
+                (self.profil, chemin)).fetchone()
+        except sqlite3.Error as e:
+            logging.warning(f"Lecture du cache impossible pour {chemin}: {e}")
+            return None
+        if ligne is None:
+            return None
+        mtime, sous_dossiers, nb_fichiers, octets, gros = ligne
+        return EntreeCache(
+            mtime, sous_dossiers.split("\0") if sous_dossiers else [],
+            nb_fichiers, octets, json.loads(gros) if gros else [])
+
+    def enregistrer(self, chemin, mtime, sous_dossiers, nb_fichiers,
+                    octets=0, gros=()):
+        """
+        Met à jour l'entrée d'un dossier relu. Les sous-dossiers qui ont
+        disparu depuis le parcours précédent sont retirés du cache avec
+        toute leur arborescence.
+        """
+        c = self.connexion
+        ancienne = self.lire(chemin)
+        if ancienne is not None:
+            for nom in set(ancienne.sous_dossiers).difference(sous_dossiers):
+                self._oublier(os.path.join(chemin, nom))
+        c.execute(
+            "INSERT OR REPLACE INTO cache_dossiers"
+            "(profil, chemin, mtime, sous_dossiers, nb_fichiers, octets, gros) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self.profil, chemin, mtime, "\0".join(sous_dossiers), nb_fichiers,
+             octets, json.dumps(list(gros)) if gros else None))
+        self._ecritures += 1
+        if self._ecritures % TAILLE_LOT == 0:
+            c.commit()
+
+    def _oublier(self, chemin):
+        """Retire un dossier et tout son contenu du cache."""
+        prefixe = os.path.join(chemin, "")
+        # Intervalle [prefixe, prefixe suivant[ : servi par la clé primaire
+        borne = prefixe[:-1] + chr(ord(prefixe[-1]) + 1)
+        self.connexion.execute(
+            "DELETE FROM cache_dossiers WHERE profil = ? AND "
+            "(chemin = ? OR (chemin >= ? AND chemin < ?))",
+            (self.profil, chemin, prefixe, borne))
+
+
+def ouvrir_cache(profil):
+    """Ouvre le cache d'un profil, ou retourne None s'il est inutilisable."""
+    try:
+        return CacheParcours(profil)
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Cache de parcours indisponible, parcours complet: {e}")
+        return None
@@ -0,0 +1,154 @@
+"""
+Cache persistant de l'inventaire des programmes
+Description: Conserve la dernière liste des programmes installés avec la
+signature de sa source (dates d'écriture des clés Uninstall du registre,
+date du fichier d'état de dpkg). Tant que la signature n'a pas changé, la
+liste en cache est réutilisée sans relire l'inventaire.
+
+Chaque inventaire relu est comparé au précédent : les programmes ajoutés,
+supprimés ou mis à jour sont conservés dans un historique, pour savoir ce
+qui a changé entre deux interventions. Seuls les NB_MAX_HISTORIQUE
+changements les plus récents sont gardés.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from collections import namedtuple
+
+from stockage import dossier_donnees
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS programmes (
+    nom TEXT NOT NULL,
+    version TEXT NOT NULL,
+    chemin TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS signature_programmes (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    signature TEXT NOT NULL,
+    date REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS historique_programmes (
+    date REAL NOT NULL,
+    changement TEXT NOT NULL,
+    nom TEXT NOT NULL,
+    chemin TEXT NOT NULL,
+    ancienne_version TEXT,
+    nouvelle_version TEXT
+);
+CREATE INDEX IF NOT EXISTS historique_date ON historique_programmes(date);
+"""
+
+# Changements conservés dans l'historique, les plus anciens sont effacés
+NB_MAX_HISTORIQUE = 5000
+
+# Changements entre deux inventaires ; mises_a_jour : liste de (ancien, nouveau)
+DeltaProgrammes = namedtuple(
+    "DeltaProgrammes", ["ajouts", "suppressions", "mises_a_jour"])
+
+
+def calculer_delta(anciens, nouveaux):
+    """
+    Compare deux listes de (nom, version, chemin). Un programme est
+    identifié par son nom et son chemin ; une version différente est une
+    mise à jour.
+    """
+    index_anciens = {(nom, chemin): (nom, version, chemin)
+                     for nom, version, chemin in anciens}
+    index_nouveaux = {(nom, chemin): (nom, version, chemin)
+                      for nom, version, chemin in nouveaux}
+    ajouts = [p for cle, p in index_nouveaux.items() if cle not in index_anciens]
+    suppressions = [p for cle, p in index_anciens.items() if cle not in index_nouveaux]
+    mises_a_jour = [
+        (index_anciens[cle], p) for cle, p in index_nouveaux.items()
+        if cle in index_anciens and index_anciens[cle][1] != p[1]
+    ]
+    return DeltaProgrammes(ajouts, suppressions, mises_a_jour)
+
+
+class CacheProgrammes:
+    """Dernier inventaire des programmes, sa signature et l'historique."""
+
+    def __init__(self, chemin_db=None, nb_max_historique=NB_MAX_HISTORIQUE):
+        self.chemin_db = chemin_db or os.path.join(
+            dossier_donnees(), "programmes.db")
+        self.nb_max_historique = nb_max_historique
+        self.connexion = sqlite3.connect(self.chemin_db, check_same_thread=False)
+        self.connexion.executescript(SCHEMA)
+
+    def fermer(self):
+        self.connexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def charger(self):
+        """Retourne (signature, liste de (nom, version, chemin)) ; (None, [])."""
+        ligne = self.connexion.execute(
+            "SELECT signature FROM signature_programmes WHERE id = 1").fetchone()
+        if ligne is None:
+            return None, []
+        programmes = self.connexion.execute(
+            "SELECT nom, version, chemin FROM programmes ORDER BY rowid").fetchall()
+        return ligne[0], programmes
+
+    def enregistrer(self, signature, programmes, delta, historiser=True):
+        """
+        Remplace l'inventaire en cache et ajoute le delta à l'historique,
+        réduit ensuite à ses nb_max_historique changements les plus récents.
+        """
+        maintenant = time.time()
+        with self.connexion:
+            self.connexion.execute("DELETE FROM programmes")
+            self.connexion.executemany(
+                "INSERT INTO programmes(nom, version, chemin) VALUES (?, ?, ?)",
+                programmes)
+            self.connexion.execute(
+                "INSERT OR REPLACE INTO signature_programmes(id, signature, date) "
+                "VALUES (1, ?, ?)", (signature or "", maintenant))
+            if not historiser:
+                return
+            lignes = (
+                [(maintenant, 'ajout', nom, chemin, None, version)
+                 for nom, version, chemin in delta.ajouts]
+                + [(maintenant, 'suppression', nom, chemin, version, None)
+                   for nom, version, chemin in delta.suppressions]
+                + [(maintenant, 'mise_a_jour', nouveau[0], nouveau[2], ancien[1], nouveau[1])
+                   for ancien, nouveau in delta.mises_a_jour]
+            )
+            self.connexion.executemany(
+                "INSERT INTO historique_programmes(date, changement, nom, chemin, "
+                "ancienne_version, nouvelle_version) VALUES (?, ?, ?, ?, ?, ?)",
+                lignes)
+            if lignes:
+                self.connexion.execute(
+                    "DELETE FROM historique_programmes WHERE rowid NOT IN ("
+                    "SELECT rowid FROM historique_programmes "
+                    "ORDER BY date DESC, rowid DESC LIMIT ?)",
+                    (self.nb_max_historique,))
+
+    def historique(self, limite=500):
+        """Derniers changements, du plus récent au plus ancien, en dicts."""
+        lignes = self.connexion.execute(
+            "SELECT date, changement, nom, chemin, ancienne_version, nouvelle_version "
+            "FROM historique_programmes ORDER BY date DESC, rowid LIMIT ?",
+            (limite,)).fetchall()
+        return [
+            {'date': date, 'changement': changement, 'nom': nom, 'chemin': chemin,
+             'ancienne_version': ancienne, 'nouvelle_version': nouvelle}
+            for date, changement, nom, chemin, ancienne, nouvelle in lignes
+        ]
+
+
+def ouvrir_cache_programmes():
+    """Ouvre le cache des programmes, ou retourne None s'il est inutilisable."""
+    try:
+        return CacheProgrammes()
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Cache des programmes indisponible: {e}")
+        return None
@@ -0,0 +1,288 @@
+"""
+Mode ligne de commande
+Description: Exécution sans interface graphique des opérations de
+maintenance, pour les lancements scriptés sur un parc de machines :
+
+    python -m OutilMaintenance scan CHEMIN [--supprimer] [--dry-run]
+    python -m OutilMaintenance disk [CHEMIN] [--taille-min MO] [--nb-max N]
+    python -m OutilMaintenance cleanup [--options temp_user,...] [--tous-profils] [--dry-run]
+    python -m OutilMaintenance programs [--sans-cache] [--historique]
+    python -m OutilMaintenance security
+
+Les résultats sont écrits sur la sortie standard au format JSON Lines (un
+objet JSON par ligne, avec un champ "type"), terminés par une ligne de type
+"resume". Les journaux vont sur la sortie d'erreur. Ni PyQt5 ni reportlab ne
+sont importés : chaque commande n'importe que le module de sa tâche.
+
+Codes de sortie : 0 succès, 1 erreurs pendant l'opération, 2 arguments
+invalides, 130 interruption (Ctrl+C).
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+from datetime import datetime
+
+CODE_SUCCES = 0
+CODE_ERREURS = 1
+CODE_USAGE = 2
+CODE_INTERRUPTION = 130
+
+COMMANDES = ("scan", "disk", "cleanup", "programs", "security")
+
+
+def _json_defaut(valeur):
+    if isinstance(valeur, datetime):
+        return valeur.isoformat(timespec="seconds")
+    return str(valeur)
+
+
+class SortieJsonl:
+    """Écrit des enregistrements JSON Lines sur un flux texte."""
+
+    def __init__(self, flux=None):
+        self.flux = flux or sys.stdout
+
+    def ecrire(self, type_enregistrement, **champs):
+        self.flux.write(json.dumps(
+            {'type': type_enregistrement, **champs},
+            ensure_ascii=False, default=_json_defaut) + "\n")
+
+    def ecrire_lot(self, type_enregistrement, elements):
+        for element in elements:
+            self.ecrire(type_enregistrement, **element)
+        self.flux.flush()
+
+
+def _disque_par_defaut():
+    return "C:\\" if platform.system() == "Windows" else "/"
+
+
+def commande_scan(args, sortie):
+    """Dossiers vides ; avec --supprimer, suppression des dossiers trouvés."""
+    from analyse_dossiers import RechercheDossiersVides, supprimer_arborescence_vide
+
+    vides = []
+
+    def recevoir(chemins):
+        vides.extend(chemins)
+        sortie.ecrire_lot('dossier_vide', ({'chemin': c} for c in chemins))
+
+    tache = RechercheDossiersVides(args.chemin, utiliser_cache=not args.sans_cache)
+    total = tache.executer(lot=recevoir)
+
+    supprimes = erreurs = 0
+    if args.supprimer:
+        for dossier in vides:
+            if args.dry_run:
+                sortie.ecrire('suppression', chemin=dossier, statut='simulation')
+                continue
+            try:
+                supprimer_arborescence_vide(dossier)
+                supprimes += 1
+                sortie.ecrire('suppression', chemin=dossier, statut='supprime')
+            except OSError as e:
+                erreurs += 1
+                sortie.ecrire('suppression', chemin=dossier, statut='erreur',
+                              erreur=str(e))
+
+    sortie.ecrire('resume', commande='scan', chemin=args.chemin,
+                  dossiers_vides=total, supprimes=supprimes, erreurs=erreurs,
+                  simulation=args.dry_run, cache=tache.stats_cache)
+    return CODE_ERREURS if erreurs else CODE_SUCCES
+
+
+def commande_disk(args, sortie):
+    """Partitions, gros fichiers, dossiers les plus lourds."""
+    from analyse_dossiers import AnalyseDisque
+
+    tache = AnalyseDisque(args.chemin, args.taille_min, args.nb_max,
+                          utiliser_cache=not args.sans_cache)
+    resultats = tache.executer()
+
+    sortie.ecrire_lot('partition', resultats['partitions'])
+    sortie.ecrire_lot('gros_fichier', resultats['gros_fichiers'])
+    sortie.ecrire_lot('gros_dossier', resultats['gros_dossiers'])
+    arbre = resultats['arbre']
+    if arbre is not None and len(arbre):
+        sortie.ecrire_lot('sous_dossier', (
+            {'chemin': arbre.chemin(noeud), 'taille': arbre.octets[noeud],
+             'nb_fichiers': arbre.fichiers[noeud]}
+            for noeud in arbre.liste_enfants(0)))
+    sortie.ecrire('resume', commande='disk', chemin=args.chemin,
+                  total_octets=resultats['total_octets'],
+                  total_fichiers=resultats['total_fichiers'],
+                  cache=resultats['cache'])
+    return CODE_SUCCES if arbre is not None else CODE_ERREURS
+
+
+def commande_cleanup(args, sortie):
+    """Nettoyage des fichiers temporaires et caches."""
+    from nettoyage import OPTIONS_NETTOYAGE, Nettoyage
+
+    choisies = [option.strip() for option in args.options.split(",") if option.strip()]
+    inconnues = [option for option in choisies if option not in OPTIONS_NETTOYAGE]
+    if inconnues:
+        logging.error(
+            f"Options inconnues: {', '.join(inconnues)} "
+            f"(disponibles: {', '.join(OPTIONS_NETTOYAGE)})")
+        return CODE_USAGE
+
+    options = {option: option in choisies for option in OPTIONS_NETTOYAGE}
+    tache = Nettoyage(options, simulation=args.dry_run,
+                      tous_profils=args.tous_profils)
+    estimation = tache.estimer()
+    sortie.ecrire_lot('estimation', (
+        {'option': option, 'fichiers': compteurs['fichiers'],
+         'octets': compteurs['octets'], 'dossiers': compteurs['dossiers']}
+        for option, compteurs in estimation['categories'].items()))
+    resultats = tache.executer()
+
+    sortie.ecrire_lot('categorie', (
+        {'option': option, **compteurs}
+        for option, compteurs in resultats['categories'].items()))
+    sortie.ecrire_lot('detail', ({'message': d} for d in resultats['details']))
+    sortie.ecrire('resume', commande='cleanup', options=choisies,
+                  fichiers_supprimes=resultats['fichiers_supprimes'],
+                  espace_libere=resultats['espace_libere'],
+                  espace_estime=estimation['octets'],
+                  erreurs=resultats['erreurs'],
+                  details_omis=resultats['details_omis'],
+                  duree=round(resultats['duree'], 3),
+                  debit=round(resultats['debit'], 1), simulation=args.dry_run)
+    return CODE_ERREURS if resultats['erreurs'] else CODE_SUCCES
+
+
+def commande_programs(args, sortie):
+    """Programmes installés ; avec --historique, derniers changements."""
+    from programmes import ListeProgrammes
+
+    if args.historique:
+        from cache_programmes import ouvrir_cache_programmes
+        cache = ouvrir_cache_programmes()
+        if cache is None:
+            return CODE_ERREURS
+        with cache:
+            changements = cache.historique()
+        for changement in changements:
+            changement['date'] = datetime.fromtimestamp(changement['date'])
+        sortie.ecrire_lot('changement', changements)
+        sortie.ecrire('resume', commande='programs', changements=len(changements))
+        return CODE_SUCCES
+
+    tache = ListeProgrammes(utiliser_cache=not args.sans_cache)
+    programmes = tache.executer()
+    sortie.ecrire_lot('programme', (
+        {'nom': nom, 'version': version, 'chemin': chemin}
+        for nom, version, chemin in programmes))
+    delta = tache.delta
+    sortie.ecrire_lot('changement', (
+        [{'changement': 'ajout', 'nom': nom, 'version': version}
+         for nom, version, _ in delta.ajouts]
+        + [{'changement': 'suppression', 'nom': nom, 'version': version}
+           for nom, version, _ in delta.suppressions]
+        + [{'changement': 'mise_a_jour', 'nom': nouveau[0],
+            'ancienne_version': ancien[1], 'nouvelle_version': nouveau[1]}
+           for ancien, nouveau in delta.mises_a_jour]))
+    sortie.ecrire('resume', commande='programs', total=len(programmes),
+                  depuis_cache=tache.depuis_cache, ajouts=len(delta.ajouts),
+                  suppressions=len(delta.suppressions),
+                  mises_a_jour=len(delta.mises_a_jour))
+    return CODE_SUCCES
+
+
+def commande_security(args, sortie):
+    """Analyse de sécurité."""
+    from securite import AnalyseSecurite
+
+    tache = AnalyseSecurite()
+    resultats = tache.executer(
+        collecte=lambda categorie, elements, mesure: sortie.ecrire_lot(categorie, elements))
+    for categorie, mesure in tache.mesures.items():
+        sortie.ecrire('verification', categorie=categorie, **mesure)
+    sortie.ecrire('resume', commande='security', **{
+        categorie: len(elements) for categorie, elements in resultats.items()})
+    return CODE_SUCCES
+
+
+def creer_parseur():
+    parseur = argparse.ArgumentParser(
+        prog="OutilMaintenance",
+        description="Outil de Maintenance Système - mode ligne de commande "
+                    "(sortie JSON Lines)")
+    parseur.add_argument("-v", "--verbeux", action="store_true",
+                         help="journaux détaillés sur la sortie d'erreur")
+    parseur.add_argument("--dry-run", action="store_true",
+                         help="simulation : aucune suppression")
+    sous_parseurs = parseur.add_subparsers(dest="commande", required=True)
+
+    scan = sous_parseurs.add_parser("scan", help="dossiers vides")
+    scan.add_argument("chemin")
+    scan.add_argument("--supprimer", action="store_true",
+                      help="supprimer les dossiers vides trouvés")
+    scan.add_argument("--sans-cache", action="store_true",
+                      help="relire tous les dossiers")
+    scan.set_defaults(fonction=commande_scan)
+
+    disk = sous_parseurs.add_parser("disk", help="analyse de l'espace disque")
+    disk.add_argument("chemin", nargs="?", default=_disque_par_defaut())
+    disk.add_argument("--taille-min", type=int, default=100,
+                      help="taille minimale des gros fichiers en Mo")
+    disk.add_argument("--nb-max", type=int, default=500,
+                      help="nombre maximal de gros fichiers")
+    disk.add_argument("--sans-cache", action="store_true",
+                      help="relire tous les dossiers")
+    disk.set_defaults(fonction=commande_disk)
+
+    cleanup = sous_parseurs.add_parser("cleanup", help="nettoyage système")
+    cleanup.add_argument("--options", default="temp_windows,temp_user",
+                         help="options séparées par des virgules")
+    cleanup.add_argument("--tous-profils", action="store_true",
+                         help="Temp et caches de tous les profils utilisateurs")
+    cleanup.set_defaults(fonction=commande_cleanup)
+
+    programs = sous_parseurs.add_parser("programs", help="programmes installés")
+    programs.add_argument("--sans-cache", action="store_true",
+                          help="relire l'inventaire sans le cache")
+    programs.add_argument("--historique", action="store_true",
+                          help="derniers changements de l'inventaire")
+    programs.set_defaults(fonction=commande_programs)
+
+    security = sous_parseurs.add_parser("security", help="analyse de sécurité")
+    security.set_defaults(fonction=commande_security)
+
+    # --dry-run est aussi accepté après la sous-commande
+    for sous_parseur in (scan, disk, cleanup, programs, security):
+        sous_parseur.add_argument("--dry-run", action="store_true",
+                                  default=argparse.SUPPRESS,
+                                  help=argparse.SUPPRESS)
+    return parseur
+
+
+def main(argv=None):
+    """Point d'entrée du mode ligne de commande ; retourne le code de sortie."""
+    args = creer_parseur().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbeux else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+
+    debut = time.perf_counter()
+    try:
+        code = args.fonction(args, SortieJsonl())
+    except KeyboardInterrupt:
+        logging.warning("Interrompu")
+        return CODE_INTERRUPTION
+    except Exception as e:
+        logging.error(f"Erreur {args.commande}: {e}")
+        return CODE_ERREURS
+    finally:
+        sys.stdout.flush()
+    logging.info(f"{args.commande} terminé en {time.perf_counter() - debut:.2f} s")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
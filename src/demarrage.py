@@ -0,0 +1,42 @@
+"""
+Mesure du démarrage
+Description: Chronométrage du démarrage de l'interface : temps d'import de
+chaque module lourd, construction de la fenêtre et premier affichage. Le
+rapport est écrit dans le journal une fois la fenêtre affichée.
+"""
+
+import importlib
+import logging
+import time
+
+
+class ChronoDemarrage:
+    """Étapes du démarrage, en millisecondes depuis la création du chrono."""
+
+    def __init__(self):
+        self.debut = time.perf_counter()
+        self.imports = []
+        self.etapes = []
+
+    def importer(self, *modules):
+        """Importe les modules donnés en mesurant le temps de chacun."""
+        for nom in modules:
+            depart = time.perf_counter()
+            importlib.import_module(nom)
+            self.imports.append((nom, (time.perf_counter() - depart) * 1000))
+
+    def etape(self, nom):
+        """Note le temps écoulé depuis le début du démarrage."""
+        self.etapes.append((nom, (time.perf_counter() - self.debut) * 1000))
+
+    def rapport(self):
+        lignes = ["Démarrage:"]
+        lignes += [f"   import {nom}: {duree:.0f} ms" for nom, duree in self.imports]
+        lignes += [f"   {nom}: {duree:.0f} ms" for nom, duree in self.etapes]
+        return "\n".join(lignes)
+
+    def journaliser(self):
+        logging.info(self.rapport())
+
+
+chrono_demarrage = ChronoDemarrage()
@@ -0,0 +1,294 @@
+"""
+Désinstallation de programmes
+Description: File de désinstallation sans dépendance à Qt. Toutes les
+commandes sont résolues en une seule consultation de l'instantané du
+registre ; les désinstallations MSI passent l'une après l'autre (Windows
+Installer n'en accepte qu'une à la fois), les autres désinstalleurs tournent
+en parallèle dans une limite fixe. Sous Linux, les paquets sont retirés en
+un seul appel par gestionnaire (apt-get, flatpak, snap, rpm).
+"""
+
+import logging
+import os
+import platform
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from paquets_linux import paquet_dpkg
+from registre import inventaire_partage
+from systeme import get_subprocess_creationflags, get_subprocess_startupinfo
+
+# Désinstalleurs non MSI lancés simultanément
+NB_DESINSTALLATIONS_PARALLELES = 3
+
+# Durée maximale d'une désinstallation, en secondes
+DELAI_DESINSTALLATION = 300
+
+# États transmis pour chaque élément
+EN_ATTENTE = "en attente"
+EN_COURS = "en cours"
+TERMINE = "désinstallé"
+ECHEC = "échec"
+ANNULE = "annulé"
+
+MESSAGE_ANNULATION = "Désinstallation annulée."
+
+
+def _ignorer(*args):
+    pass
+
+
+def preparer_commande(programme):
+    """
+    Commande de désinstallation d'un ProgrammeInstalle, prête pour le shell.
+    Retourne (commande, None) ou (None, message d'erreur).
+    """
+    # Utiliser QuietUninstallString si disponible, sinon UninstallString
+    uninstall_cmd = (programme.desinstallation_silencieuse.strip()
+                     or programme.desinstallation.strip() or None)
+    if not uninstall_cmd:
+        return None, f"Impossible de trouver la commande de désinstallation pour {programme.nom}"
+
+    # Vérifier si le désinstalleur existe réellement
+    # Extraire le chemin de l'exécutable de la commande
+    exe_path_to_check = None
+    if uninstall_cmd.startswith('"'):
+        # Commande avec guillemets
+        end_quote = uninstall_cmd.find('"', 1)
+        if end_quote > 0:
+            exe_path_to_check = uninstall_cmd[1:end_quote]
+    elif '.exe' in uninstall_cmd.lower():
+        # Commande sans guillemets
+        exe_end = uninstall_cmd.lower().find('.exe') + 4
+        # Prendre jusqu'à l'exe, en séparant sur le premier espace après
+        cmd_part = uninstall_cmd[:exe_end]
+        if ' /' in cmd_part or ' -' in cmd_part:
+            # Il y a des arguments avant .exe, prendre seulement le début
+            exe_path_to_check = cmd_part.split()[0] if ' ' in cmd_part else cmd_part
+        else:
+            exe_path_to_check = cmd_part
+
+    # Vérifier l'existence pour les chemins non-msiexec
+    if exe_path_to_check and 'msiexec' not in exe_path_to_check.lower():
+        if not os.path.exists(exe_path_to_check):
+            logging.warning(f"Désinstalleur introuvable: {exe_path_to_check}")
+            return None, (
+                f"Le désinstalleur n'existe pas: {exe_path_to_check}\n\n"
+                f"Le programme a peut-être été déplacé ou désinstallé manuellement.\n"
+                f"Vous pouvez supprimer l'entrée du registre manuellement.")
+
+    # Pour les installations MSI, ajouter /quiet pour une désinstallation silencieuse
+    if est_msi(uninstall_cmd):
+        if '/quiet' not in uninstall_cmd.lower() and '/qn' not in uninstall_cmd.lower():
+            uninstall_cmd += ' /quiet /norestart'
+
+    # Détecter si la commande commence par un chemin (sans guillemets) avec des espaces
+    # et l'entourer de guillemets si nécessaire
+    if not uninstall_cmd.startswith('"') and '.exe' in uninstall_cmd.lower():
+        # Séparer le chemin de l'exe et les arguments
+        exe_end = uninstall_cmd.lower().find('.exe') + 4
+        exe_path = uninstall_cmd[:exe_end]
+        args = uninstall_cmd[exe_end:]
+        if ' ' in exe_path:
+            uninstall_cmd = f'"{exe_path}"{args}'
+
+    return uninstall_cmd, None
+
+
+def est_msi(commande):
+    return 'msiexec' in commande.lower()
+
+
+def interpreter_code_retour(nom, code, stderr):
+    """(succès, message) selon le code de retour d'un désinstalleur."""
+    if code == 0 or code == 3010:  # 3010 = reboot required
+        message = f"Programme '{nom}' désinstallé avec succès."
+        if code == 3010:
+            message += " Un redémarrage peut être nécessaire."
+        return True, message
+    if code == 1602 or code == 1223:
+        # 1602/1223 = User cancelled
+        return False, "Désinstallation annulée par l'utilisateur."
+    error_msg = stderr[:200] if stderr else "Aucun message d'erreur"
+    return False, f"Erreur lors de la désinstallation (code {code}).\n{error_msg}"
+
+
+def gestionnaire_linux(nom, chemin):
+    """
+    Gestionnaire de paquets d'un programme, d'après son chemin d'inventaire
+    (flatpak, snap) ou, chemin vide, la liste de fichiers tenue par dpkg.
+    """
+    if "/flatpak/" in chemin:
+        return "flatpak"
+    if chemin.startswith("/snap/"):
+        return "snap"
+    if not chemin and paquet_dpkg(nom):
+        return "apt"
+    return "rpm"
+
+
+COMMANDES_LINUX = {
+    'apt': ["sudo", "apt-get", "remove", "-y"],
+    'flatpak': ["flatpak", "uninstall", "-y", "--noninteractive"],
+    'snap': ["sudo", "snap", "remove"],
+    'rpm': ["sudo", "rpm", "-e"],
+}
+
+
+class FileDesinstallation:
+    """
+    Désinstalle une liste d'éléments (clé, nom, chemin) ; la clé est rendue
+    telle quelle dans statut(clé, état, message) et dans les résultats.
+    Après stop(), les éléments non commencés passent à l'état ANNULE.
+    """
+
+    def __init__(self, elements, nb_paralleles=NB_DESINSTALLATIONS_PARALLELES):
+        self.elements = list(elements)
+        self.nb_paralleles = max(1, nb_paralleles)
+        self._is_running = True
+
+    def executer(self, progression=None, statut=None):
+        """
+        Désinstalle tous les éléments ; progression(valeur, message) et
+        statut(clé, état, message). Retourne la liste des dicts
+        {'cle', 'nom', 'succes', 'etat', 'message'}.
+        """
+        progression = progression or _ignorer
+        statut = statut or _ignorer
+        for cle, nom, _ in self.elements:
+            statut(cle, EN_ATTENTE, "")
+        try:
+            if platform.system() == "Windows":
+                resultats = self._desinstaller_windows(progression, statut)
+            else:
+                resultats = self._desinstaller_linux(progression, statut)
+        finally:
+            # Le registre a changé : l'instantané sera relu
+            inventaire_partage().invalider()
+        progression(100, "Désinstallation terminée")
+        return resultats
+
+    def _terminer(self, resultats, statut, cle, nom, succes, message, etat=None):
+        etat = etat or (TERMINE if succes else ECHEC)
+        resultats.append({'cle': cle, 'nom': nom, 'succes': succes,
+                          'etat': etat, 'message': message})
+        statut(cle, etat, message)
+        if succes:
+            logging.info(f"Désinstallation réussie: {nom}")
+        elif etat == ANNULE:
+            logging.info(f"Désinstallation annulée: {nom}")
+        else:
+            logging.error(f"Échec désinstallation {nom}: {message}")
+
+    def _annuler(self, resultats, statut, cle, nom):
+        self._terminer(resultats, statut, cle, nom, False, MESSAGE_ANNULATION, ANNULE)
+
+    def _desinstaller_windows(self, progression, statut):
+        resultats = []
+        progression(5, "Récupération des informations de désinstallation...")
+        # Une seule consultation de l'inventaire pour tous les éléments
+        par_nom = {}
+        for programme in inventaire_partage().programmes():
+            par_nom.setdefault(programme.nom, programme)
+
+        msi, autres = [], []
+        for cle, nom, _ in self.elements:
+            programme = par_nom.get(nom)
+            if programme is None:
+                self._terminer(resultats, statut, cle, nom, False,
+                               f"Impossible de trouver la commande de désinstallation pour {nom}")
+                continue
+            commande, erreur = preparer_commande(programme)
+            if erreur:
+                self._terminer(resultats, statut, cle, nom, False, erreur)
+                continue
+            (msi if est_msi(commande) else autres).append((cle, nom, commande))
+
+        total = len(self.elements)
+        with ThreadPoolExecutor(1, thread_name_prefix="msi") as file_msi, \
+                ThreadPoolExecutor(self.nb_paralleles,
+                                   thread_name_prefix="desinstallation") as pool:
+            futurs = {}
+            for executeur, taches in ((file_msi, msi), (pool, autres)):
+                for cle, nom, commande in taches:
+                    futur = executeur.submit(self._lancer, cle, nom, commande, statut)
+                    futurs[futur] = (cle, nom)
+            for futur in as_completed(futurs):
+                cle, nom = futurs[futur]
+                try:
+                    resultat = futur.result()
+                except Exception as e:
+                    resultat = False, f"Erreur: {e}"
+                if resultat is None:
+                    self._annuler(resultats, statut, cle, nom)
+                else:
+                    self._terminer(resultats, statut, cle, nom, *resultat)
+                progression(5 + 95 * len(resultats) // total,
+                            f"{len(resultats)}/{total} désinstallations terminées")
+        return resultats
+
+    def _lancer(self, cle, nom, commande, statut):
+        """
+        Exécute une commande de désinstallation ; retourne (succès, message),
+        ou None si la file a été arrêtée avant son lancement.
+        """
+        if not self._is_running:
+            return None
+        statut(cle, EN_COURS, "")
+        logging.info(f"Commande de désinstallation: {commande}")
+        processus = subprocess.Popen(
+            commande,
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            startupinfo=get_subprocess_startupinfo(),
+            creationflags=get_subprocess_creationflags()
+        )
+        try:
+            _, stderr = processus.communicate(timeout=DELAI_DESINSTALLATION)
+        except subprocess.TimeoutExpired:
+            processus.kill()
+            processus.communicate()
+            return False, "La désinstallation a pris trop de temps (timeout de 5 minutes)."
+        return interpreter_code_retour(nom, processus.returncode, stderr)
+
+    def _desinstaller_linux(self, progression, statut):
+        """Un seul appel par gestionnaire de paquets pour tous ses paquets."""
+        resultats = []
+        groupes = {}
+        for cle, nom, chemin in self.elements:
+            groupes.setdefault(gestionnaire_linux(nom, chemin or ""), []).append((cle, nom))
+
+        for i, (gestionnaire, paquets) in enumerate(groupes.items()):
+            if not self._is_running:
+                for cle, nom in paquets:
+                    self._annuler(resultats, statut, cle, nom)
+                continue
+            progression(10 + 90 * i // len(groupes),
+                        f"Désinstallation de {len(paquets)} paquets ({gestionnaire})...")
+            for cle, _ in paquets:
+                statut(cle, EN_COURS, "")
+            cmd = COMMANDES_LINUX[gestionnaire] + [nom for _, nom in paquets]
+            try:
+                process = subprocess.run(
+                    cmd, capture_output=True, text=True,
+                    timeout=DELAI_DESINSTALLATION)
+                succes = process.returncode == 0
+                erreur = process.stderr[:200]
+            except subprocess.TimeoutExpired:
+                succes, erreur = False, "La désinstallation a pris trop de temps (timeout)."
+            except OSError as e:
+                succes, erreur = False, str(e)
+            for cle, nom in paquets:
+                message = (f"Programme '{nom}' désinstallé avec succès." if succes
+                           else f"Erreur lors de la désinstallation: {erreur}")
+                self._terminer(resultats, statut, cle, nom, succes, message)
+        return resultats
+
+    def stop(self):
+        """
+        Arrête la file : les éléments non commencés sont annulés, les
+        désinstalleurs déjà lancés vont à leur terme.
+        """
+        self._is_running = False
@@ -0,0 +1,189 @@
+"""
+Export PDF
+Description: Export en PDF de grands tableaux (programmes, dossiers vides),
+sans dépendance à Qt. Les lignes sont lues au fil de la mise en page par
+blocs d'une page : seul le bloc en cours existe sous forme d'objets
+reportlab, la mémoire reste la même quel que soit le nombre de lignes.
+L'entête des colonnes est dessiné par le modèle de page, il est donc répété
+en haut de chaque page sans ligne d'entête au milieu du tableau.
+
+Les cellules sont des chaînes simples ; un Paragraph n'est créé que pour un
+texte plus large que sa colonne, qui doit être coupé sur plusieurs lignes.
+"""
+
+import os
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import (
+    BaseDocTemplate, Frame, NextPageTemplate, PageTemplate, Paragraph, Table,
+    TableStyle)
+
+MARGE = 30
+HAUTEUR_TITRE = 40
+HAUTEUR_ENTETE = 18
+TAILLE_POLICE = 8
+# Marges intérieures par défaut d'une cellule de Table (gauche + droite)
+MARGE_CELLULE = 12
+
+# Lignes par bloc : une page A4 de lignes d'une seule ligne de texte
+TAILLE_BLOC = 48
+
+STYLE_BLOC = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), TAILLE_POLICE),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+])
+
+STYLE_CELLULE = ParagraphStyle(
+    'cellule', fontName='Helvetica', fontSize=TAILLE_POLICE,
+    leading=TAILLE_POLICE * 1.2)
+
+
+def _ignorer(*args):
+    pass
+
+
+class DocumentTableau(BaseDocTemplate):
+    """
+    Document A4 d'un seul tableau : titre en première page, entête des
+    colonnes sur chaque page, corps fourni par blocs au fil de la mise en page.
+    """
+
+    def __init__(self, fichier, titre, entetes, largeurs, blocs):
+        super().__init__(fichier, pagesize=A4, leftMargin=MARGE,
+                         rightMargin=MARGE, topMargin=MARGE, bottomMargin=MARGE,
+                         title=titre, pageCompression=1)
+        self.titre = titre
+        self.entetes = entetes
+        self.largeurs = largeurs
+        self.blocs = blocs
+        self.histoire = []
+        hauteur = self.height - HAUTEUR_ENTETE
+        self.addPageTemplates([
+            PageTemplate('premiere', [self._cadre(hauteur - HAUTEUR_TITRE)],
+                         onPage=self._dessiner_entete),
+            PageTemplate('suivantes', [self._cadre(hauteur)],
+                         onPage=self._dessiner_entete),
+        ])
+
+    def _cadre(self, hauteur):
+        return Frame(self.leftMargin, self.bottomMargin, self.width, hauteur,
+                     leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0)
+
+    def _dessiner_entete(self, canvas, doc):
+        haut = self.pagesize[1] - self.topMargin
+        canvas.saveState()
+        if doc.page == 1:
+            canvas.setFont('Helvetica-Bold', 18)
+            canvas.drawCentredString(self.pagesize[0] / 2, haut - 24, self.titre)
+            haut -= HAUTEUR_TITRE
+        # Entête aligné sur le tableau, centré dans le cadre comme lui
+        x = self.leftMargin + (self.width - sum(self.largeurs)) / 2
+        bas = haut - HAUTEUR_ENTETE
+        canvas.setFillColor(colors.grey)
+        canvas.setStrokeColor(colors.black)
+        canvas.setLineWidth(0.5)
+        canvas.rect(x, bas, sum(self.largeurs), HAUTEUR_ENTETE, fill=1, stroke=1)
+        canvas.setFillColor(colors.whitesmoke)
+        canvas.setFont('Helvetica-Bold', TAILLE_POLICE)
+        for entete, largeur in zip(self.entetes, self.largeurs):
+            canvas.drawString(x + MARGE_CELLULE / 2, bas + 6, entete)
+            canvas.line(x, bas, x, haut)
+            x += largeur
+        canvas.restoreState()
+
+    def construire(self):
+        """Met en page tous les blocs."""
+        self.histoire = [NextPageTemplate('suivantes')]
+        self.build(self.histoire)
+
+    def filterFlowables(self, flowables):
+        # Appelé avant chaque élément (aussi pour les listes internes de
+        # reportlab) : le bloc suivant est ajouté à l'histoire quand il n'y
+        # reste plus que l'élément en cours, elle ne se vide jamais avant la
+        # fin des blocs
+        if flowables is self.histoire and len(flowables) <= 1:
+            bloc = next(self.blocs, None)
+            if bloc is not None:
+                flowables.append(bloc)
+
+
+class ExportPdf:
+    """
+    Écrit un tableau en PDF. lignes : itérable de tuples de textes, total :
+    nombre de lignes attendu (pour la progression).
+    """
+
+    def __init__(self, fichier, titre, entetes, largeurs, lignes, total=None,
+                 taille_bloc=TAILLE_BLOC):
+        self.fichier = fichier
+        self.titre = titre
+        self.entetes = entetes
+        self.largeurs = largeurs
+        self.lignes = lignes
+        self.total = total
+        self.taille_bloc = taille_bloc
+        self.nb_lignes = 0
+        self._is_running = True
+
+    def _cellule(self, texte, largeur):
+        texte = str(texte)
+        if stringWidth(texte, 'Helvetica', TAILLE_POLICE) <= largeur - MARGE_CELLULE:
+            return texte
+        return Paragraph(escape(texte), STYLE_CELLULE)
+
+    def _blocs(self, progression):
+        bloc = []
+        pourcentage = -1
+        for ligne in self.lignes:
+            if not self._is_running:
+                return
+            bloc.append([self._cellule(texte, largeur)
+                         for texte, largeur in zip(ligne, self.largeurs)])
+            if len(bloc) >= self.taille_bloc:
+                yield self._table(bloc)
+                bloc = []
+                self.nb_lignes += self.taille_bloc
+                if self.total:
+                    nouveau = min(99, 100 * self.nb_lignes // self.total)
+                    if nouveau != pourcentage:
+                        pourcentage = nouveau
+                        progression(pourcentage)
+        if bloc:
+            self.nb_lignes += len(bloc)
+            yield self._table(bloc)
+
+    def _table(self, bloc):
+        table = Table(bloc, colWidths=self.largeurs)
+        table.setStyle(STYLE_BLOC)
+        return table
+
+    def executer(self, progression=None):
+        """
+        Écrit le document ; retourne le nombre de lignes exportées. Un export
+        arrêté par stop() ne laisse pas de fichier incomplet.
+        """
+        progression = progression or _ignorer
+        progression(0)
+        blocs = self._blocs(progression)
+        document = DocumentTableau(
+            self.fichier, self.titre, self.entetes, self.largeurs, blocs)
+        document.construire()
+        if not self._is_running:
+            try:
+                os.remove(self.fichier)
+            except OSError:
+                pass
+            return self.nb_lignes
+        progression(100)
+        return self.nb_lignes
+
+    def stop(self):
+        """Arrête l'export proprement."""
+        self._is_running = False
@@ -0,0 +1,302 @@
+"""
+Exports de données
+Description: Export des données de chaque onglet (programmes, dossiers
+vides, analyse disque, nettoyage, sécurité) sans dépendance à Qt. Les lignes
+sont écrites par lots au fil de leur lecture, en CSV ou en JSON Lines,
+éventuellement compressés (gzip, ou zstd si le module zstandard est
+installé), ou en Parquet en colonnes si pyarrow est installé.
+
+Le format est déduit de l'extension du fichier : .csv, .jsonl, .parquet,
+suivis de .gz ou .zst pour les formats texte.
+"""
+
+import csv
+import gzip
+import json
+import logging
+import os
+from collections import namedtuple
+from datetime import datetime
+from importlib.util import find_spec
+from itertools import islice
+
+# Modules optionnels : détectés sans être importés (pyarrow est long à
+# charger), importés au premier export qui en a besoin
+ZSTD_DISPONIBLE = find_spec("zstandard") is not None
+PARQUET_DISPONIBLE = find_spec("pyarrow") is not None
+
+# Lignes écrites (et progression rapportée) par lot
+TAILLE_LOT_EXPORT = 10_000
+
+# Niveau gzip : 6 est bien plus rapide que le niveau 9 par défaut pour une
+# taille à peine supérieure
+NIVEAU_GZIP = 6
+
+# Types de colonnes d'un jeu de données (schéma Parquet)
+TEXTE = "texte"
+ENTIER = "entier"
+REEL = "reel"
+BOOLEEN = "booleen"
+DATE = "date"
+
+# nom : libellé du jeu de données ; colonnes : entêtes ; lignes : itérable
+# de tuples ; total : nombre de lignes attendu (None si inconnu) ; types :
+# type de chaque colonne (None : déduits du premier lot écrit). Une valeur
+# absente vaut None, quel que soit le type.
+JeuDonnees = namedtuple('JeuDonnees', ['nom', 'colonnes', 'lignes', 'total', 'types'],
+                        defaults=(None,))
+
+
+def _ignorer(*args):
+    pass
+
+
+def formats_disponibles():
+    """Filtres (libellé, extension) des formats utilisables ici."""
+    formats = [("CSV", ".csv"), ("CSV gzip", ".csv.gz"),
+               ("JSON Lines", ".jsonl"), ("JSON Lines gzip", ".jsonl.gz")]
+    if ZSTD_DISPONIBLE:
+        formats.insert(2, ("CSV zstd", ".csv.zst"))
+        formats.append(("JSON Lines zstd", ".jsonl.zst"))
+    if PARQUET_DISPONIBLE:
+        formats.append(("Parquet", ".parquet"))
+    return formats
+
+
+def format_fichier(fichier):
+    """(format, compression) d'après l'extension ; ValueError si inconnue."""
+    nom = fichier.lower()
+    compression = None
+    for extension, type_compression in ((".gz", "gzip"), (".zst", "zstd")):
+        if nom.endswith(extension):
+            nom = nom[:-len(extension)]
+            compression = type_compression
+    for extension, format_export in ((".csv", "csv"), (".jsonl", "jsonl"),
+                                     (".parquet", "parquet")):
+        if nom.endswith(extension):
+            break
+    else:
+        raise ValueError(f"Format d'export inconnu : {fichier}")
+    if format_export == "parquet":
+        if compression:
+            raise ValueError("Parquet est déjà compressé : pas de .gz ni de .zst")
+        if not PARQUET_DISPONIBLE:
+            raise ValueError("L'export Parquet nécessite le module pyarrow")
+    if compression == "zstd" and not ZSTD_DISPONIBLE:
+        raise ValueError("La compression zstd nécessite le module zstandard")
+    return format_export, compression
+
+
+def ouvrir_texte(fichier, compression):
+    """Flux texte UTF-8 en écriture, compressé ou non."""
+    if compression == "gzip":
+        return gzip.open(fichier, "wt", encoding="utf-8", newline="",
+                         compresslevel=NIVEAU_GZIP)
+    if compression == "zstd":
+        import zstandard
+        return zstandard.open(fichier, "wt", encoding="utf-8", newline="")
+    return open(fichier, "w", encoding="utf-8", newline="")
+
+
+def _valeur_json(valeur):
+    return valeur.isoformat() if hasattr(valeur, "isoformat") else str(valeur)
+
+
+class ExportDonnees:
+    """Écrit un JeuDonnees dans un fichier, par lots de TAILLE_LOT_EXPORT lignes."""
+
+    def __init__(self, fichier, jeu, taille_lot=TAILLE_LOT_EXPORT):
+        self.fichier = fichier
+        self.jeu = jeu
+        self.taille_lot = taille_lot
+        self.format, self.compression = format_fichier(fichier)
+        self.nb_lignes = 0
+        self._is_running = True
+
+    def _lots(self, progression):
+        lignes = iter(self.jeu.lignes)
+        while self._is_running:
+            lot = list(islice(lignes, self.taille_lot))
+            if not lot:
+                return
+            yield lot
+            self.nb_lignes += len(lot)
+            if self.jeu.total:
+                progression(min(99, 100 * self.nb_lignes // self.jeu.total))
+
+    def executer(self, progression=None):
+        """
+        Écrit toutes les lignes ; retourne le nombre de lignes écrites. Un
+        export arrêté par stop() ou interrompu par une erreur ne laisse pas
+        de fichier incomplet.
+        """
+        progression = progression or _ignorer
+        progression(0)
+        try:
+            if self.format == "parquet":
+                self._ecrire_parquet(progression)
+            else:
+                with ouvrir_texte(self.fichier, self.compression) as flux:
+                    if self.format == "csv":
+                        self._ecrire_csv(flux, progression)
+                    else:
+                        self._ecrire_jsonl(flux, progression)
+        except BaseException:
+            self._supprimer_fichier()
+            raise
+        if not self._is_running:
+            self._supprimer_fichier()
+            return self.nb_lignes
+        progression(100)
+        return self.nb_lignes
+
+    def _supprimer_fichier(self):
+        try:
+            os.remove(self.fichier)
+        except OSError as e:
+            logging.warning(f"Export partiel non supprimé {self.fichier}: {e}")
+
+    def _ecrire_csv(self, flux, progression):
+        ecrivain = csv.writer(flux)
+        ecrivain.writerow(self.jeu.colonnes)
+        for lot in self._lots(progression):
+            ecrivain.writerows(lot)
+
+    def _ecrire_jsonl(self, flux, progression):
+        encodeur = json.JSONEncoder(ensure_ascii=False, default=_valeur_json)
+        colonnes = self.jeu.colonnes
+        for lot in self._lots(progression):
+            flux.write("\n".join(
+                encodeur.encode(dict(zip(colonnes, ligne))) for ligne in lot))
+            flux.write("\n")
+
+    def _schema_parquet(self, pyarrow):
+        """Schéma issu des types du jeu, ou None s'ils ne sont pas donnés."""
+        if self.jeu.types is None:
+            return None
+        types = {TEXTE: pyarrow.string(), ENTIER: pyarrow.int64(),
+                 REEL: pyarrow.float64(), BOOLEEN: pyarrow.bool_(),
+                 DATE: pyarrow.timestamp("us")}
+        return pyarrow.schema([(nom, types[type_colonne]) for nom, type_colonne
+                               in zip(self.jeu.colonnes, self.jeu.types)])
+
+    def _ecrire_parquet(self, progression):
+        # Un groupe de lignes par lot ; sans types, schéma fixé par le premier lot
+        import pyarrow
+        import pyarrow.parquet
+        schema = self._schema_parquet(pyarrow)
+        ecrivain = None
+        try:
+            for lot in self._lots(progression):
+                colonnes = {nom: list(valeurs) for nom, valeurs
+                            in zip(self.jeu.colonnes, zip(*lot))}
+                table = pyarrow.Table.from_pydict(colonnes, schema=schema)
+                if ecrivain is None:
+                    schema = table.schema
+                    ecrivain = pyarrow.parquet.ParquetWriter(
+                        self.fichier, schema, compression="zstd")
+                ecrivain.write_table(table)
+            if ecrivain is None:
+                pyarrow.parquet.write_table(pyarrow.table(
+                    {nom: pyarrow.array([], schema.field(nom).type if schema
+                                        else pyarrow.string())
+                     for nom in self.jeu.colonnes}), self.fichier)
+        finally:
+            if ecrivain is not None:
+                ecrivain.close()
+
+    def stop(self):
+        """Arrête l'export ; le fichier partiel est supprimé."""
+        self._is_running = False
+
+
+# --- Jeux de données des onglets ---
+
+def jeu_programmes(programmes):
+    return JeuDonnees("Programmes installés", ["programme", "version", "chemin"],
+                      (p[:3] for p in programmes), len(programmes),
+                      [TEXTE, TEXTE, TEXTE])
+
+
+def jeu_dossiers_vides(dossiers):
+    # Taille déjà formatée ("0 octets")
+    return JeuDonnees("Dossiers vides", ["dossier", "taille"], dossiers, len(dossiers),
+                      [TEXTE, TEXTE])
+
+
+def jeux_disque(resultats):
+    """Jeux de l'analyse disque : gros fichiers, arbre des dossiers, partitions."""
+    jeux = []
+    gros_fichiers = resultats.get('gros_fichiers') or []
+    if gros_fichiers:
+        jeux.append(JeuDonnees(
+            "Gros fichiers", ["nom", "chemin", "taille", "date_modif"],
+            ((f['nom'], f['chemin'], f['taille'], f['date_modif'])
+             for f in gros_fichiers), len(gros_fichiers),
+            [TEXTE, TEXTE, ENTIER, DATE]))
+    arbre = resultats.get('arbre')
+    if arbre is not None and len(arbre):
+        jeux.append(JeuDonnees(
+            "Arbre des dossiers",
+            ["chemin", "octets", "fichiers", "octets_directs", "fichiers_directs"],
+            ((chemin, arbre.octets[n], arbre.fichiers[n],
+              arbre.octets_directs[n], arbre.fichiers_directs[n])
+             for n, chemin in arbre.parcourir()), len(arbre),
+            [TEXTE, ENTIER, ENTIER, ENTIER, ENTIER]))
+    partitions = resultats.get('partitions') or []
+    if partitions:
+        jeux.append(_jeu_dicts("Partitions", partitions))
+    return jeux
+
+
+def jeu_nettoyage(resultats):
+    """Compteurs par catégorie du dernier nettoyage."""
+    categories = resultats.get('categories') or {}
+    return _jeu_dicts("Nettoyage", [
+        {'categorie': option, **compteurs} for option, compteurs in categories.items()])
+
+
+def jeu_securite(resultats):
+    """Tous les éléments de l'analyse de sécurité, avec leur catégorie."""
+    return _jeu_dicts("Sécurité", [
+        {'categorie': categorie, **element}
+        for categorie, elements in resultats.items() for element in elements])
+
+
+def _type_colonne(valeurs):
+    """Type commun des valeurs présentes (None ignoré) ; TEXTE si mélangées."""
+    types = {type(valeur) for valeur in valeurs if valeur is not None}
+    if not types:
+        return TEXTE
+    if types == {bool}:
+        return BOOLEEN
+    if types <= {int}:
+        return ENTIER
+    if types <= {int, float}:
+        return REEL
+    if all(issubclass(t, datetime) for t in types):
+        return DATE
+    return TEXTE
+
+
+def _jeu_dicts(nom, elements):
+    """
+    Jeu de données d'une liste de dicts : colonnes = union des clés, une clé
+    absente d'un élément vaut None. Le type de chaque colonne est déduit de
+    toutes ses valeurs ; une colonne aux valeurs mélangées est écrite en
+    texte.
+    """
+    colonnes = list(dict.fromkeys(cle for element in elements for cle in element))
+    types = [_type_colonne(e.get(c) for e in elements) for c in colonnes]
+    en_texte = [type_colonne == TEXTE for type_colonne in types]
+
+    def ligne(element):
+        valeurs = []
+        for colonne, texte in zip(colonnes, en_texte):
+            valeur = element.get(colonne)
+            if texte and valeur is not None and not isinstance(valeur, str):
+                valeur = str(valeur)
+            valeurs.append(valeur)
+        return tuple(valeurs)
+
+    return JeuDonnees(nom, colonnes, (ligne(e) for e in elements), len(elements), types)
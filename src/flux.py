@@ -0,0 +1,50 @@
+"""
+Flux de résultats par lots
+Description: Regroupe les résultats produits par un thread de travail pour
+les transmettre à l'interface par lots (N éléments ou toutes les T secondes),
+au lieu d'une seule liste complète en fin de traitement.
+"""
+
+import time
+
+TAILLE_LOT = 500
+INTERVALLE_LOT = 0.25  # secondes
+
+
+class EmetteurLots:
+    """
+    Accumule des éléments et appelle emettre(liste) quand le lot est plein
+    ou que l'intervalle est écoulé. emettre est typiquement signal.emit.
+    """
+
+    def __init__(self, emettre, taille=TAILLE_LOT, intervalle=INTERVALLE_LOT):
+        self.emettre = emettre
+        self.taille = taille
+        self.intervalle = intervalle
+        self.total = 0
+        self._lot = []
+        self._dernier_envoi = time.monotonic()
+
+    def ajouter(self, element):
+        self._lot.append(element)
+        self.total += 1
+        if len(self._lot) >= self.taille:
+            self.vider()
+        else:
+            self.rythmer()
+
+    def etendre(self, elements):
+        for element in elements:
+            self.ajouter(element)
+
+    def rythmer(self):
+        """Envoie le lot en attente si l'intervalle est écoulé."""
+        if self._lot and time.monotonic() - self._dernier_envoi >= self.intervalle:
+            self.vider()
+
+    def vider(self):
+        """Envoie immédiatement le lot en attente."""
+        if self._lot:
+            lot, self._lot = self._lot, []
+            self.emettre(lot)
+        self._dernier_envoi = time.monotonic()
@@ -0,0 +1,228 @@
+"""
+Gestionnaire de tâches
+Description: Exécution des tâches de fond de l'application, sans dépendance
+à Qt (utilisable par l'interface comme par un script). Les travaux sont
+rangés par classe, IO (disque, registre, processus externes) ou CPU (mise en
+forme, export), chacune servant ses travaux par priorité avec un nombre
+limité de threads.
+
+Un travail est identifié par une clé : soumettre un travail dont la clé est
+déjà en attente ou en cours retourne le travail existant au lieu d'en lancer
+un second. Chaque travail a un jeton d'annulation, relié à la méthode stop()
+de sa tâche ; arreter() annule tous les jetons d'un coup puis attend tous
+les threads dans un seul délai.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+IO = "io"
+CPU = "cpu"
+
+# Threads par classe : les travaux IO attendent surtout le disque ou un
+# processus ; les travaux CPU se partagent le GIL, inutile d'en lancer plus
+NB_TRAVAUX_IO = 4
+NB_TRAVAUX_CPU = 2
+
+# Plus petit = plus prioritaire
+PRIORITE_HAUTE = 0
+PRIORITE_NORMALE = 10
+PRIORITE_BASSE = 20
+
+# États d'un travail
+EN_ATTENTE = "en attente"
+EN_COURS = "en cours"
+TERMINE = "terminé"
+ANNULE = "annulé"
+ECHEC = "échec"
+
+
+class JetonAnnulation:
+    """
+    Demande d'annulation partagée entre le demandeur et la tâche. Les
+    rappels liés (stop() des tâches) sont appelés une fois, à l'annulation.
+    """
+
+    def __init__(self):
+        self._evenement = threading.Event()
+        self._rappels = []
+        self._verrou = threading.Lock()
+
+    @property
+    def annule(self):
+        return self._evenement.is_set()
+
+    def lier(self, rappel):
+        """Appelle rappel() à l'annulation (tout de suite si déjà annulé)."""
+        with self._verrou:
+            if not self._evenement.is_set():
+                self._rappels.append(rappel)
+                return
+        rappel()
+
+    def annuler(self):
+        with self._verrou:
+            if self._evenement.is_set():
+                return
+            self._evenement.set()
+            rappels, self._rappels = self._rappels, []
+        for rappel in rappels:
+            try:
+                rappel()
+            except Exception as e:
+                logging.error(f"Erreur à l'annulation: {e}")
+
+    def attendre(self, delai=None):
+        """Attend l'annulation ; retourne True si elle a eu lieu."""
+        return self._evenement.wait(delai)
+
+
+class Travail:
+    """Un appel fonction(*args) soumis au gestionnaire, et son état."""
+
+    def __init__(self, cle, fonction, args, priorite, classe):
+        self.cle = cle
+        self.fonction = fonction
+        self.args = args
+        self.priorite = priorite
+        self.classe = classe
+        self.jeton = JetonAnnulation()
+        self.etat = EN_ATTENTE
+        self.resultat = None
+        self.erreur = None
+        self.duree = None
+        self._fin = threading.Event()
+
+    @property
+    def actif(self):
+        return not self._fin.is_set()
+
+    def annuler(self):
+        """Demande l'arrêt du travail (retiré de la file s'il n'a pas commencé)."""
+        self.jeton.annuler()
+
+    def attendre(self, delai=None):
+        """Attend la fin du travail ; retourne False si le délai a expiré."""
+        return self._fin.wait(delai)
+
+    def _executer(self):
+        if self.jeton.annule:
+            self.etat = ANNULE
+            return
+        self.etat = EN_COURS
+        debut = time.monotonic()
+        try:
+            self.resultat = self.fonction(*self.args)
+            self.etat = ANNULE if self.jeton.annule else TERMINE
+        except Exception as e:
+            logging.error(f"Erreur du travail {self.cle}: {e}")
+            self.erreur = e
+            self.etat = ECHEC
+        finally:
+            self.duree = time.monotonic() - debut
+
+
+class GestionnaireTaches:
+    """File de travaux à priorités, servie par un nombre borné de threads par classe."""
+
+    def __init__(self, nb_io=NB_TRAVAUX_IO, nb_cpu=NB_TRAVAUX_CPU):
+        self.limites = {IO: max(1, nb_io), CPU: max(1, nb_cpu)}
+        self._files = {IO: [], CPU: []}
+        self._threads = {IO: [], CPU: []}
+        self._libres = {IO: 0, CPU: 0}
+        self._actifs = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._ferme = False
+
+    def soumettre(self, cle, fonction, *args, priorite=PRIORITE_NORMALE,
+                  classe=IO, arret=None):
+        """
+        Met fonction(*args) en file et retourne son Travail ; si un travail
+        de même clé est en attente ou en cours, c'est lui qui est retourné.
+        arret : fonction appelée à l'annulation (stop() de la tâche).
+        """
+        if classe not in self._files:
+            raise ValueError(f"Classe de travail inconnue : {classe}")
+        with self._condition:
+            if self._ferme:
+                raise RuntimeError("Gestionnaire de tâches arrêté")
+            existant = self._actifs.get(cle)
+            if existant is not None:
+                logging.info(f"Travail déjà en cours: {cle}")
+                return existant
+            travail = Travail(cle, fonction, args, priorite, classe)
+            if arret is not None:
+                travail.jeton.lier(arret)
+            self._actifs[cle] = travail
+            heapq.heappush(self._files[classe],
+                           (priorite, next(self._sequence), travail))
+            if not self._libres[classe] and len(self._threads[classe]) < self.limites[classe]:
+                self._demarrer_thread(classe)
+            self._condition.notify_all()
+        return travail
+
+    def _demarrer_thread(self, classe):
+        thread = threading.Thread(
+            target=self._servir, args=(classe,), daemon=True,
+            name=f"taches-{classe}-{len(self._threads[classe]) + 1}")
+        self._threads[classe].append(thread)
+        thread.start()
+
+    def _servir(self, classe):
+        file = self._files[classe]
+        while True:
+            with self._condition:
+                self._libres[classe] += 1
+                while not file and not self._ferme:
+                    self._condition.wait()
+                self._libres[classe] -= 1
+                if not file:
+                    return
+                _, _, travail = heapq.heappop(file)
+            try:
+                travail._executer()
+            finally:
+                with self._condition:
+                    if self._actifs.get(travail.cle) is travail:
+                        del self._actifs[travail.cle]
+                travail._fin.set()
+
+    def en_cours(self, cle):
+        """Travail en attente ou en cours pour cette clé, sinon None."""
+        with self._condition:
+            return self._actifs.get(cle)
+
+    def travaux(self):
+        """Travaux en attente ou en cours."""
+        with self._condition:
+            return list(self._actifs.values())
+
+    def annuler(self, cle):
+        travail = self.en_cours(cle)
+        if travail is not None:
+            travail.annuler()
+
+    def arreter(self, delai=2.0):
+        """
+        Annule tous les travaux en même temps et attend les threads, au plus
+        delai secondes au total. Retourne True si tous se sont terminés ; les
+        threads restants (daemon) n'empêchent pas la sortie du programme.
+        """
+        with self._condition:
+            self._ferme = True
+            travaux = list(self._actifs.values())
+            threads = [t for liste in self._threads.values() for t in liste]
+            self._condition.notify_all()
+        for travail in travaux:
+            travail.annuler()
+        fin = time.monotonic() + delai
+        for thread in threads:
+            thread.join(max(0, fin - time.monotonic()))
+        restants = [t.name for t in threads if t.is_alive()]
+        if restants:
+            logging.warning(f"Tâches encore actives à l'arrêt: {', '.join(restants)}")
+        return not restants
@@ -0,0 +1,222 @@
+"""
+Index persistant des noms de fichiers
+Description: Index SQLite utilisé par la recherche globale. Il est construit
+une fois, puis mis à jour à partir des dates de modification des dossiers :
+seuls les dossiers dont la date a changé voient leur liste de fichiers
+réécrite. La recherche par sous-chaîne utilise FTS5 (trigrammes) quand la
+version de SQLite le permet.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+
+from parcours import ParcoursParallele
+from stockage import dossier_donnees
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS racines (
+    chemin TEXT PRIMARY KEY,
+    derniere_maj REAL,
+    passage INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS dossiers (
+    id INTEGER PRIMARY KEY,
+    racine TEXT NOT NULL,
+    chemin TEXT NOT NULL UNIQUE,
+    mtime REAL,
+    passage INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dossiers_racine ON dossiers(racine, passage);
+CREATE TABLE IF NOT EXISTS fichiers (
+    id INTEGER PRIMARY KEY,
+    dossier_id INTEGER NOT NULL,
+    nom TEXT NOT NULL,
+    nom_min TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fichiers_dossier ON fichiers(dossier_id);
+CREATE INDEX IF NOT EXISTS fichiers_nom ON fichiers(nom_min);
+"""
+
+SCHEMA_FTS = """
+CREATE VIRTUAL TABLE IF NOT EXISTS noms_fts USING fts5(
+    nom_min, content='fichiers', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS fichiers_ai AFTER INSERT ON fichiers BEGIN
+    INSERT INTO noms_fts(rowid, nom_min) VALUES (new.id, new.nom_min);
+END;
+CREATE TRIGGER IF NOT EXISTS fichiers_ad AFTER DELETE ON fichiers BEGIN
+    INSERT INTO noms_fts(noms_fts, rowid, nom_min)
+    VALUES ('delete', old.id, old.nom_min);
+END;
+"""
+
+# Nombre de dossiers écrits entre deux validations de transaction
+TAILLE_LOT = 2000
+
+
+class IndexFichiers:
+    """
+    Index des noms de fichiers d'une ou plusieurs racines.
+    La connexion SQLite doit être utilisée depuis le thread qui l'a créée.
+    """
+
+    def __init__(self, chemin_db=None):
+        self.chemin_db = chemin_db or os.path.join(
+            dossier_donnees(), "index_fichiers.db")
+        self.connexion = sqlite3.connect(self.chemin_db)
+        self.fts = False
+        self._initialiser()
+
+    def _initialiser(self):
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        self.connexion.executescript(SCHEMA)
+        try:
+            self.connexion.executescript(SCHEMA_FTS)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            # SQLite sans FTS5 ni tokenizer trigram : recherche par LIKE
+            logging.info(f"Index sans FTS5, recherche par LIKE: {e}")
+
+    def fermer(self):
+        self.connexion.close()
+
+    def est_construit(self, racine):
+        """Indique si la racine a déjà été entièrement indexée une fois."""
+        return self.derniere_maj(racine) is not None
+
+    def derniere_maj(self, racine):
+        """Date (time.time()) du dernier parcours complet de la racine, ou None."""
+        ligne = self.connexion.execute(
+            "SELECT derniere_maj FROM racines WHERE chemin = ?",
+            (racine,)).fetchone()
+        return ligne[0] if ligne and ligne[0] else None
+
+    def mettre_a_jour(self, racine, exclure=None, doit_continuer=None,
+                      suivi=None):
+        """
+        Parcourt la racine et met l'index à jour ; suivi (SuiviProgression)
+        compte les dossiers parcourus.
+
+        Un dossier dont la date de modification n'a pas changé garde sa liste
+        de fichiers sans aucune écriture. Les dossiers disparus sont retirés
+        en fin de parcours, uniquement si celui-ci n'a pas été interrompu.
+        Retourne un dict de statistiques (dossiers, modifies, supprimes).
+        """
+        doit_continuer = doit_continuer or (lambda: True)
+        c = self.connexion
+        ligne = c.execute("SELECT passage FROM racines WHERE chemin = ?",
+                          (racine,)).fetchone()
+        passage = (ligne[0] if ligne else 0) + 1
+        c.execute(
+            "INSERT INTO racines(chemin, passage) VALUES (?, ?) "
+            "ON CONFLICT(chemin) DO UPDATE SET passage = excluded.passage",
+            (racine, passage))
+
+        stats = {'dossiers': 0, 'modifies': 0, 'supprimes': 0}
+        mtimes = {}
+        complet = False
+        with ParcoursParallele(racine, exclure=exclure,
+                               doit_continuer=doit_continuer) as parcours:
+            for entree in parcours:
+                mtime = mtimes.pop(entree.chemin, None)
+                if mtime is None:
+                    try:
+                        mtime = os.stat(entree.chemin).st_mtime
+                    except OSError:
+                        mtime = 0
+                for dossier in entree.dossiers:
+                    try:
+                        mtimes[dossier.path] = dossier.stat(
+                            follow_symlinks=False).st_mtime
+                    except OSError:
+                        pass
+
+                if self._indexer_dossier(racine, passage, entree, mtime):
+                    stats['modifies'] += 1
+                stats['dossiers'] += 1
+                if stats['dossiers'] % TAILLE_LOT == 0:
+                    c.commit()
+                if suivi:
+                    suivi.decouvrir(parcours.dossiers_decouverts)
+                    suivi.avancer()
+            complet = doit_continuer()
+        if suivi:
+            suivi.terminer(complet)
+
+        if complet:
+            stats['supprimes'] = self._purger(racine, passage)
+            c.execute("UPDATE racines SET derniere_maj = ? WHERE chemin = ?",
+                      (time.time(), racine))
+        c.commit()
+        logging.info(
+            f"Index {racine}: {stats['dossiers']} dossiers, "
+            f"{stats['modifies']} modifiés, {stats['supprimes']} supprimés")
+        return stats
+
+    def _indexer_dossier(self, racine, passage, entree, mtime):
+        """Enregistre un dossier ; retourne True si ses fichiers ont été réécrits."""
+        c = self.connexion
+        ligne = c.execute("SELECT id, mtime FROM dossiers WHERE chemin = ?",
+                          (entree.chemin,)).fetchone()
+        if ligne and (ligne[1] == mtime or entree.erreur is not None):
+            c.execute("UPDATE dossiers SET passage = ? WHERE id = ?",
+                      (passage, ligne[0]))
+            return False
+
+        if ligne:
+            dossier_id = ligne[0]
+            c.execute("DELETE FROM fichiers WHERE dossier_id = ?", (dossier_id,))
+            c.execute("UPDATE dossiers SET mtime = ?, passage = ? WHERE id = ?",
+                      (mtime, passage, dossier_id))
+        else:
+            dossier_id = c.execute(
+                "INSERT INTO dossiers(racine, chemin, mtime, passage) "
+                "VALUES (?, ?, ?, ?)",
+                (racine, entree.chemin, mtime, passage)).lastrowid
+        c.executemany(
+            "INSERT INTO fichiers(dossier_id, nom, nom_min) VALUES (?, ?, ?)",
+            ((dossier_id, f.name, f.name.lower()) for f in entree.fichiers))
+        return True
+
+    def _purger(self, racine, passage):
+        """Retire les dossiers non revus lors du dernier parcours complet."""
+        c = self.connexion
+        c.execute(
+            "DELETE FROM fichiers WHERE dossier_id IN ("
+            "SELECT id FROM dossiers WHERE racine = ? AND passage <> ?)",
+            (racine, passage))
+        return c.execute(
+            "DELETE FROM dossiers WHERE racine = ? AND passage <> ?",
+            (racine, passage)).rowcount
+
+    def rechercher(self, motif, racine=None):
+        """
+        Recherche des fichiers par nom, sans tenir compte de la casse.
+
+        - motif contenant * ? ou [ : correspondance glob ("rapport*.pdf") ;
+          un motif "abc*" est une recherche par préfixe servie par l'index
+        - sinon : recherche par sous-chaîne
+        Itère sur les chemins complets au fil de la lecture du curseur.
+        """
+        motif = motif.lower()
+        if any(car in motif for car in "*?["):
+            condition, parametres = "f.nom_min GLOB ?", [motif]
+        elif self.fts and len(motif) >= 3:
+            condition = ("f.id IN (SELECT rowid FROM noms_fts "
+                         "WHERE noms_fts MATCH ?)")
+            parametres = ['"' + motif.replace('"', '""') + '"']
+        else:
+            echappe = (motif.replace("\\", "\\\\").replace("%", "\\%")
+                       .replace("_", "\\_"))
+            condition = "f.nom_min LIKE ? ESCAPE '\\'"
+            parametres = [f"%{echappe}%"]
+
+        requete = ("SELECT d.chemin, f.nom FROM fichiers f "
+                   "JOIN dossiers d ON d.id = f.dossier_id WHERE " + condition)
+        if racine is not None:
+            requete += " AND d.racine = ?"
+            parametres.append(racine)
+        for dossier, nom in self.connexion.execute(requete, parametres):
+            yield os.path.join(dossier, nom)
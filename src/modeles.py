@@ -0,0 +1,437 @@
+"""
+Modèles de tables
+Description: Modèles Qt (QAbstractTableModel) pour les grands tableaux de
+résultats. Les données sont stockées par colonnes (une liste de textes ou un
+tableau array d'entiers/réels par colonne) au lieu d'un QTableWidgetItem par
+cellule. Les lignes sont chargées par pages (canFetchMore/fetchMore) et le tri
+se fait sur les valeurs brutes (octets, horodatages), pas sur le texte affiché.
+"""
+
+import fnmatch
+import os
+import re
+from array import array
+from datetime import datetime
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+TEXTE = "texte"
+ENTIER = "entier"
+REEL = "reel"
+
+# Nombre de lignes exposées à la vue à chaque fetchMore
+TAILLE_PAGE = 2000
+
+
+def formater_taille_mo_go(octets):
+    """Formate une taille en Mo, ou en Go au-delà de 1024 Mo."""
+    taille_mb = octets / (1024**2)
+    if taille_mb >= 1024:
+        return f"{taille_mb / 1024:.2f} Go"
+    return f"{taille_mb:.2f} Mo"
+
+
+def formater_horodatage(horodatage):
+    return datetime.fromtimestamp(horodatage).strftime("%Y-%m-%d %H:%M")
+
+
+class ModeleColonnes(QAbstractTableModel):
+    """
+    Modèle de table générique à stockage par colonnes.
+
+    colonnes : liste de tuples (entête, type, formateur) où type vaut TEXTE,
+    ENTIER ou REEL et formateur est None ou une fonction valeur -> texte
+    appliquée uniquement à l'affichage.
+
+    Comme un QSortFilterProxyModel, le modèle garde une table de
+    correspondance entre lignes affichées et lignes stockées : le tri et le
+    filtrage ne déplacent jamais les données, seulement cette table.
+    """
+
+    def __init__(self, colonnes, parent=None, taille_page=TAILLE_PAGE):
+        super().__init__(parent)
+        self.entetes = [entete for entete, _, _ in colonnes]
+        self.types = [type_colonne for _, type_colonne, _ in colonnes]
+        self.formateurs = [formateur for _, _, formateur in colonnes]
+        self.taille_page = taille_page
+        self._donnees = self._colonnes_vides()
+        self._reinitialiser_ordre()
+
+    def _colonnes_vides(self):
+        colonnes = []
+        for type_colonne in self.types:
+            if type_colonne == ENTIER:
+                colonnes.append(array("q"))
+            elif type_colonne == REEL:
+                colonnes.append(array("d"))
+            else:
+                colonnes.append([])
+        return colonnes
+
+    def _reinitialiser_ordre(self):
+        self._ordre_tri = None   # permutation complète triée (None : ordre naturel)
+        self._masque = None      # bytearray des lignes acceptées (None : toutes)
+        self._ordre = None       # lignes stockées affichées (None : identité)
+        self._nb_visibles = 0
+
+    def _recalculer_ordre(self):
+        if self._masque is None:
+            self._ordre = self._ordre_tri
+            return
+        masque = self._masque
+        base = self._ordre_tri if self._ordre_tri is not None else range(self.total())
+        self._ordre = array("q", [i for i in base if masque[i]])
+
+    def _nb_lignes(self):
+        return self.total() if self._ordre is None else len(self._ordre)
+
+    def _stockage(self, ligne):
+        return ligne if self._ordre is None else self._ordre[ligne]
+
+    # --- API Qt ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._nb_visibles
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entetes)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            valeur = self._donnees[index.column()][self._stockage(index.row())]
+            formateur = self.formateurs[index.column()]
+            return formateur(valeur) if formateur else str(valeur)
+        if role == Qt.UserRole:
+            return self._donnees[index.column()][self._stockage(index.row())]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.entetes[section]
+        return str(section + 1)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._nb_visibles < self._nb_lignes()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        fin = min(self._nb_lignes(), self._nb_visibles + self.taille_page)
+        if fin > self._nb_visibles:
+            self.beginInsertRows(QModelIndex(), self._nb_visibles, fin - 1)
+            self._nb_visibles = fin
+            self.endInsertRows()
+
+    def sort(self, colonne, ordre=Qt.AscendingOrder):
+        """Trie sur les valeurs brutes de la colonne (sans tenir compte de la casse)."""
+        if self.total() < 2:
+            return
+        cle = self._cle_tri(colonne)
+        self.layoutAboutToBeChanged.emit()
+        self._ordre_tri = array("q", sorted(
+            range(self.total()), key=cle, reverse=(ordre == Qt.DescendingOrder)))
+        self._recalculer_ordre()
+        self.layoutChanged.emit()
+
+    def _cle_tri(self, colonne):
+        """Clé de tri d'une colonne : fonction indice stocké -> valeur."""
+        valeurs = self._donnees[colonne]
+        if self.types[colonne] == TEXTE:
+            return lambda i: valeurs[i].lower()
+        return valeurs.__getitem__
+
+    # --- API de l'application ---
+
+    def total(self):
+        """Nombre total de lignes stockées (filtrées ou non)."""
+        return len(self._donnees[0]) if self._donnees else 0
+
+    def vider(self):
+        self.beginResetModel()
+        self._donnees = self._colonnes_vides()
+        self._reinitialiser_ordre()
+        self.endResetModel()
+
+    def definir_lignes(self, lignes):
+        """Remplace tout le contenu par les lignes données (tuples bruts)."""
+        self.beginResetModel()
+        self._donnees = self._colonnes_vides()
+        self._reinitialiser_ordre()
+        self._etendre(lignes)
+        self._nb_visibles = min(self._nb_lignes(), self.taille_page)
+        self.endResetModel()
+
+    def filtrer(self, indices):
+        """
+        N'affiche que les lignes stockées dont l'indice est donné, dans
+        l'ordre de tri courant. indices=None retire le filtre.
+        """
+        self.beginResetModel()
+        if indices is None:
+            self._masque = None
+        else:
+            self._masque = bytearray(self.total())
+            for i in indices:
+                self._masque[i] = 1
+        self._recalculer_ordre()
+        self._nb_visibles = min(self._nb_lignes(), self.taille_page)
+        self.endResetModel()
+
+    def ajouter_lignes(self, lignes, accepter=None):
+        """
+        Ajoute des lignes en fin de table. Elles sont visibles immédiatement
+        tant que la première page n'est pas pleine, ensuite via fetchMore.
+
+        Si un filtre est actif, seules les lignes pour lesquelles
+        accepter(ligne) est vrai sont affichées ; sans accepter, les
+        nouvelles lignes restent masquées jusqu'au prochain filtrer().
+        """
+        lignes = list(lignes)
+        debut = self.total()
+        self._etendre(lignes)
+        nouvelles = range(debut, self.total())
+        if self._ordre_tri is not None:
+            self._ordre_tri.extend(nouvelles)
+        if self._masque is not None:
+            for i, ligne in zip(nouvelles, lignes):
+                visible = accepter is not None and bool(accepter(ligne))
+                self._masque.append(visible)
+                if visible:
+                    self._ordre.append(i)
+        else:
+            self._ordre = self._ordre_tri
+        if self._nb_visibles < self.taille_page:
+            fin = min(self._nb_lignes(), self.taille_page)
+            if fin > self._nb_visibles:
+                self.beginInsertRows(QModelIndex(), self._nb_visibles, fin - 1)
+                self._nb_visibles = fin
+                self.endInsertRows()
+
+    def _etendre(self, lignes):
+        colonnes = self._donnees
+        for ligne in lignes:
+            for colonne, valeur in zip(colonnes, ligne):
+                colonne.append(valeur)
+
+    def retirer_ligne(self, ligne):
+        """Supprime la ligne affichée donnée du stockage."""
+        stockage = self._stockage(ligne)
+        self.beginRemoveRows(QModelIndex(), ligne, ligne)
+        for colonne in self._donnees:
+            del colonne[stockage]
+        if self._masque is not None:
+            del self._masque[stockage]
+        if self._ordre_tri is not None:
+            self._ordre_tri = array("q", [
+                i - (i > stockage) for i in self._ordre_tri if i != stockage])
+        self._recalculer_ordre()
+        self._nb_visibles -= 1
+        self.endRemoveRows()
+
+    def valeur(self, ligne, colonne):
+        """Valeur brute d'une cellule de la ligne affichée donnée."""
+        return self._donnees[colonne][self._stockage(ligne)]
+
+    def texte(self, ligne, colonne):
+        """Texte affiché d'une cellule."""
+        return self.data(self.index(ligne, colonne))
+
+    def lignes(self):
+        """Itère sur toutes les lignes stockées (tuples bruts)."""
+        return zip(*self._donnees)
+
+
+class IndexProgrammes:
+    """
+    Index de recherche des programmes, construit une fois à la réception des
+    résultats : champs en minuscules, chemins normalisés et texte combiné
+    pour le filtre "Tous". Une recherche dont le texte contient la recherche
+    précédente ne réexamine que les résultats précédents.
+    """
+
+    CHAMPS = {"Tous": 3, "Programme": 0, "Version": 1, "Chemin": 2}
+
+    def __init__(self, programmes):
+        noms, versions, chemins, tous = [], [], [], []
+        for nom, version, chemin in programmes:
+            nom = nom.lower()
+            version = version.lower()
+            chemin = os.path.normpath(
+                os.path.abspath(chemin)).lower() if chemin else ""
+            noms.append(nom)
+            versions.append(version)
+            chemins.append(chemin)
+            tous.append(f"{nom}\0{version}\0{chemin}")
+        self._champs = [noms, versions, chemins, tous]
+        self._precedent = None
+
+    def filtrer(self, texte, filtre_type="Tous"):
+        """
+        Retourne les indices des programmes correspondants, ou None si le
+        texte est vide (aucun filtre). Les caractères * ? [ sont interprétés
+        comme avec fnmatch.
+        """
+        texte = texte.lower()
+        if not texte:
+            self._precedent = None
+            return None
+        champ = self.CHAMPS.get(filtre_type, 3)
+        motif = any(car in texte for car in "*?[")
+
+        candidats = range(len(self._champs[0]))
+        precedent = self._precedent
+        if (not motif and precedent and precedent[1] == champ
+                and precedent[0] in texte):
+            candidats = precedent[2]
+
+        if motif:
+            correspond = re.compile(fnmatch.translate(f"*{texte}*")).match
+            if champ == 3:
+                noms, versions, chemins = self._champs[:3]
+                resultat = [i for i in candidats if correspond(noms[i])
+                            or correspond(versions[i]) or correspond(chemins[i])]
+            else:
+                valeurs = self._champs[champ]
+                resultat = [i for i in candidats if correspond(valeurs[i])]
+        else:
+            valeurs = self._champs[champ]
+            resultat = [i for i in candidats if texte in valeurs[i]]
+
+        self._precedent = None if motif else (texte, champ, resultat)
+        return resultat
+
+
+class ModeleProgrammes(ModeleColonnes):
+    """
+    Programmes installés : nom, version, chemin, plus une colonne Statut
+    calculée (état de désinstallation). Les statuts sont indexés par nom de
+    programme pour survivre au rechargement de la liste.
+    """
+
+    COLONNE_STATUT = 3
+
+    def __init__(self, parent=None):
+        super().__init__([
+            ("Programme", TEXTE, None),
+            ("Version", TEXTE, None),
+            ("Chemin", TEXTE, None),
+        ], parent)
+        self.statuts = {}
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entetes) + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and index.column() == self.COLONNE_STATUT:
+            if role in (Qt.DisplayRole, Qt.ToolTipRole, Qt.UserRole):
+                nom = self._donnees[0][self._stockage(index.row())]
+                return self.statuts.get(nom, "")
+            return None
+        return super().data(index, role)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if (role == Qt.DisplayRole and orientation == Qt.Horizontal
+                and section == self.COLONNE_STATUT):
+            return "Statut"
+        return super().headerData(section, orientation, role)
+
+    def _cle_tri(self, colonne):
+        if colonne == self.COLONNE_STATUT:
+            noms = self._donnees[0]
+            return lambda i: self.statuts.get(noms[i], "")
+        return super()._cle_tri(colonne)
+
+    def actualiser(self, programmes, delta):
+        """
+        Met la table à jour avec l'inventaire complet. La table contient déjà
+        la liste en cache (ou les lots reçus) : si delta (DeltaProgrammes) ne
+        contient que des ajouts, ils sont ajoutés en fin de table, sinon la
+        table est remplacée. Retourne l'IndexProgrammes des lignes stockées,
+        dans leur ordre de stockage : celui des indices de filtrer().
+        """
+        if (not delta.suppressions and not delta.mises_a_jour
+                and self.total() + len(delta.ajouts) == len(programmes)):
+            self.ajouter_lignes(delta.ajouts)
+        else:
+            self.definir_lignes(programmes)
+        return IndexProgrammes(self.lignes())
+
+    def definir_statut(self, nom, statut):
+        """Statut de désinstallation d'un programme, affiché sur ses lignes."""
+        self.statuts[nom] = statut
+        noms = self._donnees[0]
+        for ligne in range(self._nb_visibles):
+            if noms[self._stockage(ligne)] == nom:
+                cellule = self.index(ligne, self.COLONNE_STATUT)
+                self.dataChanged.emit(cellule, cellule)
+
+    def effacer_statuts(self):
+        if self.statuts:
+            self.statuts.clear()
+            self.dataChanged.emit(
+                self.index(0, self.COLONNE_STATUT),
+                self.index(max(0, self._nb_visibles - 1), self.COLONNE_STATUT))
+
+
+class ModeleDossiers(ModeleColonnes):
+    """Dossiers vides : chemin, taille formatée."""
+
+    def __init__(self, parent=None):
+        super().__init__([
+            ("Dossier", TEXTE, None),
+            ("Taille", TEXTE, None),
+        ], parent)
+
+
+class ModeleGrosFichiers(ModeleColonnes):
+    """Gros fichiers : nom, chemin, taille en octets, date de modification."""
+
+    def __init__(self, parent=None):
+        super().__init__([
+            ("Fichier", TEXTE, None),
+            ("Chemin", TEXTE, None),
+            ("Taille", ENTIER, formater_taille_mo_go),
+            ("Date modification", REEL, formater_horodatage),
+        ], parent)
+
+    def ajouter_fichiers(self, fichiers):
+        """Ajoute des fichiers au format des résultats de DiskAnalysisThread."""
+        self.ajouter_lignes(
+            (f['nom'], f['chemin'], f['taille'], f['date_modif'].timestamp())
+            for f in fichiers)
+
+
+class ModeleArbre(ModeleColonnes):
+    """
+    Exploration d'un ArbreDossiers : sous-dossiers d'un nœud avec taille
+    totale, nombre de fichiers et plus gros sous-dossier. La dernière
+    colonne (numéro de nœud) sert à descendre dans l'arbre et est masquée.
+    """
+
+    COLONNE_NOEUD = 4
+
+    def __init__(self, parent=None):
+        super().__init__([
+            ("Dossier", TEXTE, None),
+            ("Taille", ENTIER, formater_taille_mo_go),
+            ("Fichiers", ENTIER, None),
+            ("Plus gros sous-dossier", TEXTE, None),
+            ("Nœud", ENTIER, None),
+        ], parent)
+        self.arbre = None
+        self.noeud = 0
+
+    def afficher_noeud(self, arbre, noeud=0):
+        """Affiche les enfants du nœud donné, du plus lourd au plus léger."""
+        self.arbre = arbre
+        self.noeud = noeud
+        plus_gros = arbre.plus_gros_enfant
+        self.definir_lignes(
+            (arbre.nom(enfant), arbre.octets[enfant], arbre.fichiers[enfant],
+             arbre.nom(plus_gros[enfant]) if plus_gros[enfant] >= 0 else "",
+             enfant)
+            for enfant in arbre.liste_enfants(noeud))
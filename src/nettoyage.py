@@ -0,0 +1,641 @@
+"""
+Nettoyage système
+Description: Suppression des fichiers temporaires, du Prefetch, de la
+corbeille et des caches navigateurs, sans dépendance à Qt. Utilisé par
+CleanupThread et par le mode ligne de commande.
+
+Les fichiers sont supprimés par lots dans un pool borné de threads, avec
+leur taille issue de os.scandir. Les résultats sont des compteurs par
+catégorie ; seul un échantillon limité de fichiers supprimés est conservé.
+"""
+
+import logging
+import os
+import platform
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from parcours import ParcoursParallele
+from progression import SuiviProgression
+from systeme import profils_utilisateurs
+
+# Options de nettoyage, dans l'ordre d'exécution
+OPTIONS_NETTOYAGE = [
+    'temp_windows', 'temp_user', 'prefetch', 'recycle_bin', 'browser_cache'
+]
+
+LIBELLES_OPTIONS = {
+    'temp_windows': "Temp Windows",
+    'temp_user': "Temp utilisateur",
+    'prefetch': "Prefetch",
+    'recycle_bin': "Corbeille",
+    'browser_cache': "Cache navigateurs",
+}
+
+NB_WORKERS_SUPPRESSION = min(8, os.cpu_count() or 4)
+
+# Fichiers supprimés par tâche du pool
+TAILLE_LOT_SUPPRESSION = 256
+
+# Nombre de fichiers supprimés cités dans les détails
+NB_MAX_DETAILS = 100
+
+# Dossiers de cache d'un profil Firefox ; le reste du profil (favoris,
+# historique, mots de passe, extensions) n'est jamais touché
+DOSSIERS_CACHE_FIREFOX = ('cache2', 'startupCache')
+
+# Racines traitées simultanément, au total et par périphérique
+NB_RACINES_PARALLELES = 4
+LIMITE_PAR_PERIPHERIQUE = 2
+
+
+def _ignorer(*args):
+    pass
+
+
+def _supprimer_lot(lot):
+    """
+    Supprime un lot de (chemin, taille) ; retourne (chemins supprimés,
+    octets, échecs).
+    """
+    supprimes = []
+    octets = 0
+    echecs = []
+    for chemin, taille in lot:
+        try:
+            os.remove(chemin)
+            supprimes.append(chemin)
+            octets += taille
+        except FileNotFoundError:
+            # Déjà supprimé depuis l'estimation
+            pass
+        except OSError as e:
+            echecs.append((chemin, e))
+    return supprimes, octets, echecs
+
+
+def _caches_firefox(dossier_profils):
+    """Dossiers cache2 et startupCache de chaque profil Firefox."""
+    try:
+        with os.scandir(dossier_profils) as entrees:
+            profils = sorted(e.path for e in entrees if e.is_dir(follow_symlinks=False))
+    except OSError:
+        return []
+    return [os.path.join(profil, dossier)
+            for profil in profils for dossier in DOSSIERS_CACHE_FIREFOX]
+
+
+def peripherique(chemin):
+    """Identifiant du périphérique portant chemin (lecteur à défaut)."""
+    try:
+        return os.stat(chemin).st_dev
+    except OSError:
+        return os.path.splitdrive(os.path.abspath(chemin))[0].lower()
+
+
+def executer_par_peripherique(taches, fonction, nb_max=NB_RACINES_PARALLELES,
+                              limite=LIMITE_PAR_PERIPHERIQUE, doit_continuer=None):
+    """
+    Exécute fonction(tache) pour chaque (périphérique, tache) sur un pool de
+    nb_max threads, avec au plus `limite` tâches à la fois par périphérique :
+    deux disques travaillent en parallèle sans que l'un soit saturé.
+    Génère les (tache, résultat) dans l'ordre de fin.
+    """
+    doit_continuer = doit_continuer or (lambda: True)
+    en_attente = deque(taches)
+    actives = {}
+    par_peripherique = {}
+    with ThreadPoolExecutor(nb_max, thread_name_prefix="nettoyage") as pool:
+        while en_attente or actives:
+            for _ in range(len(en_attente)):
+                if len(actives) >= nb_max or not doit_continuer():
+                    break
+                cle, tache = en_attente.popleft()
+                if par_peripherique.get(cle, 0) >= limite:
+                    en_attente.append((cle, tache))
+                    continue
+                par_peripherique[cle] = par_peripherique.get(cle, 0) + 1
+                actives[pool.submit(fonction, tache)] = (cle, tache)
+            if not actives:
+                # Arrêt demandé : les tâches en attente sont abandonnées
+                break
+            finis, _ = wait(actives, return_when=FIRST_COMPLETED)
+            for futur in finis:
+                cle, tache = actives.pop(futur)
+                par_peripherique[cle] -= 1
+                yield tache, futur.result()
+
+
+def compteurs_vides():
+    return {'fichiers': 0, 'octets': 0, 'erreurs': 0, 'dossiers': 0, 'duree': 0.0}
+
+
+class InventaireRacine:
+    """
+    Contenu d'une racine à vider, relevé par l'estimation : fichiers
+    (chemin, taille) et sous-dossiers dans l'ordre de découverte.
+    """
+
+    __slots__ = ('racine', 'fichiers', 'sous_dossiers', 'octets', 'erreurs')
+
+    def __init__(self, racine):
+        self.racine = racine
+        self.fichiers = []
+        self.sous_dossiers = []
+        self.octets = 0
+        self.erreurs = 0
+
+
+class MoteurSuppression:
+    """
+    Supprime le contenu d'arborescences : les fichiers par lots dans un
+    pool borné de threads (au plus nb_workers * 2 lots en attente), puis
+    les sous-dossiers vidés, du plus profond au moins profond. La racine
+    elle-même est conservée.
+
+    vider() parcourt et supprime au fil de l'eau ; inventorier() relève le
+    contenu sans rien supprimer, et supprimer() efface ensuite exactement
+    ce qui a été relevé, sans second parcours.
+
+    En mode simulation, fichiers et tailles sont comptés sans suppression.
+    avancement(fichiers, octets) est appelé après chaque lot traité, ou
+    relevé par inventorier() ; un même moteur peut vider plusieurs racines
+    depuis plusieurs threads.
+    """
+
+    def __init__(self, nb_workers=NB_WORKERS_SUPPRESSION, simulation=False,
+                 doit_continuer=None, taille_lot=TAILLE_LOT_SUPPRESSION,
+                 nb_max_details=NB_MAX_DETAILS, avancement=None):
+        self.nb_workers = max(1, nb_workers)
+        self.simulation = simulation
+        self.doit_continuer = doit_continuer or (lambda: True)
+        self.taille_lot = taille_lot
+        self.nb_max_details = nb_max_details
+        self.avancement = avancement or _ignorer
+        self.details = []
+        self.details_omis = 0
+        self._verrou_details = threading.Lock()
+
+    def noter(self, detail):
+        """Ajoute un détail, dans la limite de nb_max_details."""
+        with self._verrou_details:
+            if len(self.details) < self.nb_max_details:
+                self.details.append(detail)
+            else:
+                self.details_omis += 1
+
+    def _parcourir(self, racine, sous_dossiers, compteurs):
+        """Génère les (chemin, taille) des fichiers sous racine."""
+        with ParcoursParallele(racine, doit_continuer=self.doit_continuer) as parcours:
+            for entree in parcours:
+                if entree.parent is not None:
+                    sous_dossiers.append(entree.chemin)
+                for fichier in entree.fichiers:
+                    try:
+                        taille = fichier.stat(follow_symlinks=False).st_size
+                    except OSError as e:
+                        compteurs['erreurs'] += 1
+                        logging.warning(f"Impossible de lire {fichier.path}: {e}")
+                        continue
+                    yield fichier.path, taille
+
+    def _supprimer_fichiers(self, fichiers, compteurs):
+        """Supprime (ou compte en simulation) les (chemin, taille) donnés."""
+        en_vol = deque()
+
+        def attendre_lot():
+            futur, nb_lot, octets_lot = en_vol.popleft()
+            supprimes, octets, echecs = futur.result()
+            compteurs['fichiers'] += len(supprimes)
+            compteurs['octets'] += octets
+            compteurs['erreurs'] += len(echecs)
+            # Seuls les fichiers réellement supprimés sont cités
+            for chemin in supprimes:
+                self.noter(f"Supprimé: {os.path.basename(chemin)}")
+            for chemin, e in echecs:
+                logging.warning(f"Impossible de supprimer {chemin}: {e}")
+            self.avancement(nb_lot, octets_lot)
+
+        with ThreadPoolExecutor(self.nb_workers,
+                                thread_name_prefix="suppression") as pool:
+            lot = []
+            octets_lot = 0
+            for chemin, taille in fichiers:
+                if not self.doit_continuer():
+                    break
+                if self.simulation:
+                    self.noter(f"À supprimer: {os.path.basename(chemin)}")
+                lot.append((chemin, taille))
+                octets_lot += taille
+                if len(lot) < self.taille_lot:
+                    continue
+                if self.simulation:
+                    compteurs['fichiers'] += len(lot)
+                    compteurs['octets'] += octets_lot
+                    self.avancement(len(lot), octets_lot)
+                else:
+                    en_vol.append((pool.submit(_supprimer_lot, lot), len(lot), octets_lot))
+                    if len(en_vol) >= self.nb_workers * 2:
+                        attendre_lot()
+                lot = []
+                octets_lot = 0
+            if lot and self.simulation:
+                compteurs['fichiers'] += len(lot)
+                compteurs['octets'] += octets_lot
+                self.avancement(len(lot), octets_lot)
+            elif lot:
+                en_vol.append((pool.submit(_supprimer_lot, lot), len(lot), octets_lot))
+            while en_vol:
+                attendre_lot()
+
+    def _supprimer_dossiers(self, sous_dossiers, compteurs):
+        if self.simulation or not self.doit_continuer():
+            return
+        # Les sous-dossiers sont listés avant leurs enfants : en ordre
+        # inverse, chaque dossier est retiré après ses sous-dossiers
+        for dossier in reversed(sous_dossiers):
+            try:
+                os.rmdir(dossier)
+                compteurs['dossiers'] += 1
+            except OSError:
+                # Fichier verrouillé encore présent : dossier conservé
+                pass
+
+    def vider(self, racine, compteurs):
+        """Supprime le contenu de racine en mettant à jour compteurs."""
+        if not os.path.exists(racine):
+            return
+        sous_dossiers = []
+        self._supprimer_fichiers(
+            self._parcourir(racine, sous_dossiers, compteurs), compteurs)
+        self._supprimer_dossiers(sous_dossiers, compteurs)
+
+    def inventorier(self, racine):
+        """Relève le contenu de racine ; None si elle n'existe pas."""
+        if not racine or not os.path.exists(racine):
+            return None
+        inventaire = InventaireRacine(racine)
+        compteurs = compteurs_vides()
+        nb_lot = 0
+        octets_lot = 0
+        for chemin, taille in self._parcourir(
+                racine, inventaire.sous_dossiers, compteurs):
+            inventaire.fichiers.append((chemin, taille))
+            inventaire.octets += taille
+            nb_lot += 1
+            octets_lot += taille
+            if nb_lot == self.taille_lot:
+                self.avancement(nb_lot, octets_lot)
+                nb_lot = 0
+                octets_lot = 0
+        if nb_lot:
+            self.avancement(nb_lot, octets_lot)
+        inventaire.erreurs = compteurs['erreurs']
+        return inventaire
+
+    def supprimer(self, inventaire, compteurs):
+        """Supprime exactement les fichiers et dossiers d'un inventaire."""
+        compteurs['erreurs'] += inventaire.erreurs
+        self._supprimer_fichiers(inventaire.fichiers, compteurs)
+        self._supprimer_dossiers(inventaire.sous_dossiers, compteurs)
+
+
+def _estimer_corbeille_windows():
+    """Nombre d'éléments et taille de la corbeille Windows (tous lecteurs)."""
+    import ctypes
+
+    class SHQUERYRBINFO(ctypes.Structure):
+        # shellapi.h : alignement 1 en 32 bits, 8 en 64 bits
+        _pack_ = 1 if ctypes.sizeof(ctypes.c_void_p) == 4 else 8
+        _fields_ = [("cbSize", ctypes.c_ulong),
+                    ("i64Size", ctypes.c_longlong),
+                    ("i64NumItems", ctypes.c_longlong)]
+
+    info = SHQUERYRBINFO()
+    info.cbSize = ctypes.sizeof(info)
+    if ctypes.windll.shell32.SHQueryRecycleBinW(None, ctypes.byref(info)) != 0:
+        raise OSError("SHQueryRecycleBinW a échoué")
+    return info.i64NumItems, info.i64Size
+
+
+class Nettoyage:
+    """
+    Nettoyage selon un dict d'options {option: bool}.
+    En mode simulation, les fichiers sont comptés mais rien n'est supprimé.
+
+    estimer() relève d'abord le contenu de chaque catégorie sans rien
+    supprimer ; executer() supprime alors exactement ce relevé (les
+    fichiers apparus entre-temps sont conservés). Sans relevé, executer()
+    parcourt et vide chaque racine au fil de l'eau. Les racines sont
+    traitées en parallèle, limitées par périphérique, et la progression
+    suit les fichiers et octets traités.
+
+    Avec tous_profils, les dossiers Temp et caches navigateurs de chaque
+    profil utilisateur local sont nettoyés, pas seulement le profil courant.
+    """
+
+    def __init__(self, options, simulation=False, nb_max_details=NB_MAX_DETAILS,
+                 tous_profils=False):
+        self.options = options
+        self.simulation = simulation
+        self.nb_max_details = nb_max_details
+        self.tous_profils = tous_profils
+        self.instantane = None
+        self.estimation = None
+        self._is_running = True
+
+    def _profils(self):
+        if self.tous_profils:
+            return profils_utilisateurs()
+        return [os.environ.get('USERPROFILE', '')]
+
+    def _racines(self, option):
+        """Dossiers dont le contenu est supprimé pour une option."""
+        if option == 'temp_windows':
+            return [os.environ.get('TEMP', ''), os.environ.get('TMP', '')]
+        if option == 'temp_user':
+            return [os.path.join(profil, 'AppData', 'Local', 'Temp')
+                    for profil in self._profils() if profil]
+        if option == 'prefetch':
+            return [r'C:\Windows\Prefetch']
+        if option == 'recycle_bin':
+            if platform.system() == "Windows":
+                # Vidée par l'API du shell, pas dossier par dossier
+                return []
+            return [os.path.expanduser('~/.local/share/Trash/files')]
+        if option == 'browser_cache':
+            racines = []
+            for profil in self._profils():
+                if not profil:
+                    continue
+                local = os.path.join(profil, 'AppData', 'Local')
+                racines += [
+                    os.path.join(local, 'Google', 'Chrome', 'User Data',
+                                 'Default', 'Cache'),
+                    os.path.join(local, 'Microsoft', 'Edge', 'User Data',
+                                 'Default', 'Cache'),
+                ]
+                racines += _caches_firefox(
+                    os.path.join(local, 'Mozilla', 'Firefox', 'Profiles'))
+            return racines
+        return []
+
+    def _plan(self):
+        """
+        Racines par option cochée. Un dossier n'est attribué qu'à la
+        première option qui le cite (TEMP est souvent le Temp utilisateur).
+        """
+        plan = {}
+        vues = set()
+        for option in OPTIONS_NETTOYAGE:
+            if not self.options.get(option):
+                continue
+            plan[option] = []
+            for racine in self._racines(option):
+                if not racine:
+                    continue
+                cle = os.path.normcase(os.path.abspath(racine))
+                if cle not in vues:
+                    vues.add(cle)
+                    plan[option].append(racine)
+        return plan
+
+    def _corbeille_windows(self, plan):
+        return 'recycle_bin' in plan and platform.system() == "Windows"
+
+    def estimer(self, progression=None):
+        """
+        Relève en parallèle le contenu de chaque catégorie sans rien
+        supprimer ; progression(valeur, message). Le relevé est conservé
+        pour executer(). Retourne l'estimation : compteurs par catégorie
+        ('categories'), totaux et durée.
+
+        La progression avance à chaque lot de fichiers relevé, rapporté au
+        nombre de fichiers de la dernière estimation complète des mêmes
+        options ; à défaut, au nombre de racines terminées.
+        """
+        progression = progression or _ignorer
+        plan = self._plan()
+        taches = [(peripherique(racine), (option, racine))
+                  for option, racines in plan.items() for racine in racines
+                  if os.path.exists(racine)]
+        verrou = threading.Lock()
+        suivi = SuiviProgression(cle=f"estimation_nettoyage:{','.join(plan)}")
+        releve = {'racines': 0}
+
+        def signaler(message):
+            fraction = max(releve['racines'] / max(1, len(taches)), suivi.fraction())
+            progression(min(89, int(fraction * 90)), message)
+
+        def avancement(fichiers, octets):
+            with verrou:
+                suivi.avancer(fichiers)
+                signaler(f"Estimation: {suivi.fait} fichiers relevés...")
+
+        moteur = MoteurSuppression(doit_continuer=lambda: self._is_running,
+                                   avancement=avancement)
+        instantane = {option: [] for option in plan}
+        estimation = {
+            'categories': {option: compteurs_vides() for option in plan},
+            'fichiers': 0,
+            'octets': 0,
+            'duree': 0.0
+        }
+
+        def inventorier(tache):
+            option, racine = tache
+            try:
+                return moteur.inventorier(racine)
+            except Exception as e:
+                logging.error(f"Erreur estimation {racine}: {e}")
+                return None
+
+        debut = time.perf_counter()
+        progression(0, "Estimation de l'espace récupérable...")
+        try:
+            for i, ((option, racine), inventaire) in enumerate(executer_par_peripherique(
+                    taches, inventorier, doit_continuer=lambda: self._is_running), 1):
+                with verrou:
+                    releve['racines'] = i
+                    signaler(f"Estimation: {LIBELLES_OPTIONS[option]}...")
+                compteurs = estimation['categories'][option]
+                if inventaire is None:
+                    compteurs['erreurs'] += 1
+                    continue
+                instantane[option].append(inventaire)
+                compteurs['fichiers'] += len(inventaire.fichiers)
+                compteurs['octets'] += inventaire.octets
+                compteurs['dossiers'] += len(inventaire.sous_dossiers)
+                compteurs['erreurs'] += inventaire.erreurs
+
+            if self._corbeille_windows(plan):
+                compteurs = estimation['categories']['recycle_bin']
+                try:
+                    compteurs['fichiers'], compteurs['octets'] = _estimer_corbeille_windows()
+                except Exception as e:
+                    logging.error(f"Erreur estimation corbeille: {e}")
+                    compteurs['erreurs'] += 1
+
+        except Exception as e:
+            logging.error(f"Erreur estimation nettoyage: {e}")
+        finally:
+            for compteurs in estimation['categories'].values():
+                estimation['fichiers'] += compteurs['fichiers']
+                estimation['octets'] += compteurs['octets']
+            estimation['duree'] = time.perf_counter() - debut
+            for compteurs in estimation['categories'].values():
+                compteurs['duree'] = estimation['duree']
+            suivi.terminer(complet=self._is_running)
+            logging.info(
+                f"Estimation nettoyage: {estimation['fichiers']} fichiers, "
+                f"{estimation['octets']} octets en {estimation['duree']:.1f} s")
+            progression(100, "Estimation terminée")
+
+        self.instantane = instantane if self._is_running else None
+        self.estimation = estimation
+        return estimation
+
+    def executer(self, progression=None):
+        """
+        Exécute le nettoyage selon les options ; progression(valeur, message).
+        Supprime exactement le relevé d'estimer() ; sans relevé, parcourt et
+        vide chaque racine au fil de l'eau (MoteurSuppression.vider), la
+        progression étant alors rapportée au nombre de fichiers du dernier
+        nettoyage complet des mêmes options.
+        Retourne le dict des résultats : totaux, compteurs par catégorie
+        ('categories'), échantillon de détails et débit en fichiers/s.
+        """
+        progression = progression or _ignorer
+        debut = time.perf_counter()
+        plan = self._plan()
+        instantane = self.instantane
+        if instantane is None:
+            # Pas de relevé : une estimation antérieure ne décrit plus les racines
+            self.estimation = None
+            taches = [(peripherique(racine), (option, racine))
+                      for option, racines in plan.items() for racine in racines
+                      if os.path.exists(racine)]
+            suivi = SuiviProgression(cle=f"nettoyage:{','.join(plan)}")
+        else:
+            taches = [(peripherique(inventaire.racine), (option, inventaire))
+                      for option, inventaires in instantane.items()
+                      for inventaire in inventaires]
+            suivi = None
+        if self._corbeille_windows(plan):
+            taches.append(('corbeille', ('recycle_bin', None)))
+
+        estimation = self.estimation
+        verrou = threading.Lock()
+        avance = {'fichiers': 0, 'octets': 0, 'valeur': 0}
+
+        def avancement(fichiers, octets):
+            with verrou:
+                avance['fichiers'] += fichiers
+                avance['octets'] += octets
+                if suivi is not None:
+                    suivi.avancer(fichiers)
+                    fraction = suivi.fraction()
+                    message = f"Nettoyage: {avance['fichiers']} fichiers..."
+                else:
+                    # Progression pondérée : moitié fichiers, moitié octets traités
+                    fraction = avance['fichiers'] / max(estimation['fichiers'], 1)
+                    if estimation['octets']:
+                        fraction = (fraction + avance['octets'] / estimation['octets']) / 2
+                    message = (f"Nettoyage: {avance['fichiers']}/"
+                               f"{estimation['fichiers']} fichiers...")
+                valeur = int(min(fraction, 1.0) * 99)
+                if valeur == avance['valeur']:
+                    return
+                avance['valeur'] = valeur
+            progression(valeur, message)
+
+        moteur = MoteurSuppression(
+            nb_workers=max(2, NB_WORKERS_SUPPRESSION // max(1, min(
+                len(taches), NB_RACINES_PARALLELES))),
+            simulation=self.simulation, doit_continuer=lambda: self._is_running,
+            nb_max_details=self.nb_max_details, avancement=avancement)
+        resultats = {
+            'fichiers_supprimes': 0,
+            'espace_libere': 0,
+            'erreurs': 0,
+            'details': moteur.details,
+            'details_omis': 0,
+            'categories': {option: compteurs_vides() for option in plan},
+            'duree': 0.0,
+            'debit': 0.0
+        }
+
+        def nettoyer(tache):
+            # Inventaire relevé, racine à vider (sans relevé) ou None (corbeille Windows)
+            option, contenu = tache
+            compteurs = compteurs_vides()
+            depart = time.perf_counter()
+            try:
+                if contenu is None:
+                    self._vider_corbeille_windows(moteur, compteurs)
+                elif isinstance(contenu, InventaireRacine):
+                    moteur.supprimer(contenu, compteurs)
+                else:
+                    moteur.vider(contenu, compteurs)
+            except Exception as e:
+                logging.error(f"Erreur nettoyage {LIBELLES_OPTIONS[option]}: {e}")
+                compteurs['erreurs'] += 1
+            return compteurs, depart, time.perf_counter()
+
+        periodes = {}
+        progression(0, "Nettoyage en cours...")
+        try:
+            for (option, _), (compteurs, depart, fin) in executer_par_peripherique(
+                    taches, nettoyer, doit_continuer=lambda: self._is_running):
+                categorie = resultats['categories'][option]
+                for cle in ('fichiers', 'octets', 'erreurs', 'dossiers'):
+                    categorie[cle] += compteurs[cle]
+                premier, dernier = periodes.get(option, (depart, fin))
+                periodes[option] = (min(premier, depart), max(dernier, fin))
+
+        except Exception as e:
+            logging.error(f"Erreur nettoyage: {e}")
+            resultats['erreurs'] += 1
+        finally:
+            for option, (premier, dernier) in periodes.items():
+                resultats['categories'][option]['duree'] = dernier - premier
+            for compteurs in resultats['categories'].values():
+                resultats['fichiers_supprimes'] += compteurs['fichiers']
+                resultats['espace_libere'] += compteurs['octets']
+                resultats['erreurs'] += compteurs['erreurs']
+            resultats['details_omis'] = moteur.details_omis
+            if suivi is not None:
+                suivi.terminer(complet=self._is_running)
+            resultats['duree'] = time.perf_counter() - debut
+            resultats['debit'] = (resultats['fichiers_supprimes']
+                                  / max(resultats['duree'], 1e-6))
+            logging.info(
+                f"Nettoyage: {resultats['fichiers_supprimes']} fichiers en "
+                f"{resultats['duree']:.1f} s ({resultats['debit']:.0f} fichiers/s)")
+            progression(100, "Nettoyage terminé")
+        # Un relevé ne sert qu'une fois
+        self.instantane = None
+        return resultats
+
+    def _vider_corbeille_windows(self, moteur, compteurs):
+        """Vide la corbeille Windows."""
+        if self.estimation is not None:
+            estimee = self.estimation['categories'].get('recycle_bin', compteurs_vides())
+        else:
+            estimee = compteurs_vides()
+            estimee['fichiers'], estimee['octets'] = _estimer_corbeille_windows()
+        if self.simulation:
+            moteur.noter("Corbeille non vidée (simulation)")
+        else:
+            import winshell
+            winshell.recycle_bin().empty(confirm=False, show_progress=False, sound=False)
+            compteurs['fichiers'] += estimee['fichiers']
+            compteurs['octets'] += estimee['octets']
+            moteur.noter("Corbeille vidée")
+        moteur.avancement(estimee['fichiers'], estimee['octets'])
+
+    def stop(self):
+        """Arrête la tâche proprement."""
+        self._is_running = False
@@ -0,0 +1,239 @@
+"""
+Paquets Linux installés
+Description: Inventaire des paquets sans lancer dpkg-query : lecture directe
+du fichier d'état de dpkg (mmap, une seule passe d'expression régulière),
+des applications flatpak et snap installées, et de la base rpm (via rpm -qa)
+quand elle est présente.
+"""
+
+import glob
+import logging
+import mmap
+import os
+import re
+import shutil
+from collections import namedtuple
+
+from systeme import lire_csv_processus
+
+FICHIER_ETAT_DPKG = "/var/lib/dpkg/status"
+DOSSIER_INFO_DPKG = "/var/lib/dpkg/info"
+DOSSIERS_RPM = ["/var/lib/rpm", "/usr/lib/sysimage/rpm"]
+DOSSIERS_FLATPAK = ["/var/lib/flatpak/app", "~/.local/share/flatpak/app"]
+DOSSIER_SNAP = "/snap"
+
+# Format des PaquetLinux produits, inclus dans la signature : un changement
+# de format invalide l'inventaire en cache
+VERSION_INVENTAIRE = 2
+
+PaquetLinux = namedtuple('PaquetLinux', [
+    'nom', 'version', 'chemin', 'architecture', 'taille', 'statut', 'source'
+])
+
+# États dpkg d'un paquet en place et configuré (dernier mot de Status) ;
+# config-files, half-installed, unpacked, not-installed... sont exclus
+ETATS_INSTALLES_DPKG = {"installed", "triggers-pending", "triggers-awaited"}
+
+# Valeur d'une étiquette absente dans le format de requête de rpm
+ABSENT_RPM = "(none)"
+
+# Champs utiles d'un paragraphe du fichier d'état ; les lignes de
+# continuation (Description...) commencent par une espace et sont ignorées
+CHAMPS_DPKG = re.compile(
+    rb"^(Package|Status|Version|Architecture|Installed-Size): *([^\n]*)",
+    re.M)
+
+
+def _ignorer(*args):
+    pass
+
+
+def _paquet_dpkg(champs):
+    statut = champs.get(b"Status", b"").decode("utf-8", "replace")
+    # "install ok installed", "hold ok installed", "install ok triggers-pending"...
+    if statut.rpartition(" ")[2] not in ETATS_INSTALLES_DPKG:
+        return None
+    nom = champs[b"Package"].decode("utf-8", "replace")
+    try:
+        taille = int(champs.get(b"Installed-Size", b"0")) * 1024
+    except ValueError:
+        taille = 0
+    return PaquetLinux(
+        nom=nom,
+        version=champs.get(b"Version", b"").decode("utf-8", "replace"),
+        # Fichiers répartis dans tout le système : pas de dossier
+        # d'installation, chemin vide comme pour rpm
+        chemin="",
+        architecture=champs.get(b"Architecture", b"").decode("utf-8", "replace"),
+        taille=taille,
+        statut=statut,
+        source="dpkg")
+
+
+def lire_statut_dpkg(chemin=FICHIER_ETAT_DPKG, progression=None):
+    """
+    Génère les PaquetLinux installés décrits par un fichier d'état dpkg ;
+    progression(fraction) suit la position dans le fichier.
+    """
+    progression = progression or _ignorer
+    with open(chemin, "rb") as f:
+        taille = os.fstat(f.fileno()).st_size
+        if not taille:
+            return
+        donnees = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        correspondances = CHAMPS_DPKG.finditer(donnees)
+        try:
+            courant = None
+            nb = 0
+            for correspondance in correspondances:
+                cle = correspondance.group(1)
+                if cle == b"Package":
+                    # Package ouvre chaque paragraphe
+                    if courant is not None:
+                        paquet = _paquet_dpkg(courant)
+                        if paquet is not None:
+                            yield paquet
+                    courant = {}
+                    nb += 1
+                    if nb % 500 == 0:
+                        progression(correspondance.start() / taille)
+                if courant is not None:
+                    courant[cle] = correspondance.group(2)
+            if courant is not None:
+                paquet = _paquet_dpkg(courant)
+                if paquet is not None:
+                    yield paquet
+        finally:
+            # L'itérateur retient le tampon : à libérer avant la fermeture
+            del correspondances
+            donnees.close()
+
+
+def _valeur_rpm(valeur):
+    return "" if valeur == ABSENT_RPM else valeur
+
+
+def lire_rpm(doit_continuer=None):
+    """
+    Génère les PaquetLinux de la base rpm (un processus rpm -qa). Les clés
+    GPG importées (pseudo-paquets gpg-pubkey) ne sont pas des paquets.
+    """
+    for ligne in lire_csv_processus(
+            ["rpm", "-qa", "--qf",
+             "%{NAME}\\t%{VERSION}\\t%{RELEASE}\\t%{ARCH}\\t%{SIZE}\\n"],
+            champs=('nom', 'version', 'release', 'architecture', 'taille'),
+            delimiteur="\t", doit_continuer=doit_continuer):
+        if not ligne.nom or ligne.nom == "gpg-pubkey":
+            continue
+        version = "-".join(v for v in (_valeur_rpm(ligne.version),
+                                       _valeur_rpm(ligne.release)) if v)
+        yield PaquetLinux(
+            nom=ligne.nom, version=version, chemin="",
+            architecture=_valeur_rpm(ligne.architecture),
+            taille=int(ligne.taille) if ligne.taille.isdigit() else 0,
+            statut="installed", source="rpm")
+
+
+def lire_flatpak():
+    """
+    Génère les applications flatpak (système et utilisateur) :
+    app/<id>/<architecture>/<branche>/active.
+    """
+    for base in DOSSIERS_FLATPAK:
+        base = os.path.expanduser(base)
+        if not os.path.isdir(base):
+            continue
+        for application in sorted(os.listdir(base)):
+            dossier_app = os.path.join(base, application)
+            if not os.path.isdir(dossier_app):
+                continue
+            for architecture in os.listdir(dossier_app):
+                if architecture == "current":
+                    # Lien vers <architecture>/<branche> par défaut
+                    continue
+                dossier_arch = os.path.join(dossier_app, architecture)
+                if not os.path.isdir(dossier_arch):
+                    continue
+                for branche in os.listdir(dossier_arch):
+                    actif = os.path.join(dossier_arch, branche, "active")
+                    if os.path.isdir(actif):
+                        yield PaquetLinux(
+                            nom=application, version=branche, chemin=actif,
+                            architecture=architecture, taille=0,
+                            statut="installed", source="flatpak")
+
+
+def lire_snap(dossier=DOSSIER_SNAP):
+    """Génère les snaps installés, version lue dans meta/snap.yaml."""
+    if not os.path.isdir(dossier):
+        return
+    for nom in sorted(os.listdir(dossier)):
+        courant = os.path.join(dossier, nom, "current")
+        if nom == "bin" or not os.path.isdir(courant):
+            continue
+        version = ""
+        architecture = ""
+        try:
+            with open(os.path.join(courant, "meta", "snap.yaml"),
+                      encoding="utf-8", errors="replace") as f:
+                for ligne in f:
+                    if ligne.startswith("version:"):
+                        version = ligne.split(":", 1)[1].strip().strip("'\"")
+                    elif ligne.startswith("architectures:"):
+                        architecture = next(f, "").strip(" -\n")
+        except OSError:
+            pass
+        yield PaquetLinux(
+            nom=nom, version=version, chemin=courant,
+            architecture=architecture, taille=0, statut="installed",
+            source="snap")
+
+
+def paquet_dpkg(nom, dossier=DOSSIER_INFO_DPKG):
+    """
+    Indique si dpkg a installé le paquet nom : liste de ses fichiers
+    <nom>.list, ou <nom>:<architecture>.list pour un paquet Multi-Arch: same.
+    """
+    if os.path.exists(os.path.join(dossier, f"{nom}.list")):
+        return True
+    return bool(glob.glob(os.path.join(
+        glob.escape(dossier), f"{glob.escape(nom)}:*.list")))
+
+
+def rpm_present():
+    return shutil.which("rpm") is not None and any(
+        os.path.isdir(d) and os.listdir(d) for d in DOSSIERS_RPM)
+
+
+def lister_paquets(progression=None, doit_continuer=None):
+    """
+    Génère les PaquetLinux de toutes les sources présentes : dpkg, rpm,
+    flatpak, snap. progression(fraction) suit la lecture de dpkg.
+    """
+    if os.path.exists(FICHIER_ETAT_DPKG):
+        yield from lire_statut_dpkg(progression=progression)
+    sources = [("flatpak", lire_flatpak), ("snap", lire_snap)]
+    if rpm_present():
+        sources.insert(0, ("rpm", lambda: lire_rpm(doit_continuer)))
+    for nom, source in sources:
+        try:
+            yield from source()
+        except OSError as e:
+            logging.warning(f"Inventaire {nom} incomplet: {e}")
+
+
+def signature():
+    """
+    Dates et tailles des sources d'inventaire, sans les lire : change dès
+    qu'un paquet est installé, supprimé ou mis à jour.
+    """
+    parties = [f"inventaire:{VERSION_INVENTAIRE}"]
+    chemins = [FICHIER_ETAT_DPKG, DOSSIER_SNAP] + DOSSIERS_RPM + [
+        os.path.expanduser(d) for d in DOSSIERS_FLATPAK]
+    for chemin in chemins:
+        try:
+            etat = os.stat(chemin)
+            parties.append(f"{chemin}:{etat.st_mtime_ns}:{etat.st_size}")
+        except OSError:
+            pass
+    return ";".join(parties)
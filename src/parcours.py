@@ -0,0 +1,238 @@
+"""
+Parcours parallèle d'arborescences
+Description: Moteur de parcours de dossiers partagé par les threads de scan.
+Plusieurs workers os.scandir se répartissent le travail par vol de tâches
+(chaque worker dépile ses propres dossiers, puis vole ceux des autres quand
+sa file est vide). Les résultats sont transmis au fur et à mesure.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+
+# Parcours d'un dossier : chemin, chemin du parent (None pour une racine),
+# sous-dossiers retenus et autres entrées (os.DirEntry), erreur éventuelle.
+# Les liens symboliques vers des dossiers sont rangés avec les fichiers et
+# ne sont jamais suivis, comme avec os.walk.
+# Avec un cache (CacheParcours) : mtime du dossier, et cache contient
+# l'EntreeCache réutilisée quand le dossier n'a pas changé ; dans ce cas
+# fichiers est vide et dossiers contient des SousDossier.
+EntreeParcours = namedtuple(
+    "EntreeParcours",
+    ["chemin", "parent", "dossiers", "fichiers", "erreur", "mtime", "cache"],
+    defaults=(None, None))
+
+# Sous-dossier reconstitué depuis le cache (mêmes attributs qu'os.DirEntry
+# pour l'usage qu'en font les consommateurs)
+SousDossier = namedtuple("SousDossier", ["name", "path"])
+
+NB_WORKERS_DEFAUT = min(16, (os.cpu_count() or 4) * 2)
+
+_FIN = object()
+
+
+class ParcoursParallele:
+    """
+    Parcourt une ou plusieurs racines avec un pool de workers os.scandir.
+
+    - nb_workers : nombre de threads de parcours
+    - exclure : callback(os.DirEntry) -> bool, élague un sous-dossier
+    - doit_continuer : callback() -> bool, annulation coopérative
+      (typiquement lambda: self._is_running)
+    - cache : CacheParcours optionnel ; un dossier dont la date de
+      modification correspond au cache n'est pas relu
+
+    S'utilise comme itérable ; chaque élément est un EntreeParcours. Un
+    dossier est toujours transmis avant ses sous-dossiers.
+    """
+
+    def __init__(self, racines, nb_workers=None, exclure=None,
+                 doit_continuer=None, taille_file=4096, cache=None):
+        if isinstance(racines, (str, bytes, os.PathLike)):
+            racines = [racines]
+        self.racines = list(racines)
+        self.nb_workers = max(1, nb_workers or NB_WORKERS_DEFAUT)
+        self.exclure = exclure
+        self.doit_continuer = doit_continuer or (lambda: True)
+        self.cache = cache
+        self.dossiers_decouverts = len(self.racines)
+        self.dossiers_traites = 0
+        self.dossiers_en_cache = 0
+
+        self._files = [deque() for _ in range(self.nb_workers)]
+        self._en_attente = len(self.racines)
+        self._condition = threading.Condition()
+        self._resultats = queue.Queue(maxsize=taille_file)
+        self._arret = threading.Event()
+        self._threads = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __iter__(self):
+        self._demarrer()
+        try:
+            while True:
+                if self._arret.is_set() or not self.doit_continuer():
+                    break
+                try:
+                    element = self._resultats.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                if element is _FIN:
+                    break
+                self.dossiers_traites += 1
+                if element.cache is not None:
+                    self.dossiers_en_cache += 1
+                yield element
+        finally:
+            self.fermer()
+
+    def progression(self):
+        """Fraction estimée du parcours (dossiers traités / découverts)."""
+        return self.dossiers_traites / max(1, self.dossiers_decouverts)
+
+    def fermer(self, delai=1.0):
+        """Arrête les workers et libère la file de résultats."""
+        self._arret.set()
+        with self._condition:
+            self._condition.notify_all()
+        # Vider la file pour débloquer un worker en attente d'écriture
+        try:
+            while True:
+                self._resultats.get_nowait()
+        except queue.Empty:
+            pass
+        # Un seul délai pour tous les workers, pas un délai chacun
+        fin = time.monotonic() + delai
+        for thread in self._threads:
+            thread.join(max(0, fin - time.monotonic()))
+        self._threads = []
+
+    def _demarrer(self):
+        if self._threads or self._arret.is_set():
+            return
+        if not self.racines:
+            self._resultats.put(_FIN)
+            return
+        for i, racine in enumerate(self.racines):
+            self._files[i % self.nb_workers].append((os.fspath(racine), None))
+        for i in range(self.nb_workers):
+            thread = threading.Thread(
+                target=self._worker, args=(i,), daemon=True,
+                name=f"parcours-{i}")
+            self._threads.append(thread)
+            thread.start()
+
+    def _prendre_tache(self, index):
+        """Dépile une tâche locale ou en vole une à un autre worker."""
+        propre = self._files[index]
+        try:
+            return propre.pop()
+        except IndexError:
+            pass
+        for decalage in range(1, self.nb_workers):
+            autre = self._files[(index + decalage) % self.nb_workers]
+            try:
+                return autre.popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _worker(self, index):
+        while not self._arret.is_set():
+            tache = self._prendre_tache(index)
+            if tache is None:
+                with self._condition:
+                    if self._en_attente == 0:
+                        return
+                    self._condition.wait(0.05)
+                continue
+
+            sous_dossiers = []
+            try:
+                if self.doit_continuer():
+                    try:
+                        entree = self._lister(*tache)
+                    except Exception as e:
+                        # Le dossier est tout de même transmis, avec son
+                        # erreur : son parent ne doit pas l'attendre en vain
+                        logging.error(f"Erreur de parcours sur {tache[0]}: {e}")
+                        entree = EntreeParcours(tache[0], tache[1], [], [], e)
+                    sous_dossiers = entree.dossiers
+                    self._publier(entree)
+                else:
+                    self._arret.set()
+            finally:
+                self._terminer_tache(index, tache[0], sous_dossiers)
+
+    def _publier(self, element):
+        while not self._arret.is_set():
+            try:
+                self._resultats.put(element, timeout=0.05)
+                return
+            except queue.Full:
+                continue
+
+    def _terminer_tache(self, index, chemin, sous_dossiers):
+        if self._arret.is_set():
+            sous_dossiers = []
+        with self._condition:
+            # Empiler sous le verrou : un voleur ne doit pas pouvoir terminer
+            # une tâche avant que le compteur d'attente ne l'inclue.
+            for sous_dossier in sous_dossiers:
+                self._files[index].append((sous_dossier.path, chemin))
+            self.dossiers_decouverts += len(sous_dossiers)
+            self._en_attente += len(sous_dossiers) - 1
+            if self._en_attente == 0:
+                self._publier(_FIN)
+                self._condition.notify_all()
+            elif sous_dossiers:
+                self._condition.notify(len(sous_dossiers))
+
+    def _lister(self, chemin, parent):
+        mtime = None
+        if self.cache is not None:
+            # Date lue avant os.scandir : une modification pendant la
+            # lecture invalidera l'entrée au prochain parcours
+            try:
+                mtime = os.stat(chemin).st_mtime
+            except OSError:
+                pass
+            connu = self.cache.lire(chemin) if mtime is not None else None
+            if connu is not None and connu.mtime == mtime:
+                dossiers = [SousDossier(nom, os.path.join(chemin, nom))
+                            for nom in connu.sous_dossiers]
+                return EntreeParcours(
+                    chemin, parent, dossiers, [], None, mtime, connu)
+
+        dossiers = []
+        fichiers = []
+        erreur = None
+        try:
+            with os.scandir(chemin) as entrees:
+                for compteur, entree in enumerate(entrees):
+                    # Annulation vérifiée aussi à l'intérieur d'un grand
+                    # dossier ; _publier() écarte alors la liste partielle
+                    if compteur & 0xFF == 0xFF and (
+                            self._arret.is_set() or not self.doit_continuer()):
+                        self._arret.set()
+                        break
+                    try:
+                        est_dossier = entree.is_dir(follow_symlinks=False)
+                    except OSError:
+                        est_dossier = False
+                    if not est_dossier:
+                        fichiers.append(entree)
+                    elif not (self.exclure and self.exclure(entree)):
+                        dossiers.append(entree)
+        except OSError as e:
+            erreur = e
+        return EntreeParcours(chemin, parent, dossiers, fichiers, erreur, mtime)
+
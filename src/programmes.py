@@ -0,0 +1,139 @@
+"""
+Programmes installés
+Description: Inventaire des programmes installés (instantané du registre
+Windows ; sous Linux, fichier d'état dpkg, rpm, flatpak et snap), sans
+dépendance à Qt. Utilisé par ProgramThread et par le mode ligne de commande.
+"""
+
+import logging
+import platform
+import sqlite3
+import subprocess
+
+from cache_programmes import DeltaProgrammes, calculer_delta, ouvrir_cache_programmes
+from flux import EmetteurLots
+from paquets_linux import lister_paquets, signature as signature_paquets
+from registre import inventaire_partage
+
+
+def _ignorer(*args):
+    pass
+
+
+class ListeProgrammes:
+    """
+    Liste des programmes installés en tuples (nom, version, chemin).
+    Compatible Windows et Linux. inventaire remplace l'instantané partagé
+    du registre (registre factice hors Windows).
+
+    Avec le cache, la dernière liste connue est transmise immédiatement ;
+    l'inventaire n'est relu que si la signature de sa source a changé, et
+    delta décrit alors les changements par rapport à la liste en cache.
+    """
+
+    def __init__(self, inventaire=None, utiliser_cache=True):
+        self.inventaire = inventaire
+        self.utiliser_cache = utiliser_cache
+        self.delta = DeltaProgrammes([], [], [])
+        self.depuis_cache = False
+        self._is_running = True
+
+    def _registre(self):
+        if self.inventaire is not None or platform.system() == "Windows":
+            return self.inventaire or inventaire_partage()
+        return None
+
+    def signature(self):
+        """Signature de la source de l'inventaire, ou None si inconnue."""
+        try:
+            registre = self._registre()
+            if registre is not None:
+                return registre.signature()
+            if platform.system() == "Linux":
+                return signature_paquets()
+        except Exception as e:
+            logging.warning(f"Signature de l'inventaire indisponible: {e}")
+        return None
+
+    def executer(self, progression=None, lot=None):
+        """
+        Récupère la liste des programmes installés ; lot(liste) reçoit les
+        programmes par lots : la liste en cache d'abord s'il y en a une,
+        sinon les programmes au fil de la lecture.
+        """
+        progression = progression or _ignorer
+        emetteur = EmetteurLots(lot or _ignorer)
+        cache = ouvrir_cache_programmes() if self.utiliser_cache else None
+        if cache is None:
+            return self._inventorier(progression, emetteur)
+
+        with cache:
+            try:
+                signature_cache, en_cache = cache.charger()
+            except sqlite3.Error as e:
+                logging.warning(f"Lecture du cache des programmes impossible: {e}")
+                signature_cache, en_cache = None, []
+            if en_cache:
+                emetteur.etendre(en_cache)
+                emetteur.vider()
+                progression(10)
+
+            signature = self.signature()
+            if en_cache and signature is not None and signature == signature_cache:
+                self.depuis_cache = True
+                progression(100)
+                return en_cache
+
+            registre = self._registre()
+            if registre is not None:
+                registre.invalider()
+            # La liste en cache est déjà affichée : seul le delta suivra
+            programmes = self._inventorier(
+                progression, EmetteurLots(_ignorer) if en_cache else emetteur)
+            if not self._is_running:
+                return programmes
+            self.delta = calculer_delta(en_cache, programmes)
+            try:
+                cache.enregistrer(signature, programmes, self.delta,
+                                  historiser=signature_cache is not None)
+            except sqlite3.Error as e:
+                logging.error(f"Écriture du cache des programmes impossible: {e}")
+            logging.info(
+                f"Programmes: {len(self.delta.ajouts)} ajoutés, "
+                f"{len(self.delta.suppressions)} supprimés, "
+                f"{len(self.delta.mises_a_jour)} mis à jour")
+        return programmes
+
+    def _inventorier(self, progression, emetteur):
+        """Relit l'inventaire complet (registre ou dpkg)."""
+        programmes = []
+        systeme = platform.system()
+        try:
+            registre = self._registre()
+            if registre is not None:
+                for programme in registre.programmes():
+                    programmes.append(
+                        (programme.nom, programme.version, programme.chemin))
+                emetteur.etendre(programmes)
+                progression(90)
+            elif systeme == "Linux":
+                for paquet in lister_paquets(
+                        progression=lambda fraction: progression(int(fraction * 95)),
+                        doit_continuer=lambda: self._is_running):
+                    programme = (paquet.nom, paquet.version, paquet.chemin)
+                    programmes.append(programme)
+                    emetteur.ajouter(programme)
+                    if not self._is_running:
+                        break
+        except (subprocess.SubprocessError, OSError) as e:
+            logging.error(
+                f"Erreur lors de la récupération des programmes: {e}")
+            programmes = []
+        finally:
+            emetteur.vider()
+            progression(100)
+        return programmes
+
+    def stop(self):
+        """Arrête la tâche proprement."""
+        self._is_running = False
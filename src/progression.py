@@ -0,0 +1,181 @@
+"""
+Suivi de progression
+Description: Progression des tâches longues exprimée en unités de travail
+(dossiers, octets, lignes) plutôt qu'en pourcentages calculés par chaque
+tâche. Le total est connu, découvert en cours de route (dossiers trouvés
+par le parcours) ou repris de l'exécution précédente ; le temps restant est
+estimé à partir du débit observé. Les mises à jour sont envoyées au plus
+environ 30 fois par seconde, quel que soit le nombre d'unités traitées.
+
+EmetteurProgression regroupe de la même façon les appels progression(valeur)
+ou progression(valeur, message) de n'importe quelle tâche avant leur envoi à
+l'interface : chaque envoi est un signal traité par la boucle d'événements.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from stockage import dossier_donnees
+
+# ~30 mises à jour par seconde au plus
+INTERVALLE_PROGRESSION = 1 / 30
+
+# Débit mesuré après ce délai seulement : les premières unités (dossiers en
+# cache, petits dossiers) ne sont pas représentatives
+DELAI_ESTIMATION = 1.0
+
+FICHIER_TAILLES = "tailles_precedentes.json"
+_verrou_tailles = threading.Lock()
+
+
+def _ignorer(*args):
+    pass
+
+
+def _chemin_tailles():
+    return os.path.join(dossier_donnees(), FICHIER_TAILLES)
+
+
+def taille_precedente(cle):
+    """Nombre d'unités de la dernière exécution complète de cle, sinon None."""
+    with _verrou_tailles:
+        try:
+            with open(_chemin_tailles(), encoding="utf-8") as f:
+                return json.load(f).get(cle)
+        except (OSError, ValueError):
+            return None
+
+
+def enregistrer_taille(cle, unites):
+    """Mémorise le nombre d'unités d'une exécution complète."""
+    with _verrou_tailles:
+        chemin = _chemin_tailles()
+        try:
+            with open(chemin, encoding="utf-8") as f:
+                tailles = json.load(f)
+        except (OSError, ValueError):
+            tailles = {}
+        tailles[cle] = unites
+        try:
+            with open(chemin + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(tailles, f)
+            os.replace(chemin + ".tmp", chemin)
+        except OSError as e:
+            logging.warning(f"Taille de référence non enregistrée: {e}")
+
+
+def format_duree(secondes):
+    """Durée lisible : '45 s', '3 min 05 s', '1 h 20 min'."""
+    secondes = int(round(secondes))
+    if secondes < 60:
+        return f"{secondes} s"
+    minutes, secondes = divmod(secondes, 60)
+    if minutes < 60:
+        return f"{minutes} min {secondes:02d} s"
+    heures, minutes = divmod(minutes, 60)
+    return f"{heures} h {minutes:02d} min"
+
+
+class SuiviProgression:
+    """
+    Convertit des unités de travail en pourcentage entre debut et fin et
+    appelle emettre(valeur) au plus une fois par intervalle.
+
+    - total : nombre d'unités attendu, s'il est connu
+    - cle : identifie le travail (ex. "disque:C:\\") ; sans total, la taille
+      de la dernière exécution complète sert d'estimation, et terminer()
+      enregistre la nouvelle
+    - decouvrir(n) relève le total quand le travail se découvre en chemin
+      (dossiers trouvés par le parcours) : il ne peut que grandir
+    """
+
+    def __init__(self, emettre=None, total=None, cle=None, debut=0, fin=100,
+                 intervalle=INTERVALLE_PROGRESSION):
+        self.emettre = emettre or _ignorer
+        self.cle = cle
+        self.debut = debut
+        self.fin = fin
+        self.intervalle = intervalle
+        self.total = total
+        self.estimation = taille_precedente(cle) if cle and total is None else None
+        self.decouvert = 0
+        self.fait = 0
+        self.restant = None
+        self._valeur = None
+        self._depart = time.monotonic()
+        self._dernier_envoi = 0.0
+
+    def decouvrir(self, total):
+        """Relève le nombre d'unités connues à ce stade."""
+        if total > self.decouvert:
+            self.decouvert = total
+
+    def avancer(self, unites=1):
+        """Compte des unités traitées ; envoie la progression si l'intervalle est écoulé."""
+        self.fait += unites
+        maintenant = time.monotonic()
+        if maintenant - self._dernier_envoi >= self.intervalle:
+            self._dernier_envoi = maintenant
+            self._envoyer(maintenant)
+
+    def fraction(self):
+        """Fraction estimée du travail accompli (0 à 1)."""
+        total = max(self.total or self.estimation or 0, self.decouvert)
+        if total <= 0:
+            return 0.0
+        return min(1.0, self.fait / total)
+
+    def _envoyer(self, maintenant):
+        fraction = self.fraction()
+        ecoule = maintenant - self._depart
+        if 0 < fraction < 1 and ecoule >= DELAI_ESTIMATION:
+            self.restant = ecoule * (1 - fraction) / fraction
+        valeur = min(self.fin - 1,
+                     self.debut + int((self.fin - self.debut) * fraction))
+        if valeur != self._valeur:
+            self._valeur = valeur
+            self.emettre(valeur)
+
+    def terminer(self, complet=True):
+        """Fin du travail ; un travail complet devient la référence de cle."""
+        self.restant = None
+        if complet and self.cle and self.fait:
+            enregistrer_taille(self.cle, self.fait)
+
+
+class EmetteurProgression:
+    """
+    Filtre placé devant emettre (typiquement signal.emit) : une valeur
+    entière n'est transmise que si elle change ; un nouveau message avec la
+    même valeur l'est au plus une fois par intervalle. Peut être appelé
+    depuis plusieurs threads (workers de suppression du nettoyage).
+    """
+
+    def __init__(self, emettre, intervalle=INTERVALLE_PROGRESSION):
+        self.emettre = emettre
+        self.intervalle = intervalle
+        self.envois = 0
+        self.ignores = 0
+        self._valeur = None
+        self._message = ()
+        self._dernier_envoi = 0.0
+        self._verrou = threading.Lock()
+
+    def __call__(self, valeur, *message):
+        valeur = int(valeur)
+        maintenant = time.monotonic()
+        with self._verrou:
+            if valeur == self._valeur and (
+                    message == self._message
+                    or maintenant - self._dernier_envoi < self.intervalle):
+                self.ignores += 1
+                return
+            self._valeur = valeur
+            self._message = message
+            self._dernier_envoi = maintenant
+            self.envois += 1
+            # Envoi sous le verrou : l'ordre des valeurs est conservé
+            self.emettre(valeur, *message)
@@ -0,0 +1,219 @@
+"""
+Inventaire du registre
+Description: Lecture unique des clés Uninstall du registre Windows (HKLM,
+WOW6432Node et HKCU) en un instantané mémoire à durée de vie limitée, partagé
+par la liste des programmes, l'analyse de sécurité et la désinstallation.
+
+La lecture passe par un fournisseur : FournisseurWinreg lit le vrai registre
+avec winreg, FournisseurMemoire sert un registre factice (tests hors Windows).
+"""
+
+import json
+import logging
+import platform
+import threading
+import time
+from collections import namedtuple
+
+CLE_UNINSTALL = r"Software\Microsoft\Windows\CurrentVersion\Uninstall"
+CLE_UNINSTALL_WOW = r"Software\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
+
+# Durée de validité d'un instantané, en secondes
+DUREE_VIE_INSTANTANE = 300
+
+# Valeurs lues pour chaque programme
+VALEURS_LUES = (
+    'DisplayName', 'DisplayVersion', 'InstallLocation', 'UninstallString',
+    'QuietUninstallString', 'InstallDate', 'Publisher'
+)
+
+ProgrammeInstalle = namedtuple('ProgrammeInstalle', [
+    'nom', 'version', 'chemin', 'desinstallation', 'desinstallation_silencieuse',
+    'date_installation', 'editeur', 'source'
+])
+
+
+class FournisseurMemoire:
+    """
+    Registre factice : {source: {sous_clé: {valeur: donnée}}}, par exemple
+    {'HKLM': {'{GUID}': {'DisplayName': 'Java 7', 'DisplayVersion': '7.0'}}}.
+    """
+
+    def __init__(self, cles=None):
+        self.cles = cles or {}
+
+    def lire_cles(self):
+        """Génère les (source, sous_clé, valeurs) des clés Uninstall."""
+        for source, sous_cles in self.cles.items():
+            for sous_cle, valeurs in sous_cles.items():
+                yield source, sous_cle, dict(valeurs)
+
+    def signature(self):
+        """Change dès que le contenu du registre factice change."""
+        return json.dumps(self.cles, sort_keys=True, default=str)
+
+
+class FournisseurWinreg:
+    """Lit les clés Uninstall du registre Windows avec winreg."""
+
+    @staticmethod
+    def _emplacements(winreg):
+        return [
+            ('HKLM', winreg.HKEY_LOCAL_MACHINE, CLE_UNINSTALL, winreg.KEY_WOW64_64KEY),
+            ('HKLM32', winreg.HKEY_LOCAL_MACHINE, CLE_UNINSTALL_WOW, winreg.KEY_WOW64_64KEY),
+            ('HKCU', winreg.HKEY_CURRENT_USER, CLE_UNINSTALL, 0),
+        ]
+
+    def signature(self):
+        """
+        Nombre de sous-clés et date d'écriture la plus récente de chaque clé
+        Uninstall et de ses sous-clés : une mise à jour ne modifie que la
+        sous-clé du programme. Aucune valeur n'est lue.
+        """
+        import winreg
+        parties = []
+        for source, ruche, chemin, vue in self._emplacements(winreg):
+            try:
+                cle = winreg.OpenKey(ruche, chemin, 0, winreg.KEY_READ | vue)
+            except OSError:
+                parties.append(f"{source}:-")
+                continue
+            with cle:
+                nb_sous_cles, _, derniere_ecriture = winreg.QueryInfoKey(cle)
+                for i in range(nb_sous_cles):
+                    try:
+                        with winreg.OpenKey(cle, winreg.EnumKey(cle, i)) as sous_cle:
+                            derniere_ecriture = max(
+                                derniere_ecriture, winreg.QueryInfoKey(sous_cle)[2])
+                    except OSError:
+                        pass
+            parties.append(f"{source}:{nb_sous_cles}:{derniere_ecriture}")
+        return ";".join(parties)
+
+    def lire_cles(self):
+        """Génère les (source, sous_clé, valeurs) des clés Uninstall."""
+        import winreg
+        for source, ruche, chemin, vue in self._emplacements(winreg):
+            try:
+                cle = winreg.OpenKey(ruche, chemin, 0, winreg.KEY_READ | vue)
+            except OSError:
+                continue
+            with cle:
+                nb_sous_cles = winreg.QueryInfoKey(cle)[0]
+                for i in range(nb_sous_cles):
+                    try:
+                        sous_cle = winreg.EnumKey(cle, i)
+                        with winreg.OpenKey(cle, sous_cle) as cle_programme:
+                            yield source, sous_cle, self._lire_valeurs(winreg, cle_programme)
+                    except OSError as e:
+                        logging.warning(f"Clé illisible {source}\\{chemin}: {e}")
+
+    @staticmethod
+    def _lire_valeurs(winreg, cle):
+        valeurs = {}
+        for nom in VALEURS_LUES:
+            try:
+                valeurs[nom] = winreg.QueryValueEx(cle, nom)[0]
+            except OSError:
+                pass
+        return valeurs
+
+
+def fournisseur_par_defaut():
+    """Vrai registre sous Windows, registre vide ailleurs."""
+    if platform.system() == "Windows":
+        return FournisseurWinreg()
+    return FournisseurMemoire()
+
+
+class InventaireRegistre:
+    """
+    Instantané des programmes déclarés dans le registre, relu au plus une
+    fois par durée de vie (ou après invalider()). Sûr entre threads.
+
+    Une même sous-clé présente dans HKLM et WOW6432Node (clé partagée ou
+    reflétée entre les vues 32 et 64 bits) avec le même nom et la même
+    version n'est retenue qu'une fois, depuis HKLM.
+    """
+
+    def __init__(self, fournisseur=None, duree_vie=DUREE_VIE_INSTANTANE):
+        self.fournisseur = fournisseur or fournisseur_par_defaut()
+        self.duree_vie = duree_vie
+        self._programmes = None
+        self._par_nom = {}
+        self._date = 0.0
+        self._verrou = threading.Lock()
+
+    def programmes(self):
+        """Tuple des ProgrammeInstalle, depuis l'instantané s'il est valide."""
+        with self._verrou:
+            if (self._programmes is None
+                    or time.monotonic() - self._date > self.duree_vie):
+                self._relire()
+            return self._programmes
+
+    def chercher(self, nom):
+        """Premier programme de nom exact donné, ou None."""
+        self.programmes()
+        with self._verrou:
+            return self._par_nom.get(nom)
+
+    def signature(self):
+        """Signature de la source, sans lire les programmes."""
+        return self.fournisseur.signature()
+
+    def invalider(self):
+        """Force la relecture au prochain accès (après une désinstallation)."""
+        with self._verrou:
+            self._programmes = None
+
+    def _relire(self):
+        debut = time.perf_counter()
+        programmes = []
+        par_nom = {}
+        machine = set()
+        try:
+            for source, sous_cle, valeurs in self.fournisseur.lire_cles():
+                nom = str(valeurs.get('DisplayName') or '').strip()
+                if not nom:
+                    continue
+                version = str(valeurs.get('DisplayVersion') or '')
+                if source in ('HKLM', 'HKLM32'):
+                    identite = (sous_cle.lower(), nom, version)
+                    if identite in machine:
+                        continue
+                    machine.add(identite)
+                programme = ProgrammeInstalle(
+                    nom=nom,
+                    version=version,
+                    chemin=str(valeurs.get('InstallLocation') or ''),
+                    desinstallation=str(valeurs.get('UninstallString') or ''),
+                    desinstallation_silencieuse=str(
+                        valeurs.get('QuietUninstallString') or ''),
+                    date_installation=str(valeurs.get('InstallDate') or ''),
+                    editeur=str(valeurs.get('Publisher') or ''),
+                    source=source
+                )
+                programmes.append(programme)
+                par_nom.setdefault(nom, programme)
+        except Exception as e:
+            logging.error(f"Erreur lecture du registre: {e}")
+        self._programmes = tuple(programmes)
+        self._par_nom = par_nom
+        self._date = time.monotonic()
+        logging.info(
+            f"Registre: {len(programmes)} programmes lus en "
+            f"{(time.perf_counter() - debut) * 1000:.0f} ms")
+
+
+_inventaire_partage = None
+_verrou_partage = threading.Lock()
+
+
+def inventaire_partage():
+    """Inventaire commun à toute l'application (créé au premier appel)."""
+    global _inventaire_partage
+    with _verrou_partage:
+        if _inventaire_partage is None:
+            _inventaire_partage = InventaireRegistre()
+        return _inventaire_partage
@@ -0,0 +1,359 @@
+"""
+Analyse de sécurité
+Description: Programmes au démarrage, programmes obsolètes, ports ouverts et
+services suspects, sans dépendance à Qt. Utilisé par SecurityAnalysisThread
+et par le mode ligne de commande.
+
+Chaque vérification est un collecteur enregistré avec enregistrer_collecteur ;
+les collecteurs tournent en parallèle et chacun rend compte de sa durée, de
+son dépassement de délai ou de son erreur.
+"""
+
+import logging
+import os
+import platform
+import socket
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from registre import inventaire_partage
+from systeme import lire_csv_processus
+
+# cle : clé du dict de résultats ; fonction(analyse) -> liste de dicts ;
+# delai : secondes au-delà desquelles le résultat est abandonné
+Collecteur = namedtuple('Collecteur', ['cle', 'libelle', 'fonction', 'delai'])
+
+COLLECTEURS = []
+
+# Intervalle de vérification des délais et de l'arrêt, en secondes
+INTERVALLE_SURVEILLANCE = 0.1
+
+# États d'un collecteur dans les mesures
+OK = "ok"
+DELAI_DEPASSE = "délai dépassé"
+ERREUR = "erreur"
+ANNULE = "annulé"
+
+
+def enregistrer_collecteur(cle, libelle, delai=30):
+    """Décorateur : ajoute fonction(analyse) aux collecteurs de l'analyse."""
+    def decorer(fonction):
+        COLLECTEURS.append(Collecteur(cle, libelle, fonction, delai))
+        return fonction
+    return decorer
+
+
+def _ignorer(*args):
+    pass
+
+
+class AnalyseSecurite:
+    """
+    Analyse la sécurité du système. inventaire remplace l'instantané
+    partagé du registre (registre factice hors Windows). Après executer,
+    mesures donne pour chaque collecteur sa durée, son état et son erreur.
+    """
+
+    def __init__(self, inventaire=None, collecteurs=None):
+        self.inventaire = inventaire
+        self.collecteurs = list(COLLECTEURS if collecteurs is None else collecteurs)
+        self.mesures = {}
+        self._is_running = True
+
+    def executer(self, progression=None, collecte=None):
+        """
+        Lance tous les collecteurs en parallèle ; retourne un dict par
+        catégorie. collecte(cle, elements, mesure) est appelé dès qu'un
+        collecteur a terminé.
+        """
+        progression = progression or _ignorer
+        collecte = collecte or _ignorer
+        resultats = {collecteur.cle: [] for collecteur in self.collecteurs}
+        self.mesures = {}
+        if not self.collecteurs:
+            progression(100)
+            return resultats
+
+        progression(5)
+        executeur = ThreadPoolExecutor(len(self.collecteurs),
+                                       thread_name_prefix="securite")
+        try:
+            debut = time.monotonic()
+            en_cours = {executeur.submit(self._mesurer, collecteur): collecteur
+                        for collecteur in self.collecteurs}
+            while en_cours:
+                termines, _ = wait(en_cours, timeout=INTERVALLE_SURVEILLANCE,
+                                   return_when=FIRST_COMPLETED)
+                ecoule = time.monotonic() - debut
+                for futur in termines:
+                    collecteur = en_cours.pop(futur)
+                    elements, mesure = futur.result()
+                    resultats[collecteur.cle] = elements
+                    self._terminer(collecteur, elements, mesure, collecte)
+                for futur, collecteur in list(en_cours.items()):
+                    if not self._is_running:
+                        etat = ANNULE
+                    elif ecoule > collecteur.delai:
+                        etat = DELAI_DEPASSE
+                        logging.warning(
+                            f"Analyse sécurité: {collecteur.libelle} abandonné "
+                            f"après {collecteur.delai} s")
+                    else:
+                        continue
+                    del en_cours[futur]
+                    self._terminer(collecteur, [], {
+                        'etat': etat, 'duree': ecoule, 'erreur': None, 'nombre': 0},
+                        collecte)
+                progression(5 + 95 * len(self.mesures) // len(self.collecteurs))
+        finally:
+            # Les collecteurs abandonnés finissent seuls, sans être attendus
+            executeur.shutdown(wait=False, cancel_futures=True)
+        return resultats
+
+    def _mesurer(self, collecteur):
+        """Exécute un collecteur ; retourne (éléments, mesure)."""
+        debut = time.monotonic()
+        try:
+            elements = collecteur.fonction(self)
+            etat, erreur = OK, None
+        except Exception as e:
+            logging.error(f"Erreur analyse sécurité ({collecteur.libelle}): {e}")
+            elements, etat, erreur = [], ERREUR, str(e)
+        return elements, {'etat': etat, 'duree': time.monotonic() - debut,
+                          'erreur': erreur, 'nombre': len(elements)}
+
+    def _terminer(self, collecteur, elements, mesure, collecte):
+        self.mesures[collecteur.cle] = mesure
+        logging.info(
+            f"Analyse sécurité: {collecteur.libelle} {mesure['etat']} en "
+            f"{mesure['duree']:.2f} s ({mesure['nombre']} éléments)")
+        collecte(collecteur.cle, elements, mesure)
+
+    def stop(self):
+        """Arrête la tâche proprement."""
+        self._is_running = False
+
+
+@enregistrer_collecteur('programmes_demarrage', "Programmes au démarrage", delai=10)
+def programmes_demarrage(analyse):
+    """Récupère les programmes au démarrage Windows."""
+    startup_progs = []
+    if platform.system() != "Windows":
+        return startup_progs
+    import winreg
+    keys = [
+        (winreg.HKEY_CURRENT_USER,
+         r"Software\Microsoft\Windows\CurrentVersion\Run"),
+        (winreg.HKEY_LOCAL_MACHINE,
+         r"Software\Microsoft\Windows\CurrentVersion\Run")
+    ]
+
+    for hkey, subkey in keys:
+        try:
+            key = winreg.OpenKey(hkey, subkey)
+            i = 0
+            while True:
+                try:
+                    name, value, _ = winreg.EnumValue(key, i)
+                    startup_progs.append(
+                        {'nom': name, 'chemin': value})
+                    i += 1
+                except WindowsError:
+                    break
+            winreg.CloseKey(key)
+        except WindowsError:
+            pass
+
+    return startup_progs
+
+
+@enregistrer_collecteur('programmes_obsoletes', "Programmes obsolètes", delai=30)
+def programmes_obsoletes(analyse):
+    """Vérifie les programmes potentiellement obsolètes."""
+    obsoletes = []
+    # Liste de programmes couramment obsolètes
+    obsolete_patterns = ['java 6', 'java 7', 'flash',
+                         'silverlight', 'quicktime', 'realplayer']
+
+    if analyse.inventaire is not None or platform.system() == "Windows":
+        inventaire = analyse.inventaire or inventaire_partage()
+        for programme in inventaire.programmes():
+            texte = f"{programme.nom} {programme.version}".lower()
+            if any(pattern in texte for pattern in obsolete_patterns):
+                obsoletes.append({
+                    'nom': programme.nom,
+                    'version': programme.version or 'N/A',
+                    'raison': 'Programme obsolète ou non maintenu'
+                })
+
+    return obsoletes[:20]  # Limiter à 20 résultats
+
+
+# Tables des sockets du noyau : (fichier, protocole, famille, état d'écoute)
+# 0A = TCP_LISTEN ; 07 = TCP_CLOSE, état de toute socket UDP non connectée,
+# service comme client (résolveur DNS...) : voir _ports_linux
+TABLES_SOCKETS = [
+    ("/proc/net/tcp", "TCP", socket.AF_INET, "0A"),
+    ("/proc/net/tcp6", "TCP", socket.AF_INET6, "0A"),
+    ("/proc/net/udp", "UDP", socket.AF_INET, "07"),
+    ("/proc/net/udp6", "UDP", socket.AF_INET6, "07"),
+]
+
+
+def _adresse_proc(hexa, famille):
+    """Adresse d'une table /proc/net : mots de 32 bits en ordre de l'hôte."""
+    brut = bytes.fromhex(hexa)
+    brut = b"".join(brut[i:i + 4][::-1] for i in range(0, len(brut), 4))
+    return socket.inet_ntop(famille, brut)
+
+
+def _processus_par_inode(inodes):
+    """Nom du processus propriétaire de chaque inode de socket (si lisible)."""
+    noms = {}
+    if not inodes:
+        return noms
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        dossier_fd = f"/proc/{pid}/fd"
+        try:
+            descripteurs = os.listdir(dossier_fd)
+        except OSError:
+            # Processus terminé ou appartenant à un autre utilisateur
+            continue
+        for fd in descripteurs:
+            try:
+                cible = os.readlink(f"{dossier_fd}/{fd}")
+            except OSError:
+                continue
+            if cible.startswith("socket:[") and cible[8:-1] in inodes:
+                try:
+                    with open(f"/proc/{pid}/comm", encoding="utf-8") as f:
+                        noms[cible[8:-1]] = f"{f.read().strip()} ({pid})"
+                except OSError:
+                    noms[cible[8:-1]] = pid
+        if len(noms) == len(inodes):
+            break
+    return noms
+
+
+# Plage des ports attribués automatiquement (bind sur le port 0, sendto)
+FICHIER_PLAGE_EPHEMERE = "/proc/sys/net/ipv4/ip_local_port_range"
+PLAGE_EPHEMERE_DEFAUT = (32768, 60999)
+
+
+def _plage_ephemere(chemin=FICHIER_PLAGE_EPHEMERE):
+    try:
+        with open(chemin, encoding="ascii") as f:
+            bas, haut = (int(valeur) for valeur in f.read().split())
+        return bas, haut
+    except (OSError, ValueError):
+        return PLAGE_EPHEMERE_DEFAUT
+
+
+def _remarque_port(adresse):
+    if adresse in ("0.0.0.0", "::"):
+        return "Exposé sur toutes les interfaces"
+    if adresse.startswith("127.") or adresse == "::1":
+        return "Local uniquement"
+    return "Exposé sur une interface"
+
+
+def _ports_linux(tables=TABLES_SOCKETS, plage_ephemere=None):
+    """
+    Ports TCP en écoute et ports UDP liés. Une socket UDP n'est retenue que
+    liée à un port et sans adresse distante ; sur un port de la plage
+    éphémère, elle est marquée comme probable socket cliente.
+    """
+    bas, haut = plage_ephemere or _plage_ephemere()
+    ports = []
+    for chemin, protocole, famille, etat_ecoute in tables:
+        try:
+            with open(chemin, encoding="ascii") as f:
+                next(f, None)  # en-tête
+                for ligne in f:
+                    champs = ligne.split()
+                    if len(champs) < 10 or champs[3] != etat_ecoute:
+                        continue
+                    adresse, port = champs[1].split(":")
+                    port = int(port, 16)
+                    ephemere = False
+                    if protocole == "UDP":
+                        distante, port_distant = champs[2].split(":")
+                        if not port or int(port_distant, 16) or int(distante, 16):
+                            continue
+                        ephemere = bas <= port <= haut
+                    ports.append({
+                        'protocole': protocole,
+                        'adresse': _adresse_proc(adresse, famille),
+                        'port': port,
+                        'processus': champs[9],  # inode, remplacé plus bas
+                        'ephemere': ephemere,
+                    })
+        except OSError:
+            continue
+    noms = _processus_par_inode({p['processus'] for p in ports})
+    for p in ports:
+        p['processus'] = noms.get(p['processus'], "")
+    return ports
+
+
+def _ports_windows(analyse):
+    ports = []
+    for connexion in lire_csv_processus(
+            ["powershell", "-Command",
+             "Get-NetTCPConnection -State Listen | Select-Object LocalAddress, LocalPort, OwningProcess | ConvertTo-Csv -NoTypeInformation"],
+            delai=15, doit_continuer=lambda: analyse._is_running):
+        ports.append({
+            'protocole': 'TCP',
+            'adresse': connexion.LocalAddress,
+            'port': int(connexion.LocalPort),
+            'processus': connexion.OwningProcess,
+        })
+    return ports
+
+
+@enregistrer_collecteur('ports_ouverts', "Ports ouverts", delai=20)
+def ports_ouverts(analyse):
+    """Ports TCP en écoute et ports UDP liés, avec le processus propriétaire."""
+    if platform.system() == "Windows":
+        ports = _ports_windows(analyse)
+    else:
+        ports = _ports_linux()
+    uniques = {}
+    for p in ports:
+        uniques.setdefault((p['protocole'], p['adresse'], p['port']), p)
+    ports = sorted(uniques.values(), key=lambda p: (p['protocole'], p['port']))
+    for p in ports:
+        p['remarque'] = _remarque_port(p['adresse'])
+        if p.pop('ephemere', False):
+            p['remarque'] += " ; port UDP éphémère, socket cliente probable"
+    return ports
+
+
+@enregistrer_collecteur('services_suspects', "Services suspects", delai=20)
+def services_suspects(analyse):
+    """Vérifie les services Windows suspects."""
+    suspects = []
+    if platform.system() != "Windows":
+        return suspects
+    # Services souvent inutiles ou suspects
+    suspicious_names = ['telemetry',
+                        'diagtrack', 'dmwappush', 'remoteregistry']
+
+    for service in lire_csv_processus(
+            ["powershell", "-Command",
+             "Get-Service | Where-Object {$_.Status -eq 'Running'} | Select-Object Name, DisplayName | ConvertTo-Csv -NoTypeInformation"],
+            delai=15, doit_continuer=lambda: analyse._is_running):
+        texte = f"{service.Name} {service.DisplayName}".lower()
+        if any(susp in texte for susp in suspicious_names):
+            suspects.append({
+                'service': service.Name,
+                'description': service.DisplayName,
+                'remarque': 'Service potentiellement inutile'
+            })
+            if len(suspects) >= 15:
+                break
+
+    return suspects[:15]  # Limiter à 15 résultats
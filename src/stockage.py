@@ -0,0 +1,24 @@
+"""
+Stockage local de l'application
+Description: Emplacement des fichiers persistants (index, caches) de l'outil.
+"""
+
+import os
+import platform
+
+
+def dossier_donnees():
+    """
+    Retourne le dossier de données de l'application et le crée au besoin.
+    Windows : %LOCALAPPDATA%\\OutilMaintenance, sinon ~/.cache/OutilMaintenance
+    (ou $XDG_CACHE_HOME/OutilMaintenance).
+    """
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(
+            os.path.join("~", "AppData", "Local"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            os.path.join("~", ".cache"))
+    dossier = os.path.join(base, "OutilMaintenance")
+    os.makedirs(dossier, exist_ok=True)
+    return dossier
@@ -0,0 +1,135 @@
+"""
+Outils système
+Description: Paramètres et lecture en flux des sous-processus (PowerShell,
+dpkg...) et profils utilisateurs, partagés par l'interface graphique et le
+mode ligne de commande.
+"""
+
+import csv
+import logging
+import os
+import platform
+import subprocess
+import threading
+from collections import namedtuple
+
+
+# Helper pour masquer la fenêtre console sur Windows
+def get_subprocess_startupinfo():
+    """Retourne les paramètres pour masquer la fenêtre console sur Windows."""
+    if platform.system() == "Windows":
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        startupinfo.wShowWindow = subprocess.SW_HIDE
+        return startupinfo
+    return None
+
+def get_subprocess_creationflags():
+    """Retourne les flags de création pour masquer la console sur Windows."""
+    if platform.system() == "Windows":
+        return subprocess.CREATE_NO_WINDOW
+    return 0
+
+
+def profils_utilisateurs():
+    """
+    Dossiers des profils utilisateurs locaux. Sous Windows, lus dans la
+    clé ProfileList (comptes locaux et de domaine, S-1-5-21-*), plus le
+    profil courant ; ailleurs, le profil courant seul.
+    """
+    profils = []
+    if platform.system() != "Windows":
+        return [os.environ.get('USERPROFILE') or os.path.expanduser('~')]
+
+    try:
+        import winreg
+        with winreg.OpenKey(
+                winreg.HKEY_LOCAL_MACHINE,
+                r"SOFTWARE\Microsoft\Windows NT\CurrentVersion\ProfileList") as cle:
+            i = 0
+            while True:
+                try:
+                    sid = winreg.EnumKey(cle, i)
+                except OSError:
+                    break
+                i += 1
+                if not sid.startswith("S-1-5-21-"):
+                    continue
+                try:
+                    with winreg.OpenKey(cle, sid) as cle_profil:
+                        chemin, _ = winreg.QueryValueEx(cle_profil, "ProfileImagePath")
+                except OSError:
+                    continue
+                chemin = os.path.expandvars(chemin)
+                if os.path.isdir(chemin):
+                    profils.append(chemin)
+    except Exception as e:
+        logging.error(f"Erreur lecture des profils: {e}")
+
+    courant = os.environ.get('USERPROFILE', '')
+    if courant and all(os.path.normcase(p) != os.path.normcase(courant) for p in profils):
+        profils.append(courant)
+    return profils
+
+
+def lire_csv_processus(cmd, champs=None, delimiteur=",", doit_continuer=None,
+                       delai=None):
+    """
+    Lance cmd et génère ses lignes CSV au fil de l'écriture, sans attendre
+    la fin du processus. Chaque ligne est un namedtuple dont les champs
+    viennent de champs, ou à défaut de la ligne d'en-tête (ConvertTo-Csv
+    -NoTypeInformation). Les champs entre guillemets peuvent contenir des
+    virgules ou des retours à la ligne. Une dernière ligne sans fin de ligne
+    (processus arrêté en cours d'écriture) est ignorée. Le processus est
+    arrêté si la lecture est interrompue ou après delai secondes.
+    """
+    doit_continuer = doit_continuer or (lambda: True)
+    processus = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        errors="replace",
+        bufsize=1,
+        startupinfo=get_subprocess_startupinfo(),
+        creationflags=get_subprocess_creationflags()
+    )
+    minuterie = None
+    if delai is not None:
+        minuterie = threading.Timer(delai, processus.kill)
+        minuterie.daemon = True
+        minuterie.start()
+    fin_de_ligne = [True]
+
+    def lignes():
+        for ligne in processus.stdout:
+            fin_de_ligne[0] = ligne.endswith("\n")
+            yield ligne
+
+    try:
+        lecteur = csv.reader(lignes(), delimiter=delimiteur)
+        if champs is None:
+            entete = next(lecteur, None)
+            if entete is None:
+                return
+            champs = entete
+        Ligne = namedtuple('Ligne', champs, rename=True)
+        nb_champs = len(Ligne._fields)
+        for valeurs in lecteur:
+            if not doit_continuer():
+                break
+            if not valeurs:
+                continue
+            if not fin_de_ligne[0]:
+                logging.warning(f"Ligne tronquée ignorée en fin de sortie de {cmd[0]}")
+                break
+            # Ligne tronquée ou trop longue : complétée ou coupée
+            valeurs = (valeurs + [""] * nb_champs)[:nb_champs]
+            yield Ligne(*valeurs)
+    finally:
+        if minuterie is not None:
+            minuterie.cancel()
+        if processus.poll() is None:
+            processus.kill()
+        processus.stdout.close()
+        processus.wait()
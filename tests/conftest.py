@@ -0,0 +1,31 @@
+"""
+Configuration commune des tests : les modules de src/ sont importés
+directement, et chaque test a son propre dossier de données (caches,
+index) pour ne jamais toucher à celui de l'utilisateur.
+"""
+
+import os
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+
+@pytest.fixture(autouse=True)
+def dossier_donnees_isole(tmp_path, monkeypatch):
+    """Dossier de données de l'application propre à chaque test."""
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache))
+    monkeypatch.setenv("LOCALAPPDATA", str(cache))
+    return cache
+
+
+@pytest.fixture
+def racine(tmp_path):
+    """Racine des arborescences de test, hors du dossier de données."""
+    chemin = tmp_path / "arbre"
+    chemin.mkdir()
+    return str(chemin)
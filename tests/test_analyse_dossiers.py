@@ -0,0 +1,85 @@
+"""Tests de la recherche des dossiers vides (analyse_dossiers.py)."""
+
+import os
+
+import pytest
+
+from analyse_dossiers import RechercheDossiersVides
+
+
+def creer_arbre(racine, chemins):
+    for chemin in chemins:
+        complet = os.path.join(racine, chemin)
+        if chemin.endswith("/"):
+            os.makedirs(complet, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(complet), exist_ok=True)
+            open(complet, "w").close()
+
+
+def scanner(racine, utiliser_cache=False):
+    trouves = []
+    tache = RechercheDossiersVides(racine, utiliser_cache=utiliser_cache)
+    total = tache.executer(lot=trouves.extend)
+    assert total == len(trouves)
+    return sorted(os.path.relpath(c, racine) for c in trouves), tache.stats_cache
+
+
+@pytest.fixture
+def illisible(monkeypatch):
+    """os.scandir refusé pour tout dossier nommé "prive" (même en root)."""
+    scandir = os.scandir
+
+    def scandir_protege(chemin="."):
+        if os.path.basename(chemin) == "prive":
+            raise PermissionError(13, "accès refusé", chemin)
+        return scandir(chemin)
+
+    monkeypatch.setattr(os, "scandir", scandir_protege)
+
+
+@pytest.fixture
+def arborescence(racine):
+    # Branche vide (seul "a" est signalé), fichier au fond d'une branche
+    # (aucun ancêtre vide), dossier illisible (compte comme non vide)
+    creer_arbre(racine, [
+        "a/b/c/", "a/b/d/",
+        "profond/e/f/g/fichier.txt", "profond/e/vide/",
+        "h/prive/", "h/vide/",
+        "fichier_racine.txt",
+    ])
+    return racine
+
+
+def test_seul_le_dossier_vide_le_plus_haut(arborescence, illisible):
+    trouves, _ = scanner(arborescence)
+    assert trouves == ["a", os.path.join("h", "vide"),
+                       os.path.join("profond", "e", "vide")]
+
+
+def test_racine_vide_signalee(racine):
+    creer_arbre(racine, ["x/y/", "z/"])
+    assert scanner(racine)[0] == ["."]
+
+
+def test_fichier_profond_rend_les_ancetres_non_vides(racine):
+    creer_arbre(racine, ["p/q/r/s/t/u/"])
+    assert scanner(racine)[0] == ["."]
+    open(os.path.join(racine, "p", "q", "r", "s", "t", "u", "f.txt"), "w").close()
+    assert scanner(racine)[0] == []
+
+
+def test_dossier_illisible_non_vide(racine, illisible):
+    creer_arbre(racine, ["seul/prive/"])
+    # "seul" ne contient qu'un dossier illisible : ni lui ni la racine ne sont vides
+    assert scanner(racine)[0] == []
+
+
+def test_cache_resultats_identiques(arborescence, illisible):
+    sans_cache, _ = scanner(arborescence)
+    premier, stats_premier = scanner(arborescence, utiliser_cache=True)
+    second, stats_second = scanner(arborescence, utiliser_cache=True)
+    assert premier == second == sans_cache
+    assert stats_premier['succes'] == 0
+    # Tous les dossiers lisibles sont repris du cache ; "prive" est relu
+    assert stats_second == {'succes': stats_premier['echecs'] - 1, 'echecs': 1}
@@ -0,0 +1,107 @@
+"""Tests de l'arbre des tailles de dossiers (arbre_disque.py)."""
+
+import os
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from arbre_disque import ENTETE, ArbreDossiers
+
+
+@pytest.fixture
+def arborescence(racine):
+    """Arborescence aléatoire (graine fixe) de dossiers et de fichiers."""
+    aleatoire = random.Random(42)
+    dossiers = [racine]
+    for i in range(60):
+        parent = aleatoire.choice(dossiers)
+        dossier = os.path.join(parent, f"d{i}")
+        os.mkdir(dossier)
+        dossiers.append(dossier)
+    for i in range(200):
+        with open(os.path.join(aleatoire.choice(dossiers), f"f{i}.bin"), "wb") as f:
+            f.write(b"x" * aleatoire.randint(0, 5000))
+    return racine
+
+
+def construire(racine, nb_max_noeuds=1000):
+    """Arbre construit comme pendant l'analyse : parents avant enfants."""
+    arbre = ArbreDossiers(racine, nb_max_noeuds)
+    for chemin, sous_dossiers, fichiers in os.walk(racine):
+        arbre.ajouter_dossier(
+            chemin,
+            [SimpleNamespace(path=os.path.join(chemin, d)) for d in sous_dossiers],
+            sum(os.path.getsize(os.path.join(chemin, f)) for f in fichiers),
+            len(fichiers))
+    arbre.finaliser()
+    return arbre
+
+
+def totaux_reels(dossier):
+    """Somme brute des tailles et du nombre de fichiers sous un dossier."""
+    octets = fichiers = 0
+    for chemin, _, noms in os.walk(dossier):
+        octets += sum(os.path.getsize(os.path.join(chemin, n)) for n in noms)
+        fichiers += len(noms)
+    return octets, fichiers
+
+
+def test_totaux_agreges(arborescence):
+    arbre = construire(arborescence)
+    assert len(arbre) == 61
+    for noeud, chemin in arbre.parcourir():
+        assert chemin == arbre.chemin(noeud)
+        assert (arbre.octets[noeud], arbre.fichiers[noeud]) == totaux_reels(chemin)
+        enfants = arbre.liste_enfants(noeud)
+        tailles = [arbre.octets[e] for e in enfants]
+        assert tailles == sorted(tailles, reverse=True)
+        if enfants:
+            assert arbre.octets[arbre.plus_gros_enfant[noeud]] == tailles[0]
+
+
+def test_noeuds_replies_dans_le_parent(arborescence):
+    complet = construire(arborescence)
+    arbre = construire(arborescence, nb_max_noeuds=10)
+    assert len(arbre) == 10
+    # Les dossiers sans nœud sont comptés dans leur ancêtre : totaux exacts
+    assert (arbre.octets[0], arbre.fichiers[0]) == totaux_reels(arborescence)
+    assert sum(arbre.octets_directs) == sum(complet.octets_directs)
+    assert sum(arbre.fichiers_directs) == sum(complet.fichiers_directs)
+    for noeud, chemin in arbre.parcourir():
+        octets, fichiers = totaux_reels(chemin)
+        assert arbre.octets[noeud] <= octets and arbre.fichiers[noeud] <= fichiers
+
+
+def test_sauvegarder_charger(arborescence, tmp_path):
+    arbre = construire(arborescence)
+    fichier = str(tmp_path / "arbre.bin")
+    arbre.sauvegarder(fichier)
+    relu = ArbreDossiers.charger(fichier)
+    assert relu.racine == arbre.racine
+    assert list(relu.parcourir()) == list(arbre.parcourir())
+    assert relu.octets == arbre.octets and relu.fichiers == arbre.fichiers
+    assert relu.plus_gros_enfant == arbre.plus_gros_enfant
+
+
+def test_sauvegarder_charger_arbre_vide(tmp_path):
+    arbre = ArbreDossiers("/vide")
+    arbre.finaliser()
+    fichier = str(tmp_path / "arbre.bin")
+    arbre.sauvegarder(fichier)
+    relu = ArbreDossiers.charger(fichier)
+    assert len(relu) == 0 and list(relu.parcourir()) == []
+
+
+@pytest.mark.parametrize("abimer", [
+    lambda donnees: b"PASUNARB" + donnees[8:],
+    lambda donnees: donnees[:ENTETE.size - 3],
+    lambda donnees: donnees[:ENTETE.size + 5],
+    lambda donnees: donnees[:-7],
+], ids=["magique", "entete_tronquee", "noms_tronques", "tableaux_tronques"])
+def test_charger_fichier_corrompu(arborescence, tmp_path, abimer):
+    fichier = tmp_path / "arbre.bin"
+    construire(arborescence).sauvegarder(str(fichier))
+    fichier.write_bytes(abimer(fichier.read_bytes()))
+    with pytest.raises(ValueError):
+        ArbreDossiers.charger(str(fichier))
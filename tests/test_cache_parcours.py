@@ -0,0 +1,112 @@
+"""Tests du cache de parcours (cache_parcours.py) et des rescans incrémentaux."""
+
+import os
+
+from analyse_dossiers import AnalyseDisque, RechercheDossiersVides
+from cache_parcours import CacheParcours
+
+
+def decaler_mtime(dossier, secondes=10):
+    """Date de modification nettement différente, quelle que soit la résolution."""
+    mtime = os.stat(dossier).st_mtime + secondes
+    os.utime(dossier, (mtime, mtime))
+
+
+def scanner_vides(racine):
+    trouves = []
+    tache = RechercheDossiersVides(racine)
+    tache.executer(lot=trouves.extend)
+    return sorted(trouves), tache.stats_cache
+
+
+def test_lecture_et_oubli_des_sous_dossiers_disparus(tmp_path):
+    cache = CacheParcours("test", str(tmp_path / "cache.db"))
+    racine = "r"
+    cache.enregistrer(racine, 1.0, ["a", "b"], 2, 10, [("gros.bin", 9, 1.0)])
+    cache.enregistrer(os.path.join(racine, "a"), 2.0, ["x"], 0)
+    cache.enregistrer(os.path.join(racine, "a", "x"), 3.0, [], 1)
+    cache.enregistrer(os.path.join(racine, "ab"), 4.0, [], 0)
+
+    entree = cache.lire(racine)
+    assert entree.sous_dossiers == ["a", "b"] and entree.gros == [["gros.bin", 9, 1.0]]
+
+    # "a" disparaît : lui et sa descendance sont oubliés, pas son voisin "ab"
+    cache.enregistrer(racine, 5.0, ["b"], 2)
+    assert cache.lire(os.path.join(racine, "a")) is None
+    assert cache.lire(os.path.join(racine, "a", "x")) is None
+    assert cache.lire(os.path.join(racine, "ab")) is not None
+    cache.fermer()
+
+
+def test_rescan_reutilise_les_dossiers_inchanges(racine):
+    for chemin in ("x/vide", "y"):
+        os.makedirs(os.path.join(racine, chemin))
+    open(os.path.join(racine, "y", "f.txt"), "w").close()
+
+    assert scanner_vides(racine) == (
+        [os.path.join(racine, "x")], {'succes': 0, 'echecs': 4})
+    assert scanner_vides(racine) == (
+        [os.path.join(racine, "x")], {'succes': 4, 'echecs': 0})
+
+
+def test_renommage_d_un_sous_dossier_invalide_le_parent(racine):
+    os.makedirs(os.path.join(racine, "x", "vide"))
+    os.makedirs(os.path.join(racine, "y"))
+    open(os.path.join(racine, "y", "f.txt"), "w").close()
+    scanner_vides(racine)
+
+    # vide -> autre, qui reçoit un fichier : x n'est plus vide
+    os.rename(os.path.join(racine, "x", "vide"), os.path.join(racine, "x", "autre"))
+    open(os.path.join(racine, "x", "autre", "g.txt"), "w").close()
+    decaler_mtime(os.path.join(racine, "x"))
+    decaler_mtime(os.path.join(racine, "x", "autre"))
+
+    trouves, stats = scanner_vides(racine)
+    assert trouves == []
+    # racine et y repris du cache ; x (renommage) et autre (inconnu) relus
+    assert stats == {'succes': 2, 'echecs': 2}
+
+
+def test_analyse_disque_suit_un_dossier_renomme(racine):
+    os.makedirs(os.path.join(racine, "a"))
+    with open(os.path.join(racine, "a", "gros.bin"), "wb") as f:
+        f.truncate(2 * 1024 * 1024)
+
+    def analyser():
+        return AnalyseDisque(racine, taille_min_mo=1, nb_max=10).executer()
+
+    premier = analyser()
+    assert [f['chemin'] for f in premier['gros_fichiers']] == [
+        os.path.join(racine, "a", "gros.bin")]
+
+    os.rename(os.path.join(racine, "a"), os.path.join(racine, "b"))
+    decaler_mtime(racine)
+    second = analyser()
+    assert [f['chemin'] for f in second['gros_fichiers']] == [
+        os.path.join(racine, "b", "gros.bin")]
+    assert second['total_octets'] == premier['total_octets']
+    # b a gardé la date de a, mais son chemin est inconnu du cache : relu
+    assert second['cache'] == {'succes': 0, 'echecs': 2}
+    assert analyser()['cache'] == {'succes': 2, 'echecs': 0}
+
+
+def test_analyse_disque_instantanes_du_classement(racine, monkeypatch):
+    monkeypatch.setattr("analyse_dossiers.INTERVALLE_CLASSEMENT", 0)
+    for i in range(6):
+        dossier = os.path.join(racine, f"d{i}")
+        os.makedirs(dossier)
+        with open(os.path.join(dossier, "gros.bin"), "wb") as f:
+            f.truncate((i + 1) * 1024 * 1024)
+
+    instantanes = []
+    resultats = AnalyseDisque(racine, taille_min_mo=1, nb_max=3,
+                              utiliser_cache=False).executer(
+        classement=instantanes.append)
+    assert instantanes
+    # Chaque instantané est un classement complet, trié, borné à nb_max :
+    # les fichiers évincés du tas n'y figurent plus
+    for instantane in instantanes:
+        tailles = [f['taille'] for f in instantane]
+        assert len(tailles) <= 3 and tailles == sorted(tailles, reverse=True)
+    assert [f['taille'] for f in resultats['gros_fichiers']] == [
+        6 * 1024 * 1024, 5 * 1024 * 1024, 4 * 1024 * 1024]
@@ -0,0 +1,100 @@
+"""Tests du cache de l'inventaire des programmes (cache_programmes.py)."""
+
+import itertools
+
+import pytest
+
+import cache_programmes
+from cache_programmes import CacheProgrammes, DeltaProgrammes, calculer_delta
+
+INVENTAIRE = [
+    ("Firefox", "118.0", "C:\\Program Files\\Mozilla Firefox"),
+    ("7-Zip", "23.01", "C:\\Program Files\\7-Zip"),
+    ("Python", "3.11.5", "C:\\Python311"),
+    ("Python", "3.12.0", "C:\\Python312"),
+]
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # Horloge strictement croissante : un enregistrement par "seconde"
+    horloge = itertools.count(1000)
+    monkeypatch.setattr(cache_programmes.time, "time", lambda: float(next(horloge)))
+    cache = CacheProgrammes(str(tmp_path / "programmes.db"))
+    yield cache
+    cache.fermer()
+
+
+def test_delta_ajout_suppression_mise_a_jour():
+    nouveaux = [
+        ("Firefox", "119.0", "C:\\Program Files\\Mozilla Firefox"),
+        ("Python", "3.11.5", "C:\\Python311"),
+        ("Python", "3.12.1", "C:\\Python312"),
+        ("Git", "2.42.0", "C:\\Program Files\\Git"),
+    ]
+    delta = calculer_delta(INVENTAIRE, nouveaux)
+    assert delta.ajouts == [("Git", "2.42.0", "C:\\Program Files\\Git")]
+    assert delta.suppressions == [("7-Zip", "23.01", "C:\\Program Files\\7-Zip")]
+    # Même nom, chemins différents : deux programmes distincts
+    assert delta.mises_a_jour == [
+        (INVENTAIRE[0], nouveaux[0]),
+        (INVENTAIRE[3], nouveaux[2]),
+    ]
+
+
+def test_delta_sans_changement():
+    assert calculer_delta(INVENTAIRE, list(reversed(INVENTAIRE))) == ([], [], [])
+    assert calculer_delta([], INVENTAIRE).ajouts == INVENTAIRE
+
+
+def test_enregistrer_et_charger(cache):
+    assert cache.charger() == (None, [])
+    cache.enregistrer("sig-1", INVENTAIRE, calculer_delta([], INVENTAIRE))
+    assert cache.charger() == ("sig-1", INVENTAIRE)
+    # Premier inventaire : tout est ajouté
+    assert {c['changement'] for c in cache.historique()} == {'ajout'}
+
+
+def test_historique_des_changements(cache):
+    cache.enregistrer("sig-1", INVENTAIRE, calculer_delta([], INVENTAIRE),
+                      historiser=False)
+    assert cache.historique() == []
+
+    nouveaux = [("Firefox", "119.0", INVENTAIRE[0][2])] + INVENTAIRE[2:] + [
+        ("Git", "2.42.0", "C:\\Program Files\\Git")]
+    cache.enregistrer("sig-2", nouveaux, calculer_delta(INVENTAIRE, nouveaux))
+    assert cache.charger() == ("sig-2", nouveaux)
+
+    historique = {c['changement']: c for c in cache.historique()}
+    assert set(historique) == {'ajout', 'suppression', 'mise_a_jour'}
+    assert historique['ajout']['nom'] == "Git"
+    assert historique['ajout']['ancienne_version'] is None
+    assert historique['ajout']['nouvelle_version'] == "2.42.0"
+    assert historique['suppression']['nom'] == "7-Zip"
+    assert historique['suppression']['ancienne_version'] == "23.01"
+    assert historique['suppression']['nouvelle_version'] is None
+    assert historique['mise_a_jour']['chemin'] == INVENTAIRE[0][2]
+    assert (historique['mise_a_jour']['ancienne_version'],
+            historique['mise_a_jour']['nouvelle_version']) == ("118.0", "119.0")
+
+
+def test_historique_du_plus_recent_au_plus_ancien(cache):
+    for i in range(5):
+        cache.enregistrer(f"sig-{i}", [], DeltaProgrammes(
+            [("Outil", f"1.{i}", "C:\\Outil")], [], []))
+    versions = [c['nouvelle_version'] for c in cache.historique()]
+    assert versions == ["1.4", "1.3", "1.2", "1.1", "1.0"]
+    assert [c['nouvelle_version'] for c in cache.historique(limite=2)] == ["1.4", "1.3"]
+
+
+def test_historique_reduit(tmp_path, monkeypatch):
+    horloge = itertools.count(1000)
+    monkeypatch.setattr(cache_programmes.time, "time", lambda: float(next(horloge)))
+    with CacheProgrammes(str(tmp_path / "programmes.db"), nb_max_historique=5) as cache:
+        for i in range(4):
+            ajouts = [(f"Outil {i}-{j}", "1.0", f"C:\\Outil{i}{j}") for j in range(2)]
+            cache.enregistrer(f"sig-{i}", ajouts, DeltaProgrammes(ajouts, [], []))
+        noms = [c['nom'] for c in cache.historique()]
+    # Les 5 changements les plus récents ; les plus anciens sont effacés
+    assert sorted(noms) == ["Outil 1-1", "Outil 2-0", "Outil 2-1",
+                            "Outil 3-0", "Outil 3-1"]
@@ -0,0 +1,153 @@
+"""Tests du mode ligne de commande (cli.py) : codes de sortie et JSON Lines."""
+
+import json
+import os
+
+import pytest
+
+import analyse_dossiers
+from cli import CODE_ERREURS, CODE_INTERRUPTION, CODE_SUCCES, CODE_USAGE, main
+
+
+def lancer(capsys, *argv):
+    """Exécute main(argv) ; retourne le code et les enregistrements émis."""
+    code = main(list(argv))
+    enregistrements = [json.loads(ligne)
+                       for ligne in capsys.readouterr().out.splitlines()]
+    return code, enregistrements
+
+
+def par_type(enregistrements, type_enregistrement):
+    return [e for e in enregistrements if e['type'] == type_enregistrement]
+
+
+@pytest.fixture
+def arborescence(racine):
+    """Deux branches vides (dont une imbriquée) et un dossier non vide."""
+    os.makedirs(os.path.join(racine, "vide", "sous_vide"))
+    os.makedirs(os.path.join(racine, "autre_vide"))
+    os.makedirs(os.path.join(racine, "plein"))
+    open(os.path.join(racine, "plein", "f.txt"), "w").close()
+    return racine
+
+
+@pytest.fixture
+def temp(tmp_path, monkeypatch):
+    """Dossier TEMP/TMP simulé pour l'option temp_windows."""
+    dossier = tmp_path / "temp"
+    (dossier / "sous").mkdir(parents=True)
+    for nom in ("a.tmp", "b.tmp", os.path.join("sous", "c.tmp")):
+        (dossier / nom).write_bytes(b"x" * 10)
+    monkeypatch.setenv("TEMP", str(dossier))
+    monkeypatch.setenv("TMP", str(dossier))
+    return dossier
+
+
+def fichiers(dossier):
+    return sorted(os.path.relpath(os.path.join(d, f), dossier)
+                  for d, _, noms in os.walk(dossier) for f in noms)
+
+
+def test_scan_enregistrements_jsonl(capsys, arborescence):
+    code, enregistrements = lancer(capsys, "scan", arborescence)
+    assert code == CODE_SUCCES
+    assert all(isinstance(e['type'], str) for e in enregistrements)
+    assert enregistrements[-1]['type'] == 'resume'
+    assert sorted(e['chemin'] for e in par_type(enregistrements, 'dossier_vide')) == [
+        os.path.join(arborescence, "autre_vide"), os.path.join(arborescence, "vide")]
+    resume = enregistrements[-1]
+    assert resume['commande'] == 'scan' and resume['chemin'] == arborescence
+    assert resume['dossiers_vides'] == 2
+    assert (resume['supprimes'], resume['erreurs'], resume['simulation']) == (0, 0, False)
+    assert set(resume['cache']) == {'succes', 'echecs'}
+
+
+@pytest.mark.parametrize("argv", [
+    ("--dry-run", "scan", "{racine}", "--supprimer"),
+    ("scan", "{racine}", "--supprimer", "--dry-run"),
+])
+def test_scan_dry_run_ne_supprime_rien(capsys, arborescence, argv):
+    code, enregistrements = lancer(
+        capsys, *(a.format(racine=arborescence) for a in argv))
+    assert code == CODE_SUCCES
+    assert os.path.isdir(os.path.join(arborescence, "vide", "sous_vide"))
+    assert os.path.isdir(os.path.join(arborescence, "autre_vide"))
+    assert {e['statut'] for e in par_type(enregistrements, 'suppression')} == {'simulation'}
+    assert enregistrements[-1]['simulation'] is True
+    assert enregistrements[-1]['supprimes'] == 0
+
+
+def test_scan_supprimer(capsys, arborescence):
+    code, enregistrements = lancer(capsys, "scan", arborescence, "--supprimer")
+    assert code == CODE_SUCCES
+    assert sorted(os.listdir(arborescence)) == ["plein"]
+    assert enregistrements[-1]['supprimes'] == 2
+
+
+def test_scan_erreur_de_suppression(capsys, arborescence, monkeypatch):
+    def refuser(dossier):
+        raise PermissionError(13, "accès refusé", dossier)
+
+    monkeypatch.setattr(analyse_dossiers, "supprimer_arborescence_vide", refuser)
+    code, enregistrements = lancer(capsys, "scan", arborescence, "--supprimer")
+    assert code == CODE_ERREURS
+    suppressions = par_type(enregistrements, 'suppression')
+    assert {e['statut'] for e in suppressions} == {'erreur'}
+    assert all(e['erreur'] for e in suppressions)
+    assert enregistrements[-1]['erreurs'] == 2
+
+
+def test_cleanup_dry_run_ne_supprime_rien(capsys, temp):
+    avant = fichiers(temp)
+    code, enregistrements = lancer(
+        capsys, "cleanup", "--options", "temp_windows", "--dry-run")
+    assert code == CODE_SUCCES
+    assert fichiers(temp) == avant
+    assert par_type(enregistrements, 'estimation')[0] == {
+        'type': 'estimation', 'option': 'temp_windows',
+        'fichiers': 3, 'octets': 30, 'dossiers': 1}
+    resume = enregistrements[-1]
+    assert resume['type'] == 'resume' and resume['simulation'] is True
+    assert resume['options'] == ['temp_windows'] and resume['espace_estime'] == 30
+
+
+def test_cleanup(capsys, temp):
+    code, enregistrements = lancer(capsys, "cleanup", "--options", "temp_windows")
+    assert code == CODE_SUCCES
+    assert fichiers(temp) == [] and temp.is_dir()
+    categorie, = par_type(enregistrements, 'categorie')
+    assert categorie['option'] == 'temp_windows' and categorie['fichiers'] == 3
+    resume = enregistrements[-1]
+    assert (resume['fichiers_supprimes'], resume['espace_libere']) == (3, 30)
+    assert resume['erreurs'] == 0 and resume['simulation'] is False
+
+
+def test_cleanup_option_inconnue(capsys, temp):
+    code, enregistrements = lancer(capsys, "cleanup", "--options", "temp_windows,disque_c")
+    assert code == CODE_USAGE
+    assert enregistrements == []
+    assert len(fichiers(temp)) == 3
+
+
+@pytest.mark.parametrize("argv", [(), ("inconnue",), ("disk", "--nb-max", "beaucoup")])
+def test_arguments_invalides(capsys, argv):
+    with pytest.raises(SystemExit) as sortie:
+        main(list(argv))
+    assert sortie.value.code == CODE_USAGE
+    assert capsys.readouterr().out == ""
+
+
+def test_exception_code_erreurs(capsys, arborescence, monkeypatch):
+    def echouer(self, *args, **kwargs):
+        raise RuntimeError("disque débranché")
+
+    monkeypatch.setattr(analyse_dossiers.RechercheDossiersVides, "executer", echouer)
+    assert lancer(capsys, "scan", arborescence) == (CODE_ERREURS, [])
+
+
+def test_interruption(capsys, arborescence, monkeypatch):
+    def interrompre(self, *args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(analyse_dossiers.RechercheDossiersVides, "executer", interrompre)
+    assert lancer(capsys, "scan", arborescence) == (CODE_INTERRUPTION, [])
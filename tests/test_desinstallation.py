@@ -0,0 +1,89 @@
+"""Tests de la file de désinstallation (desinstallation.py) : arrêt et états."""
+
+import subprocess
+
+import pytest
+
+import desinstallation
+import paquets_linux
+from desinstallation import (ANNULE, EN_ATTENTE, EN_COURS, TERMINE,
+                             FileDesinstallation, gestionnaire_linux)
+from registre import FournisseurMemoire, InventaireRegistre
+
+
+@pytest.fixture
+def statuts():
+    etats = {}
+
+    def statut(cle, etat, message):
+        etats.setdefault(cle, []).append(etat)
+
+    statut.etats = etats
+    return statut
+
+
+@pytest.fixture
+def info_dpkg(tmp_path, monkeypatch):
+    """Listes de fichiers dpkg de vlc et gimp (Multi-Arch: same)."""
+    dossier = tmp_path / "info"
+    dossier.mkdir()
+    for nom in ("vlc.list", "gimp:amd64.list"):
+        (dossier / nom).write_text("")
+    monkeypatch.setattr(
+        desinstallation, "paquet_dpkg",
+        lambda nom: paquets_linux.paquet_dpkg(nom, str(dossier)))
+
+
+def test_gestionnaire_linux(info_dpkg):
+    assert gestionnaire_linux("vlc", "") == "apt"
+    assert gestionnaire_linux("gimp", "") == "apt"
+    assert gestionnaire_linux("htop", "") == "rpm"
+    assert gestionnaire_linux(
+        "org.gnome.Maps", "/var/lib/flatpak/app/org.gnome.Maps/x86_64/stable/active") == "flatpak"
+    assert gestionnaire_linux("core22", "/snap/core22/current") == "snap"
+
+
+def test_linux_groupes_non_lances_annules(monkeypatch, statuts, info_dpkg):
+    monkeypatch.setattr(desinstallation.platform, "system", lambda: "Linux")
+    file = FileDesinstallation([
+        ("vlc", "vlc", ""),
+        ("gimp", "gimp", ""),
+        ("org.gnome.Maps", "org.gnome.Maps", "/var/lib/flatpak/app/org.gnome.Maps"),
+    ])
+    commandes = []
+
+    def run(cmd, **options):
+        commandes.append(cmd)
+        # Arrêt demandé pendant le premier gestionnaire
+        file.stop()
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(desinstallation.subprocess, "run", run)
+    resultats = file.executer(statut=statuts)
+
+    assert commandes == [["sudo", "apt-get", "remove", "-y", "vlc", "gimp"]]
+    assert {r['cle']: r['etat'] for r in resultats} == {
+        "vlc": TERMINE, "gimp": TERMINE, "org.gnome.Maps": ANNULE}
+    assert statuts.etats["org.gnome.Maps"] == [EN_ATTENTE, ANNULE]
+    assert statuts.etats["vlc"] == [EN_ATTENTE, EN_COURS, TERMINE]
+    annule = next(r for r in resultats if r['etat'] == ANNULE)
+    assert not annule['succes']
+
+
+def test_windows_arret_avant_lancement(monkeypatch, statuts):
+    monkeypatch.setattr(desinstallation.platform, "system", lambda: "Windows")
+    inventaire = InventaireRegistre(FournisseurMemoire({'HKLM': {
+        '{A}': {'DisplayName': 'Java 7', 'UninstallString': 'MsiExec.exe /X{A}'},
+        '{B}': {'DisplayName': 'Flash', 'UninstallString': 'MsiExec.exe /X{B}'},
+    }}))
+    monkeypatch.setattr(desinstallation, "inventaire_partage", lambda: inventaire)
+    monkeypatch.setattr(desinstallation.subprocess, "Popen", None)
+
+    file = FileDesinstallation([("Java 7", "Java 7", ""), ("Flash", "Flash", ""),
+                                ("Absent", "Absent", "")])
+    file.stop()
+    resultats = file.executer(statut=statuts)
+
+    etats = {r['cle']: r['etat'] for r in resultats}
+    assert etats == {"Java 7": ANNULE, "Flash": ANNULE, "Absent": desinstallation.ECHEC}
+    assert all(statuts.etats[cle][-1] == etat for cle, etat in etats.items())
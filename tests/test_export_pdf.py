@@ -0,0 +1,79 @@
+"""Tests de l'export PDF par blocs (export_pdf.py)."""
+
+import os
+import re
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+from export_pdf import DocumentTableau, ExportPdf, TAILLE_BLOC  # noqa: E402
+
+ENTETES = ["Nom", "Chemin"]
+LARGEURS = [150, 380]
+
+
+def lignes(nb, pendant=None):
+    for i in range(nb):
+        if pendant:
+            pendant(i)
+        yield (f"programme {i}", f"C:\\Program Files\\Editeur\\Programme {i}")
+
+
+def nb_pages(fichier):
+    with open(fichier, "rb") as f:
+        return len(re.findall(rb"/Type\s*/Page(?!s)", f.read()))
+
+
+def test_export_par_blocs(tmp_path, monkeypatch):
+    filtrer = DocumentTableau.filterFlowables
+    tailles = []
+
+    def filtrer_espion(self, flowables):
+        filtrer(self, flowables)
+        if flowables is self.histoire:
+            tailles.append(len(flowables))
+
+    monkeypatch.setattr(DocumentTableau, "filterFlowables", filtrer_espion)
+    fichier = str(tmp_path / "programmes.pdf")
+    nb = 10 * TAILLE_BLOC + 7
+    progression = []
+    export = ExportPdf(fichier, "Programmes", ENTETES, LARGEURS, lignes(nb), total=nb)
+    assert export.executer(progression.append) == nb
+    assert export.nb_lignes == nb
+    # Jamais plus du bloc en cours et du suivant dans l'histoire
+    assert tailles and max(tailles) <= 2
+    assert progression[0] == 0 and progression[-1] == 100
+    assert progression == sorted(progression)
+    assert nb_pages(fichier) >= 11
+
+
+def test_cellules_longues_coupees(tmp_path):
+    fichier = str(tmp_path / "longues.pdf")
+    longues = [("x" * 10, "dossier\\" * 80) for _ in range(3)]
+    export = ExportPdf(fichier, "Longues", ENTETES, LARGEURS, iter(longues), total=3)
+    assert export.executer() == 3
+    assert os.path.getsize(fichier) > 0
+
+
+def test_export_vide(tmp_path):
+    fichier = str(tmp_path / "vide.pdf")
+    assert ExportPdf(fichier, "Vide", ENTETES, LARGEURS, iter([])).executer() == 0
+    assert nb_pages(fichier) == 1
+
+
+def test_export_arrete_supprime_le_fichier(tmp_path):
+    fichier = str(tmp_path / "programmes.pdf")
+    export = None
+
+    def arreter(i):
+        if i == 250:
+            export.stop()
+
+    export = ExportPdf(fichier, "Programmes", ENTETES, LARGEURS,
+                       lignes(1000, arreter), total=1000)
+    progression = []
+    export.executer(progression.append)
+    assert not os.path.exists(fichier)
+    assert 100 not in progression
+    assert export.nb_lignes < 1000
@@ -0,0 +1,140 @@
+"""Tests des exports de données (exports.py) : schéma, formats, arrêt."""
+
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from exports import (DATE, ENTIER, REEL, TEXTE, ExportDonnees, JeuDonnees,
+                     jeu_securite, jeux_disque)
+
+SECURITE = {
+    'ports_ouverts': [
+        {'protocole': 'TCP', 'adresse': '0.0.0.0', 'port': 22,
+         'processus': 'sshd (812)', 'remarque': 'Exposé sur toutes les interfaces'},
+        {'protocole': 'UDP', 'adresse': '127.0.0.1', 'port': 5353,
+         'processus': '', 'remarque': 'Local uniquement'},
+    ],
+    'programmes_obsoletes': [
+        {'nom': 'Java 7', 'version': '7.0.80', 'raison': 'Programme obsolète ou non maintenu'},
+        {'nom': 'Flash', 'version': 32, 'raison': 'Programme obsolète ou non maintenu'},
+    ],
+    'services_suspects': [
+        {'service': 'DiagTrack', 'description': 'Télémétrie', 'remarque': 'Service potentiellement inutile'},
+    ],
+}
+
+
+def test_jeu_securite_schema_fixe():
+    jeu = jeu_securite(SECURITE)
+    types = dict(zip(jeu.colonnes, jeu.types))
+    assert types['port'] == ENTIER
+    # Valeurs mélangées (texte et entier) : colonne texte
+    assert types['version'] == TEXTE
+    lignes = [dict(zip(jeu.colonnes, ligne)) for ligne in jeu.lignes]
+    assert lignes[0]['port'] == 22 and lignes[0]['nom'] is None
+    assert lignes[2]['port'] is None and lignes[2]['nom'] == 'Java 7'
+    assert lignes[3]['version'] == '32'
+
+
+def test_partitions_entiers_et_reels():
+    jeu, = jeux_disque({'partitions': [
+        {'nom': '/', 'total': 100, 'utilise': 0, 'libre': 100, 'pourcentage': 0},
+        {'nom': '/home', 'total': 200, 'utilise': 90, 'libre': 110, 'pourcentage': 45.0},
+    ]})
+    assert jeu.types == [TEXTE, ENTIER, ENTIER, ENTIER, REEL]
+
+
+def test_export_parquet_securite(tmp_path):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    fichier = str(tmp_path / "securite.parquet")
+    # Lots de 2 lignes : le premier lot n'a aucun nom, le deuxième aucun port
+    assert ExportDonnees(fichier, jeu_securite(SECURITE), taille_lot=2).executer() == 5
+    table = pyarrow_parquet.read_table(fichier)
+    assert str(table.schema.field('port').type) == 'int64'
+    assert table.column('port').to_pylist() == [22, 5353, None, None, None]
+    assert table.column('version').to_pylist() == [None, None, '7.0.80', '32', None]
+    assert table.column('categorie').to_pylist()[-1] == 'services_suspects'
+
+
+def test_export_parquet_gros_fichiers_dates(tmp_path):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    date = datetime(2024, 5, 1, 12, 30)
+    jeu, = jeux_disque({'gros_fichiers': [
+        {'nom': 'a.iso', 'chemin': '/a.iso', 'taille': 5 * 1024**3, 'date_modif': date}]})
+    assert jeu.types[3] == DATE
+    fichier = str(tmp_path / "gros.parquet")
+    ExportDonnees(fichier, jeu).executer()
+    assert pyarrow_parquet.read_table(fichier).column('date_modif').to_pylist() == [date]
+
+
+def test_export_parquet_vide_garde_le_schema(tmp_path):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    fichier = str(tmp_path / "vide.parquet")
+    ExportDonnees(fichier, JeuDonnees("Vide", ["n", "t"], [], 0, [ENTIER, TEXTE])).executer()
+    schema = pyarrow_parquet.read_schema(fichier)
+    assert [str(schema.field(c).type) for c in ("n", "t")] == ["int64", "string"]
+
+
+@pytest.mark.parametrize("extension", [".csv", ".csv.gz", ".jsonl"])
+def test_export_texte_valeurs_absentes(tmp_path, extension):
+    fichier = str(tmp_path / f"securite{extension}")
+    ExportDonnees(fichier, jeu_securite(SECURITE)).executer()
+    ouvrir = gzip.open if extension.endswith(".gz") else open
+    with ouvrir(fichier, "rt", encoding="utf-8", newline="") as f:
+        if extension.startswith(".csv"):
+            lignes = list(csv.DictReader(f))
+            assert lignes[0]['port'] == '22' and lignes[0]['nom'] == ''
+        else:
+            lignes = [json.loads(ligne) for ligne in f]
+            assert lignes[0]['port'] == 22 and lignes[0]['nom'] is None
+    assert len(lignes) == 5
+
+
+def jeu_long(nb, pendant=None):
+    """nb lignes ; pendant(i) est appelé avant la ligne i."""
+    def lignes():
+        for i in range(nb):
+            if pendant:
+                pendant(i)
+            yield (f"ligne {i}", i)
+    return JeuDonnees("Long", ["texte", "nombre"], lignes(), nb, [TEXTE, ENTIER])
+
+
+@pytest.mark.parametrize("extension", [".csv", ".csv.gz", ".jsonl", ".parquet"])
+def test_export_arrete_supprime_le_fichier(tmp_path, extension):
+    if extension == ".parquet":
+        pytest.importorskip("pyarrow")
+    fichier = str(tmp_path / f"long{extension}")
+    export = None
+
+    def arreter(i):
+        if i == 250:
+            export.stop()
+
+    export = ExportDonnees(fichier, jeu_long(1000, arreter), taille_lot=100)
+    progression = []
+    export.executer(progression.append)
+    assert not os.path.exists(fichier)
+    assert 100 not in progression
+
+
+def test_export_en_erreur_supprime_le_fichier(tmp_path):
+    def echouer(i):
+        if i == 150:
+            raise OSError(28, "Plus d'espace disponible sur le périphérique")
+
+    fichier = str(tmp_path / "long.csv")
+    with pytest.raises(OSError):
+        ExportDonnees(fichier, jeu_long(1000, echouer), taille_lot=100).executer()
+    assert not os.path.exists(fichier)
+
+
+def test_export_complet_conserve(tmp_path):
+    fichier = str(tmp_path / "long.csv")
+    assert ExportDonnees(fichier, jeu_long(1000), taille_lot=100).executer() == 1000
+    with open(fichier, encoding="utf-8") as f:
+        assert sum(1 for _ in f) == 1001
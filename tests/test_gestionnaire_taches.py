@@ -0,0 +1,159 @@
+"""Tests du gestionnaire de tâches (gestionnaire_taches.py), sans Qt."""
+
+import threading
+import time
+
+import pytest
+
+from gestionnaire_taches import (
+    ANNULE, CPU, ECHEC, IO, PRIORITE_BASSE, PRIORITE_HAUTE, PRIORITE_NORMALE,
+    TERMINE, GestionnaireTaches, JetonAnnulation)
+
+DELAI = 5.0
+
+
+@pytest.fixture
+def taches():
+    gestionnaire = GestionnaireTaches(nb_io=1, nb_cpu=1)
+    yield gestionnaire
+    gestionnaire.arreter(delai=DELAI)
+
+
+def occuper(taches, classe=IO):
+    """Occupe l'unique thread de la classe ; retourne l'événement qui le libère."""
+    liberer = threading.Event()
+    demarre = threading.Event()
+
+    def bloquer():
+        demarre.set()
+        liberer.wait(DELAI)
+
+    taches.soumettre(f"occupe-{classe}", bloquer, classe=classe)
+    assert demarre.wait(DELAI)
+    return liberer
+
+
+def test_dedoublonnage_par_cle(taches):
+    liberer = occuper(taches)
+    appels = []
+    premier = taches.soumettre("scan", appels.append, 1)
+    second = taches.soumettre("scan", appels.append, 2)
+    assert second is premier and taches.en_cours("scan") is premier
+    liberer.set()
+    assert premier.attendre(DELAI)
+    assert appels == [1] and premier.etat == TERMINE
+    assert taches.en_cours("scan") is None
+    # Clé libérée : un nouveau travail est accepté
+    troisieme = taches.soumettre("scan", appels.append, 3)
+    assert troisieme is not premier and troisieme.attendre(DELAI)
+    assert appels == [1, 3]
+
+
+def test_ordre_des_priorites(taches):
+    liberer = occuper(taches)
+    ordre = []
+    travaux = [
+        taches.soumettre("basse", ordre.append, "basse", priorite=PRIORITE_BASSE),
+        taches.soumettre("normale-1", ordre.append, "normale-1"),
+        taches.soumettre("haute", ordre.append, "haute", priorite=PRIORITE_HAUTE),
+        taches.soumettre("normale-2", ordre.append, "normale-2",
+                         priorite=PRIORITE_NORMALE),
+    ]
+    liberer.set()
+    assert all(travail.attendre(DELAI) for travail in travaux)
+    # Par priorité, puis dans l'ordre de soumission
+    assert ordre == ["haute", "normale-1", "normale-2", "basse"]
+
+
+def test_classes_independantes(taches):
+    liberer = occuper(taches, IO)
+    travail = taches.soumettre("export", lambda: "fait", classe=CPU)
+    assert travail.attendre(DELAI) and travail.resultat == "fait"
+    liberer.set()
+    with pytest.raises(ValueError):
+        taches.soumettre("inconnu", print, classe="gpu")
+
+
+def test_annulation_en_file(taches):
+    liberer = occuper(taches)
+    appels, arrets = [], []
+    travail = taches.soumettre("scan", appels.append, 1,
+                               arret=lambda: arrets.append(1))
+    travail.annuler()
+    travail.annuler()
+    liberer.set()
+    assert travail.attendre(DELAI)
+    assert travail.etat == ANNULE and appels == []
+    # stop() de la tâche appelé une seule fois
+    assert arrets == [1]
+    assert taches.en_cours("scan") is None
+
+
+def test_annulation_en_cours_via_jeton(taches):
+    demarre = threading.Event()
+    jeton_tache = JetonAnnulation()
+
+    def tache():
+        demarre.set()
+        jeton_tache.attendre(DELAI)
+
+    travail = taches.soumettre("scan", tache, arret=jeton_tache.annuler)
+    assert demarre.wait(DELAI)
+    taches.annuler("scan")
+    assert travail.attendre(DELAI) and travail.etat == ANNULE
+    assert jeton_tache.annule
+
+
+def test_jeton_lie_apres_annulation():
+    jeton = JetonAnnulation()
+    jeton.annuler()
+    appels = []
+    jeton.lier(lambda: appels.append(1))
+    assert appels == [1] and jeton.attendre(0)
+
+
+def test_echec_enregistre(taches):
+    travail = taches.soumettre("export", lambda: 1 / 0)
+    assert travail.attendre(DELAI)
+    assert travail.etat == ECHEC and isinstance(travail.erreur, ZeroDivisionError)
+
+
+def test_arreter_delai_commun():
+    taches = GestionnaireTaches(nb_io=4, nb_cpu=1)
+    liberer = threading.Event()
+    demarres = threading.Semaphore(0)
+
+    def sourd():
+        # Ignore l'annulation : seul le délai d'arreter() borne l'attente
+        demarres.release()
+        liberer.wait(DELAI)
+
+    for i in range(4):
+        taches.soumettre(f"sourd-{i}", sourd)
+    for _ in range(4):
+        assert demarres.acquire(timeout=DELAI)
+    debut = time.monotonic()
+    try:
+        assert taches.arreter(delai=0.3) is False
+        # Un seul délai pour les quatre threads, pas 4 x 0,3 s
+        assert time.monotonic() - debut < 0.9
+    finally:
+        liberer.set()
+    with pytest.raises(RuntimeError):
+        taches.soumettre("apres", print)
+
+
+def test_arreter_annule_tout():
+    taches = GestionnaireTaches(nb_io=1, nb_cpu=1)
+    jeton_tache = JetonAnnulation()
+    demarre = threading.Event()
+
+    def cooperatif():
+        demarre.set()
+        jeton_tache.attendre(DELAI)
+
+    en_cours = taches.soumettre("scan", cooperatif, arret=jeton_tache.annuler)
+    en_file = taches.soumettre("disque", print)
+    assert demarre.wait(DELAI)
+    assert taches.arreter(delai=DELAI) is True
+    assert en_cours.etat == ANNULE and en_file.etat == ANNULE
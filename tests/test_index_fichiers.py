@@ -0,0 +1,71 @@
+"""Tests de l'index persistant des noms de fichiers (index_fichiers.py)."""
+
+import os
+import shutil
+
+import pytest
+
+from index_fichiers import IndexFichiers
+
+
+@pytest.fixture
+def index(racine, tmp_path):
+    for chemin in ("docs/Rapport_2024.pdf", "docs/ab.txt", "docs/xab.log",
+                   "src/a.py", "src/rapport%.txt", "src/b_c.txt"):
+        complet = os.path.join(racine, chemin)
+        os.makedirs(os.path.dirname(complet), exist_ok=True)
+        open(complet, "w").close()
+    index = IndexFichiers(str(tmp_path / "index.db"))
+    index.mettre_a_jour(racine)
+    yield index
+    index.fermer()
+
+
+def noms(index, motif, racine=None):
+    return sorted(os.path.basename(c) for c in index.rechercher(motif, racine))
+
+
+def test_sous_chaine_trigrammes(index):
+    assert noms(index, "RAPPORT") == ["Rapport_2024.pdf", "rapport%.txt"]
+
+
+@pytest.mark.parametrize("motif, attendus", [
+    ("ab", ["ab.txt", "xab.log"]),
+    ("a", ["Rapport_2024.pdf", "a.py", "ab.txt", "rapport%.txt", "xab.log"]),
+    ("%", ["rapport%.txt"]),
+    ("_", ["Rapport_2024.pdf", "b_c.txt"]),
+    ("", ["Rapport_2024.pdf", "a.py", "ab.txt", "b_c.txt", "rapport%.txt", "xab.log"]),
+])
+def test_motifs_de_moins_de_trois_caracteres(index, motif, attendus):
+    # Trop courts pour les trigrammes FTS5 : recherche LIKE, jokers échappés
+    assert noms(index, motif) == attendus
+
+
+def test_glob_et_prefixe(index):
+    assert noms(index, "*.txt") == ["ab.txt", "b_c.txt", "rapport%.txt"]
+    assert noms(index, "rap*") == ["Rapport_2024.pdf", "rapport%.txt"]
+    assert noms(index, "?.py") == ["a.py"]
+
+
+def decaler_mtime(dossier):
+    """Date de modification nettement différente, quelle que soit la résolution."""
+    mtime = os.stat(dossier).st_mtime + 10
+    os.utime(dossier, (mtime, mtime))
+
+
+def test_mise_a_jour_incrementale(index, racine):
+    assert index.est_construit(racine)
+    assert index.derniere_maj(racine) is not None
+    assert index.derniere_maj(racine + "-inconnue") is None
+    os.remove(os.path.join(racine, "src", "a.py"))
+    open(os.path.join(racine, "docs", "nouveau.txt"), "w").close()
+    decaler_mtime(os.path.join(racine, "src"))
+    decaler_mtime(os.path.join(racine, "docs"))
+    stats = index.mettre_a_jour(racine)
+    assert stats['modifies'] == 2
+    assert noms(index, "nouveau") == ["nouveau.txt"]
+    assert noms(index, "a.py") == []
+
+    shutil.rmtree(os.path.join(racine, "src"))
+    assert index.mettre_a_jour(racine)['supprimes'] == 1
+    assert noms(index, "b_c") == []
@@ -0,0 +1,99 @@
+"""Tests des modèles de tables (modeles.py) : tri, filtre, ajout de lignes."""
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import Qt  # noqa: E402
+
+from modeles import ENTIER, TEXTE, IndexProgrammes, ModeleColonnes  # noqa: E402
+
+
+def modele_fichiers(lignes, taille_page=10):
+    modele = ModeleColonnes([("Nom", TEXTE, None), ("Taille", ENTIER, str)],
+                            taille_page=taille_page)
+    modele.definir_lignes(lignes)
+    return modele
+
+
+def affichees(modele):
+    while modele.canFetchMore():
+        modele.fetchMore()
+    return [modele.valeur(ligne, 0) for ligne in range(modele.rowCount())]
+
+
+def test_tri_numerique_sur_valeurs_brutes():
+    modele = modele_fichiers([("a", 9), ("b", 100), ("c", 20)])
+    modele.sort(1, Qt.DescendingOrder)
+    assert affichees(modele) == ["b", "c", "a"]
+    assert modele.texte(0, 1) == "100"
+
+
+def test_pagination():
+    modele = modele_fichiers([(str(i), i) for i in range(25)], taille_page=10)
+    assert modele.rowCount() == 10
+    assert len(affichees(modele)) == 25
+
+
+def test_ajout_sans_filtre_visible():
+    modele = modele_fichiers([("a", 1)])
+    modele.ajouter_lignes([("b", 2)])
+    assert affichees(modele) == ["a", "b"]
+
+
+def test_ajout_avec_filtre_actif():
+    modele = modele_fichiers([("alpha", 1), ("beta", 2)])
+    modele.filtrer([0])
+    assert affichees(modele) == ["alpha"]
+
+    # Sans prédicat, une ligne ajoutée sous filtre reste masquée
+    modele.ajouter_lignes([("alpine", 3)])
+    assert affichees(modele) == ["alpha"]
+
+    # Avec prédicat, seules les lignes qui correspondent apparaissent
+    modele.ajouter_lignes([("gamma", 4), ("alpaga", 5)],
+                          accepter=lambda ligne: "alp" in ligne[0])
+    assert affichees(modele) == ["alpha", "alpaga"]
+
+    # Retirer le filtre montre tout ; trier garde le filtre cohérent
+    modele.filtrer([0, 2, 4])
+    modele.sort(1, Qt.DescendingOrder)
+    assert affichees(modele) == ["alpaga", "alpine", "alpha"]
+    modele.filtrer(None)
+    assert len(affichees(modele)) == 5
+
+
+def test_index_programmes_affine_la_recherche_precedente():
+    index = IndexProgrammes([("Firefox", "120.0", ""), ("Fire Tool", "1", ""),
+                             ("Gimp", "2.10", "/usr/bin")])
+    assert index.filtrer("fire") == [0, 1]
+    assert index.filtrer("firef") == [0]
+    assert index.filtrer("2.1", "Version") == [2]
+    assert index.filtrer("g*p", "Programme") == [2]
+    assert index.filtrer("") is None
+
+
+def test_index_programmes_suit_l_ordre_de_stockage():
+    from cache_programmes import calculer_delta
+    from modeles import ModeleProgrammes
+
+    en_cache = [("Audacity", "3.4", ""), ("Chrome", "120", ""), ("Docker", "24", "")]
+    inventaire = [("Audacity", "3.4", ""), ("Blender", "4.0", ""),
+                  ("Chrome", "120", ""), ("Docker", "24", "")]
+    modele = ModeleProgrammes()
+    modele.definir_lignes(en_cache)
+
+    # Blender est inséré au milieu de l'inventaire, mais ajouté en fin de table
+    index = modele.actualiser(inventaire, calculer_delta(en_cache, inventaire))
+    assert [nom for nom, _, _ in modele.lignes()] == [
+        "Audacity", "Chrome", "Docker", "Blender"]
+    modele.filtrer(index.filtrer("blender"))
+    assert affichees(modele) == ["Blender"]
+    modele.filtrer(index.filtrer("120", "Version"))
+    assert affichees(modele) == ["Chrome"]
+
+    # Une mise à jour remplace la table : ordre de l'inventaire
+    a_jour = [("Audacity", "3.5", "")] + inventaire[1:]
+    index = modele.actualiser(a_jour, calculer_delta(inventaire, a_jour))
+    modele.filtrer(index.filtrer("3.5", "Version"))
+    assert affichees(modele) == ["Audacity"]
@@ -0,0 +1,251 @@
+"""Tests du moteur de suppression du nettoyage (nettoyage.py)."""
+
+import os
+import threading
+import time
+
+import pytest
+
+import nettoyage
+from nettoyage import (MoteurSuppression, Nettoyage, compteurs_vides,
+                       executer_par_peripherique)
+
+
+@pytest.fixture
+def temp(racine):
+    """Dossier temporaire simulé : 6 fichiers dont un verrouillé."""
+    for chemin in ("a.tmp", "verrouille.tmp", "sous/b.tmp", "sous/c.tmp",
+                   "sous/profond/d.tmp", "e.tmp"):
+        complet = os.path.join(racine, chemin)
+        os.makedirs(os.path.dirname(complet), exist_ok=True)
+        with open(complet, "wb") as f:
+            f.write(b"x" * 10)
+    return racine
+
+
+@pytest.fixture
+def fichier_verrouille(monkeypatch):
+    supprimer = os.remove
+
+    def remove(chemin, *args, **kwargs):
+        if os.path.basename(chemin) == "verrouille.tmp":
+            raise PermissionError(13, "fichier utilisé par un autre processus", chemin)
+        return supprimer(chemin, *args, **kwargs)
+
+    monkeypatch.setattr(os, "remove", remove)
+
+
+def test_details_seulement_pour_les_fichiers_supprimes(temp, fichier_verrouille):
+    moteur = MoteurSuppression(nb_workers=2, taille_lot=2)
+    compteurs = compteurs_vides()
+    moteur.supprimer(moteur.inventorier(temp), compteurs)
+
+    assert compteurs['fichiers'] == 5
+    assert compteurs['octets'] == 50
+    assert compteurs['erreurs'] == 1
+    assert "Supprimé: verrouille.tmp" not in moteur.details
+    assert sorted(moteur.details) == sorted(
+        f"Supprimé: {nom}" for nom in ("a.tmp", "b.tmp", "c.tmp", "d.tmp", "e.tmp"))
+    # Sous-dossiers vidés retirés, racine et fichier verrouillé conservés
+    assert os.listdir(temp) == ["verrouille.tmp"]
+    assert compteurs['dossiers'] == 2
+
+
+def test_simulation_ne_supprime_rien(temp):
+    moteur = MoteurSuppression(simulation=True, taille_lot=4)
+    compteurs = compteurs_vides()
+    moteur.supprimer(moteur.inventorier(temp), compteurs)
+    assert compteurs['fichiers'] == 6 and compteurs['octets'] == 60
+    assert len(moteur.details) == 6
+    assert all(d.startswith("À supprimer: ") for d in moteur.details)
+    assert len(os.listdir(temp)) == 4
+
+
+def test_details_plafonnes(temp):
+    moteur = MoteurSuppression(nb_max_details=2)
+    compteurs = compteurs_vides()
+    moteur.supprimer(moteur.inventorier(temp), compteurs)
+    assert compteurs['fichiers'] == 6
+    assert len(moteur.details) == 2 and moteur.details_omis == 4
+
+
+@pytest.fixture
+def temp_windows(racine, monkeypatch):
+    """Racine 'temp_windows' de 600 fichiers (plus de deux lots)."""
+    os.makedirs(os.path.join(racine, "sous"))
+    for i in range(600):
+        with open(os.path.join(racine, "sous" if i % 2 else "", f"f{i}.tmp"), "wb") as f:
+            f.write(b"x")
+    monkeypatch.setenv("TEMP", racine)
+    monkeypatch.setenv("TMP", "")
+    return racine
+
+
+def test_executer_sans_estimation_vide_au_fil_de_l_eau(temp_windows, monkeypatch):
+    racines_videes = []
+    vider = MoteurSuppression.vider
+
+    def espion(moteur, racine, compteurs):
+        racines_videes.append(racine)
+        return vider(moteur, racine, compteurs)
+
+    monkeypatch.setattr(MoteurSuppression, "vider", espion)
+    monkeypatch.setattr(MoteurSuppression, "inventorier", None)
+    resultats = Nettoyage({'temp_windows': True}).executer()
+
+    assert racines_videes == [temp_windows]
+    assert resultats['fichiers_supprimes'] == 600
+    assert os.listdir(temp_windows) == []
+
+
+def test_executer_sans_estimation_progression_du_dernier_nettoyage(temp_windows):
+    Nettoyage({'temp_windows': True}, simulation=True).executer()
+    valeurs = []
+    Nettoyage({'temp_windows': True}).executer(lambda v, m: valeurs.append(v))
+    # Rapportée aux 600 fichiers du premier passage : avance lot par lot
+    assert len([v for v in valeurs if 0 < v < 99]) >= 2
+    assert valeurs == sorted(valeurs)
+
+
+def test_estimation_progresse_par_lot(temp_windows):
+    messages = []
+    Nettoyage({'temp_windows': True}).estimer(lambda v, m: messages.append((v, m)))
+    releves = [m for _, m in messages if "relevés" in m]
+    assert releves[-1] == "Estimation: 600 fichiers relevés..."
+    assert len(releves) == 3
+
+    # Deuxième estimation : rapportée à la première, avant la fin de la racine
+    valeurs = []
+    Nettoyage({'temp_windows': True}).estimer(lambda v, m: valeurs.append(v))
+    assert [v for v in valeurs if 0 < v < 90]
+    assert valeurs == sorted(valeurs)
+
+
+def test_cache_firefox_seul_vide(tmp_path, monkeypatch):
+    profils = tmp_path / "profil" / "AppData" / "Local" / "Mozilla" / "Firefox" / "Profiles"
+    conserves = []
+    for nom in ("abcd.default-release", "efgh.travail"):
+        profil = profils / nom
+        (profil / "cache2" / "entries").mkdir(parents=True)
+        (profil / "cache2" / "entries" / "0A1B").write_bytes(b"x" * 100)
+        (profil / "startupCache").mkdir()
+        (profil / "startupCache" / "startupCache.8.little").write_bytes(b"x")
+        (profil / "storage" / "default").mkdir(parents=True)
+        for fichier in ("places.sqlite", "prefs.js", "logins.json",
+                        "storage/default/ls-archive.sqlite"):
+            (profil / fichier).write_bytes(b"donnees")
+            conserves.append(profil / fichier)
+    monkeypatch.setenv("USERPROFILE", str(tmp_path / "profil"))
+
+    tache = Nettoyage({'browser_cache': True})
+    estimation = tache.estimer()
+    assert estimation['fichiers'] == 4
+    resultats = tache.executer()
+
+    assert resultats['fichiers_supprimes'] == 4
+    assert all(chemin.exists() for chemin in conserves)
+    for nom in ("abcd.default-release", "efgh.travail"):
+        # Dossiers de cache vidés mais conservés
+        assert list((profils / nom / "cache2").iterdir()) == []
+        assert list((profils / nom / "startupCache").iterdir()) == []
+
+
+class Concurrence:
+    """Compte les tâches actives, au total et par périphérique."""
+
+    def __init__(self):
+        self.verrou = threading.Lock()
+        self.actives = {}
+        self.max_total = 0
+        self.max_par_peripherique = {}
+
+    def entrer(self, cle):
+        with self.verrou:
+            self.actives[cle] = self.actives.get(cle, 0) + 1
+            self.max_total = max(self.max_total, sum(self.actives.values()))
+            self.max_par_peripherique[cle] = max(
+                self.max_par_peripherique.get(cle, 0), self.actives[cle])
+
+    def sortir(self, cle):
+        with self.verrou:
+            self.actives[cle] -= 1
+
+
+def test_executer_par_peripherique_limites():
+    concurrence = Concurrence()
+    taches = [(f"disque{i % 3}", i) for i in range(12)]
+
+    def travailler(tache):
+        cle = f"disque{tache % 3}"
+        concurrence.entrer(cle)
+        time.sleep(0.02)
+        concurrence.sortir(cle)
+        return tache * 10
+
+    resultats = dict(executer_par_peripherique(taches, travailler, nb_max=4, limite=2))
+    assert resultats == {i: i * 10 for i in range(12)}
+    assert concurrence.max_total == 4
+    assert concurrence.max_par_peripherique == {
+        "disque0": 2, "disque1": 2, "disque2": 2}
+
+
+def test_executer_par_peripherique_arret():
+    appels = []
+    resultats = list(executer_par_peripherique(
+        [("d", i) for i in range(5)], appels.append, doit_continuer=lambda: False))
+    assert resultats == [] and appels == []
+
+
+def test_nettoyage_parallele_par_peripherique(tmp_path, monkeypatch):
+    """Racines sur deux périphériques simulés ; compteurs fusionnés par option."""
+    profil = tmp_path / "profil"
+    local = profil / "AppData" / "Local"
+    racines = {}
+    for i in range(3):
+        racines[f"firefox{i}"] = (
+            local / "Mozilla" / "Firefox" / "Profiles" / f"p{i}" / "cache2")
+    racines["chrome"] = local / "Google" / "Chrome" / "User Data" / "Default" / "Cache"
+    racines["temp_user"] = local / "Temp"
+    racines["temp_windows"] = tmp_path / "Windows" / "Temp"
+    for nom, racine in racines.items():
+        (racine / "sous").mkdir(parents=True)
+        for j in range(5):
+            (racine / ("sous" if j % 2 else "") / f"{nom}-{j}.tmp").write_bytes(b"x" * 10)
+    monkeypatch.setenv("USERPROFILE", str(profil))
+    monkeypatch.setenv("TEMP", str(racines["temp_windows"]))
+    monkeypatch.setenv("TMP", "")
+
+    # Caches navigateurs sur "ssd", Temp sur "hdd"
+    def peripherique_simule(chemin):
+        return "hdd" if os.path.basename(chemin) == "Temp" else "ssd"
+
+    concurrence = Concurrence()
+    vider = MoteurSuppression.vider
+
+    def vider_compte(moteur, racine, compteurs):
+        cle = peripherique_simule(racine)
+        concurrence.entrer(cle)
+        try:
+            time.sleep(0.05)
+            return vider(moteur, racine, compteurs)
+        finally:
+            concurrence.sortir(cle)
+
+    monkeypatch.setattr(nettoyage, "peripherique", peripherique_simule)
+    monkeypatch.setattr(MoteurSuppression, "vider", vider_compte)
+    resultats = Nettoyage({'temp_windows': True, 'temp_user': True,
+                           'browser_cache': True}).executer()
+
+    assert concurrence.max_total == 4
+    assert concurrence.max_par_peripherique == {"ssd": 2, "hdd": 2}
+    categories = resultats['categories']
+    assert categories['browser_cache']['fichiers'] == 20
+    assert categories['browser_cache']['octets'] == 200
+    assert categories['temp_user']['fichiers'] == 5
+    assert categories['temp_windows']['fichiers'] == 5
+    # Sous-dossiers "sous" vidés puis retirés, un par racine
+    assert categories['browser_cache']['dossiers'] == 4
+    assert resultats['fichiers_supprimes'] == 30
+    assert resultats['espace_libere'] == 300
+    assert resultats['erreurs'] == 0
+    assert all(list(racine.iterdir()) == [] for racine in racines.values())
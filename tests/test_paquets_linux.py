@@ -0,0 +1,108 @@
+"""Tests de l'inventaire des paquets Linux (paquets_linux.py) sur des fichiers enregistrés."""
+
+import os
+import sys
+
+import pytest
+
+import paquets_linux
+from paquets_linux import lire_rpm, lire_statut_dpkg, paquet_dpkg
+
+DONNEES = os.path.join(os.path.dirname(__file__), "donnees")
+RECOPIE = "import shutil, sys; shutil.copyfileobj(open(sys.argv[1], 'rb'), sys.stdout.buffer)"
+
+
+@pytest.fixture
+def paquets_dpkg():
+    return {p.nom: p for p in lire_statut_dpkg(os.path.join(DONNEES, "dpkg_status"))}
+
+
+@pytest.fixture
+def rpm_enregistre(monkeypatch):
+    """lire_rpm rejoue la sortie de rpm -qa enregistrée dans rpm_qa.txt."""
+    lire = paquets_linux.lire_csv_processus
+
+    def rejouer(cmd, **options):
+        assert cmd[:2] == ["rpm", "-qa"]
+        return lire([sys.executable, "-c", RECOPIE,
+                     os.path.join(DONNEES, "rpm_qa.txt")], **options)
+
+    monkeypatch.setattr(paquets_linux, "lire_csv_processus", rejouer)
+
+
+def test_dpkg_paquets_installes(paquets_dpkg):
+    assert sorted(paquets_dpkg) == [
+        "bash", "bloque", "declencheurs", "libc6", "sans-version"]
+    bash = paquets_dpkg["bash"]
+    assert bash.version == "5.2.15-2+b2"
+    assert bash.architecture == "amd64"
+    assert bash.taille == 7164 * 1024
+    # Pas de dossier d'installation pour un paquet dpkg
+    assert bash.chemin == ""
+    assert paquets_dpkg["bloque"].statut == "hold ok installed"
+    assert paquets_dpkg["bloque"].version == "1:9.9-1"
+
+
+def test_dpkg_description_sur_plusieurs_lignes(paquets_dpkg):
+    # Les lignes de continuation "Package: ..." et "Version: ..." de la
+    # description de bash ne sont pas des champs
+    assert "ceci" not in " ".join(paquets_dpkg)
+    assert paquets_dpkg["bash"].version == "5.2.15-2+b2"
+    # Dernier paragraphe sans fin de ligne finale
+    assert paquets_dpkg["bloque"].taille == 1024
+
+
+def test_dpkg_etats_non_installes_exclus(paquets_dpkg):
+    for nom in ("ancien-outil", "casse", "purge", "deballe"):
+        assert nom not in paquets_dpkg
+    assert paquets_dpkg["declencheurs"].statut == "install ok triggers-pending"
+
+
+def test_dpkg_sans_version(paquets_dpkg):
+    paquet = paquets_dpkg["sans-version"]
+    assert paquet.version == ""
+    assert paquet.taille == 0
+    # Les champs d'un paragraphe ne débordent pas sur le suivant
+    assert paquets_dpkg["declencheurs"].version == "4.0-2"
+
+
+def test_paquet_dpkg_liste_de_fichiers(tmp_path):
+    for nom in ("bash.list", "libc6:amd64.list", "libc6:i386.md5sums", "a+b.list"):
+        (tmp_path / nom).write_text("")
+    dossier = str(tmp_path)
+    assert paquet_dpkg("bash", dossier)
+    # Multi-Arch: same : liste qualifiée par l'architecture
+    assert paquet_dpkg("libc6", dossier)
+    assert paquet_dpkg("a+b", dossier)
+    assert not paquet_dpkg("libc", dossier)
+    assert not paquet_dpkg("firefox", dossier)
+
+
+def test_dpkg_fichier_vide(tmp_path):
+    chemin = tmp_path / "status"
+    chemin.write_bytes(b"")
+    assert list(lire_statut_dpkg(str(chemin))) == []
+
+
+def test_dpkg_progression(tmp_path):
+    paragraphe = b"Package: p%d\nStatus: install ok installed\nVersion: 1\n\n"
+    chemin = tmp_path / "status"
+    chemin.write_bytes(b"".join(paragraphe % i for i in range(2000)))
+    fractions = []
+    assert len(list(lire_statut_dpkg(str(chemin), fractions.append))) == 2000
+    assert fractions == sorted(fractions) and 0 < fractions[-1] < 1
+
+
+def test_rpm(rpm_enregistre):
+    paquets = list(lire_rpm())
+    assert [(p.nom, p.version, p.architecture) for p in paquets] == [
+        ("bash", "5.2.26-1.fc40", "x86_64"),
+        ("kernel-core", "6.8.5-301.fc40", "x86_64"),
+        ("glibc", "2.39-4.fc40", "i686"),
+        ("glibc", "2.39-4.fc40", "x86_64"),
+        ("sans-release", "1.0", "noarch"),
+        ("sans-version", "", "noarch"),
+    ]
+    assert paquets[0].taille == 8265436
+    assert paquets[4].taille == 0
+    assert {p.source for p in paquets} == {"rpm"}
@@ -0,0 +1,60 @@
+"""Tests du parcours parallèle (parcours.py)."""
+
+import os
+
+from analyse_dossiers import RechercheDossiersVides
+from parcours import ParcoursParallele
+
+
+def creer_arbre(racine, chemins):
+    for chemin in chemins:
+        complet = os.path.join(racine, chemin)
+        if chemin.endswith("/"):
+            os.makedirs(complet, exist_ok=True)
+        else:
+            os.makedirs(os.path.dirname(complet), exist_ok=True)
+            open(complet, "w").close()
+
+
+def test_parcours_transmet_chaque_dossier_avant_ses_enfants(racine):
+    creer_arbre(racine, ["a/b/c/", "a/f.txt", "d/"])
+    vus = []
+    with ParcoursParallele(str(racine), nb_workers=4) as parcours:
+        for entree in parcours:
+            if entree.parent is not None:
+                assert entree.parent in vus
+            vus.append(entree.chemin)
+    assert len(vus) == 5
+
+
+def test_erreur_inattendue_publiee_avec_le_dossier(racine, monkeypatch):
+    creer_arbre(racine, ["vide/", "casse/x/", "plein/f.txt"])
+    lister = ParcoursParallele._lister
+
+    def lister_fragile(self, chemin, parent):
+        if os.path.basename(chemin) == "casse":
+            raise RuntimeError("panne simulée")
+        return lister(self, chemin, parent)
+
+    monkeypatch.setattr(ParcoursParallele, "_lister", lister_fragile)
+    with ParcoursParallele(str(racine), nb_workers=2) as parcours:
+        entrees = {os.path.basename(e.chemin): e for e in parcours}
+    assert isinstance(entrees["casse"].erreur, RuntimeError)
+    assert entrees["casse"].dossiers == []
+
+    # Le dossier en erreur n'est pas vide, mais ses voisins sont bien signalés
+    trouves = []
+    tache = RechercheDossiersVides(str(racine), utiliser_cache=False)
+    tache.executer(lot=trouves.extend)
+    assert trouves == [os.path.join(str(racine), "vide")]
+
+
+def test_exclusion_et_annulation(racine):
+    creer_arbre(racine, ["garder/a/", "exclu/b/"])
+    with ParcoursParallele(str(racine),
+                           exclure=lambda d: d.name == "exclu") as parcours:
+        noms = {os.path.basename(e.chemin) for e in parcours}
+    assert "exclu" not in noms and "b" not in noms and "a" in noms
+
+    with ParcoursParallele(str(racine), doit_continuer=lambda: False) as parcours:
+        assert list(parcours) == []
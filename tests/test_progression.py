@@ -0,0 +1,110 @@
+"""Tests du suivi de progression (progression.py) : pourcentage et temps restant."""
+
+import pytest
+
+import progression
+from progression import (DELAI_ESTIMATION, EmetteurProgression, SuiviProgression,
+                         format_duree, taille_precedente)
+
+
+class Horloge:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.fixture
+def horloge(monkeypatch):
+    horloge = Horloge()
+    monkeypatch.setattr(progression.time, "monotonic", horloge)
+    return horloge
+
+
+def test_aucune_unite_faite_pas_d_estimation(horloge):
+    valeurs = []
+    suivi = SuiviProgression(valeurs.append, total=100)
+    horloge.t += DELAI_ESTIMATION * 10
+    suivi.avancer(0)
+    assert suivi.fraction() == 0.0
+    assert suivi.restant is None
+    assert valeurs == [0]
+
+
+def test_total_nul_ou_inconnu(horloge):
+    for suivi in (SuiviProgression(total=0), SuiviProgression()):
+        horloge.t += DELAI_ESTIMATION * 10
+        suivi.avancer(0)
+        suivi.avancer(5)
+        assert suivi.fraction() == 0.0
+        assert suivi.restant is None
+
+
+def test_estimation_apres_le_delai(horloge):
+    suivi = SuiviProgression(total=100)
+    horloge.t += DELAI_ESTIMATION / 2
+    suivi.avancer(10)
+    # Trop tôt : débit pas encore représentatif
+    assert suivi.restant is None
+    horloge.t += DELAI_ESTIMATION * 2
+    suivi.avancer(15)
+    # 25 % en 2,5 s : 7,5 s restantes
+    assert suivi.restant == pytest.approx(7.5)
+    suivi.terminer(complet=False)
+    assert suivi.restant is None
+
+
+def test_valeurs_entre_debut_et_fin(horloge):
+    valeurs = []
+    suivi = SuiviProgression(valeurs.append, total=10, debut=30, fin=90)
+    for _ in range(10):
+        horloge.t += 1
+        suivi.avancer()
+    # Jamais la valeur de fin avant terminer()
+    assert valeurs[0] == 36 and valeurs[-1] == 89
+    assert valeurs == sorted(valeurs)
+
+
+def test_decouverte_du_total(horloge):
+    suivi = SuiviProgression(total=None)
+    suivi.decouvrir(10)
+    suivi.avancer(5)
+    assert suivi.fraction() == 0.5
+    suivi.decouvrir(4)
+    assert suivi.fraction() == 0.5
+    suivi.decouvrir(20)
+    assert suivi.fraction() == 0.25
+
+
+def test_taille_de_reference():
+    suivi = SuiviProgression(cle="disque:/")
+    suivi.avancer(40)
+    suivi.terminer()
+    assert taille_precedente("disque:/") == 40
+    suivant = SuiviProgression(cle="disque:/")
+    suivant.avancer(10)
+    assert suivant.fraction() == 0.25
+    # Un travail interrompu ne remplace pas la référence
+    suivant.terminer(complet=False)
+    assert taille_precedente("disque:/") == 40
+
+
+@pytest.mark.parametrize("secondes, texte", [
+    (0, "0 s"), (44.6, "45 s"), (185, "3 min 05 s"), (4800, "1 h 20 min")])
+def test_format_duree(secondes, texte):
+    assert format_duree(secondes) == texte
+
+
+def test_emetteur_filtre_les_doublons(horloge):
+    envoyes = []
+    emetteur = EmetteurProgression(lambda *a: envoyes.append(a))
+    for _ in range(100):
+        emetteur(10)
+    # Nouveau message, même valeur : au plus un envoi par intervalle
+    emetteur(10, "message")
+    horloge.t += 1
+    emetteur(10, "autre message")
+    emetteur(11.7)
+    assert envoyes == [(10,), (10, "autre message"), (11,)]
+    assert emetteur.envois == 3 and emetteur.ignores == 100
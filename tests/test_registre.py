@@ -0,0 +1,157 @@
+"""Tests de l'inventaire du registre (registre.py) sur un registre factice."""
+
+import sys
+
+import pytest
+
+from registre import (CLE_UNINSTALL, CLE_UNINSTALL_WOW, FournisseurMemoire,
+                      FournisseurWinreg, InventaireRegistre)
+
+
+class FausseCle:
+    def __init__(self, sous_cles=None, valeurs=None, ecriture=0):
+        self.sous_cles = sous_cles or {}
+        self.valeurs = valeurs or {}
+        self.ecriture = ecriture
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FauxWinreg:
+    """
+    Module winreg factice : {(ruche, chemin): {sous_clé: {valeur: donnée}}}.
+    Mêmes erreurs que winreg : OSError pour une clé, une valeur ou un index
+    absents.
+    """
+
+    HKEY_LOCAL_MACHINE = "HKLM"
+    HKEY_CURRENT_USER = "HKCU"
+    KEY_READ = 0x20019
+    KEY_WOW64_64KEY = 0x0100
+
+    def __init__(self, cles):
+        self.cles = cles
+        self.ouvertures = []
+
+    def OpenKey(self, cle, sous_cle, reserve=0, acces=KEY_READ):
+        self.ouvertures.append((cle, sous_cle, acces))
+        if isinstance(cle, FausseCle):
+            if sous_cle not in cle.sous_cles:
+                raise FileNotFoundError(2, "clé introuvable", sous_cle)
+            return cle.sous_cles[sous_cle]
+        if (cle, sous_cle) not in self.cles:
+            raise FileNotFoundError(2, "clé introuvable", sous_cle)
+        return FausseCle({nom: FausseCle(valeurs=valeurs, ecriture=valeurs.get('_ecriture', 0))
+                          for nom, valeurs in self.cles[(cle, sous_cle)].items()}, ecriture=1)
+
+    def EnumKey(self, cle, index):
+        noms = list(cle.sous_cles)
+        if index >= len(noms):
+            raise OSError(259, "plus de données")
+        return noms[index]
+
+    def QueryInfoKey(self, cle):
+        return len(cle.sous_cles), len(cle.valeurs), cle.ecriture
+
+    def QueryValueEx(self, cle, nom):
+        if nom.startswith('_') or nom not in cle.valeurs:
+            raise FileNotFoundError(2, "valeur introuvable", nom)
+        return cle.valeurs[nom], 1
+
+
+JAVA = {'DisplayName': 'Java 7 Update 80', 'DisplayVersion': '7.0.800',
+        'UninstallString': 'MsiExec.exe /X{26A24AE4}', 'Publisher': 'Oracle'}
+
+
+@pytest.fixture
+def faux_winreg(monkeypatch):
+    """Installe un winreg factice ; les tests remplissent faux_winreg.cles."""
+    module = FauxWinreg({})
+    monkeypatch.setitem(sys.modules, "winreg", module)
+    return module
+
+
+def test_enumeration_des_trois_emplacements(faux_winreg):
+    faux_winreg.cles.update({
+        ("HKLM", CLE_UNINSTALL): {'{A}': {'DisplayName': 'Programme 64'}},
+        ("HKLM", CLE_UNINSTALL_WOW): {'{B}': {'DisplayName': 'Programme 32'}},
+        ("HKCU", CLE_UNINSTALL): {'Outil': {'DisplayName': 'Outil utilisateur'},
+                                  'Vide': {}},
+    })
+    cles = list(FournisseurWinreg().lire_cles())
+    assert [(source, sous_cle) for source, sous_cle, _ in cles] == [
+        ('HKLM', '{A}'), ('HKLM32', '{B}'), ('HKCU', 'Outil'), ('HKCU', 'Vide')]
+    assert cles[3][2] == {}
+    # Vue 64 bits explicite pour HKLM, même depuis un Python 32 bits
+    acces = {sous_cle: acces for cle, sous_cle, acces in faux_winreg.ouvertures
+             if cle == "HKLM"}
+    assert all(a & FauxWinreg.KEY_WOW64_64KEY for a in acces.values())
+
+
+def test_emplacement_absent_ignore(faux_winreg):
+    faux_winreg.cles[("HKCU", CLE_UNINSTALL)] = {'Outil': {'DisplayName': 'Outil'}}
+    assert [source for source, _, _ in FournisseurWinreg().lire_cles()] == ['HKCU']
+    assert FournisseurWinreg().signature().startswith("HKLM:-;HKLM32:-;HKCU:1:")
+
+
+def test_valeurs_manquantes(faux_winreg):
+    faux_winreg.cles[("HKLM", CLE_UNINSTALL)] = {
+        '{A}': {'DisplayName': 'Sans version'},
+        '{B}': {'DisplayVersion': '1.0', 'UninstallString': 'x'},
+        '{C}': {'DisplayName': '  ', 'DisplayVersion': '2.0'},
+        '{D}': {'DisplayName': 'Date DWORD', 'InstallDate': 20240131},
+    }
+    programmes = InventaireRegistre(FournisseurWinreg()).programmes()
+    assert [p.nom for p in programmes] == ['Sans version', 'Date DWORD']
+    sans_version, date = programmes
+    assert sans_version.version == sans_version.chemin == sans_version.editeur == ''
+    assert sans_version.desinstallation == ''
+    assert date.date_installation == '20240131'
+
+
+def test_deduplication_wow6432node(faux_winreg):
+    faux_winreg.cles.update({
+        ("HKLM", CLE_UNINSTALL): {'{26A24AE4}': JAVA,
+                                  '{VC64}': {'DisplayName': 'Visual C++ 2015', 'DisplayVersion': '14.0'}},
+        ("HKLM", CLE_UNINSTALL_WOW): {'{26a24ae4}': JAVA,
+                                      '{VC86}': {'DisplayName': 'Visual C++ 2015', 'DisplayVersion': '14.0'}},
+        ("HKCU", CLE_UNINSTALL): {'{26A24AE4}': JAVA},
+    })
+    inventaire = InventaireRegistre(FournisseurWinreg())
+    sources = sorted((p.nom, p.source) for p in inventaire.programmes())
+    # Même sous-clé dans les deux vues : une seule fois, depuis HKLM ;
+    # deux installations 32 et 64 bits (sous-clés distinctes) : conservées ;
+    # une installation par utilisateur reste distincte
+    assert sources == [('Java 7 Update 80', 'HKCU'), ('Java 7 Update 80', 'HKLM'),
+                       ('Visual C++ 2015', 'HKLM'), ('Visual C++ 2015', 'HKLM32')]
+    assert inventaire.chercher('Java 7 Update 80').source == 'HKLM'
+
+
+def test_versions_differentes_non_dedupliquees():
+    fournisseur = FournisseurMemoire({
+        'HKLM': {'{A}': {'DisplayName': 'Outil', 'DisplayVersion': '2.0'}},
+        'HKLM32': {'{A}': {'DisplayName': 'Outil', 'DisplayVersion': '1.0'}},
+    })
+    versions = [p.version for p in InventaireRegistre(fournisseur).programmes()]
+    assert versions == ['2.0', '1.0']
+
+
+def test_signature_suit_les_sous_cles(faux_winreg):
+    faux_winreg.cles[("HKLM", CLE_UNINSTALL)] = {'{A}': {'DisplayName': 'A', '_ecriture': 5}}
+    avant = FournisseurWinreg().signature()
+    faux_winreg.cles[("HKLM", CLE_UNINSTALL)]['{A}']['_ecriture'] = 9
+    assert FournisseurWinreg().signature() != avant
+
+
+def test_instantane_duree_de_vie_et_invalidation():
+    fournisseur = FournisseurMemoire({'HKLM': {'{A}': {'DisplayName': 'A'}}})
+    inventaire = InventaireRegistre(fournisseur, duree_vie=3600)
+    assert len(inventaire.programmes()) == 1
+    fournisseur.cles['HKLM']['{B}'] = {'DisplayName': 'B'}
+    assert len(inventaire.programmes()) == 1
+    inventaire.invalider()
+    assert [p.nom for p in inventaire.programmes()] == ['A', 'B']
@@ -0,0 +1,79 @@
+"""Tests du relevé des ports ouverts (securite.py) sur des tables /proc/net."""
+
+import functools
+import socket
+import sys
+
+import pytest
+
+import securite
+from securite import _ports_linux, ports_ouverts
+
+ENTETE = ("  sl  local_address rem_address   st tx_queue rx_queue tr tm->when "
+          "retrnsmt   uid  timeout inode ref pointer drops\n")
+
+
+def table(*sockets):
+    return ENTETE + "".join(
+        f"{i:4d}: {locale} {distante} {etat} 00000000:00000000 00:00000000 "
+        f"00000000     0        0 {900000000 + i} 2 0000000000000000 0\n"
+        for i, (locale, distante, etat) in enumerate(sockets))
+
+
+@pytest.fixture
+def tables(tmp_path):
+    (tmp_path / "tcp").write_text(table(
+        ("0100007F:1F90", "00000000:0000", "0A"),   # 127.0.0.1:8080 en écoute
+        ("0100007F:C350", "0100007F:1F90", "01"),   # connexion établie
+    ))
+    (tmp_path / "udp").write_text(table(
+        ("00000000:0035", "00000000:0000", "07"),   # 0.0.0.0:53, service
+        ("0100007F:E4A1", "00000000:0000", "07"),   # 58529 : client non connecté
+        ("0100007F:9C41", "0100007F:0035", "07"),   # adresse distante : exclue
+        ("00000000:0000", "00000000:0000", "07"),   # aucun port : exclue
+        ("0100007F:D625", "0100007F:0035", "01"),   # socket connectée
+    ))
+    return [(str(tmp_path / "tcp"), "TCP", socket.AF_INET, "0A"),
+            (str(tmp_path / "udp"), "UDP", socket.AF_INET, "07")]
+
+
+def test_udp_lie_sans_adresse_distante(tables):
+    ports = _ports_linux(tables, plage_ephemere=(32768, 60999))
+    assert [(p['protocole'], p['adresse'], p['port'], p['ephemere']) for p in ports] == [
+        ("TCP", "127.0.0.1", 8080, False),
+        ("UDP", "0.0.0.0", 53, False),
+        ("UDP", "127.0.0.1", 58529, True),
+    ]
+
+
+def test_remarque_udp_ephemere(tables, monkeypatch):
+    monkeypatch.setattr(securite.platform, "system", lambda: "Linux")
+    monkeypatch.setattr(securite, "_ports_linux", functools.partial(
+        _ports_linux, tables, (32768, 60999)))
+    remarques = {p['port']: p['remarque'] for p in ports_ouverts(None)}
+    assert remarques[53] == "Exposé sur toutes les interfaces"
+    assert remarques[58529] == (
+        "Local uniquement ; port UDP éphémère, socket cliente probable")
+    assert all('ephemere' not in p for p in ports_ouverts(None))
+
+
+def test_plage_ephemere_illisible(tmp_path):
+    assert securite._plage_ephemere(str(tmp_path / "absent")) == securite.PLAGE_EPHEMERE_DEFAUT
+    (tmp_path / "plage").write_text("1024\t4999\n")
+    assert securite._plage_ephemere(str(tmp_path / "plage")) == (1024, 4999)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc/net")
+def test_sockets_reelles():
+    serveur = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    with serveur, client:
+        serveur.bind(("127.0.0.1", 0))
+        client.connect(("127.0.0.1", 9))
+        port_serveur = serveur.getsockname()[1]
+        port_client = client.getsockname()[1]
+        # Plage éphémère vide : aucune socket marquée cliente
+        udp = {p['port']: p for p in _ports_linux(plage_ephemere=(0, -1))
+               if p['protocole'] == "UDP"}
+    assert port_serveur in udp and not udp[port_serveur]['ephemere']
+    assert port_client not in udp
@@ -0,0 +1,115 @@
+"""Tests de la lecture CSV en flux des sous-processus (systeme.lire_csv_processus)."""
+
+import csv
+import io
+import random
+import sys
+import time
+
+import pytest
+
+from systeme import lire_csv_processus
+
+CHAMPS = ["DisplayName", "DisplayVersion", "InstallLocation"]
+
+# Recopie un fichier enregistré sur la sortie standard, octet pour octet
+RECOPIE = "import shutil, sys; shutil.copyfileobj(open(sys.argv[1], 'rb'), sys.stdout.buffer)"
+
+ALPHABET = "abcXYZ019 ,;\"'\t\r\n\r\néèßü()[]{}\\/.-_"
+
+
+def sortie_enregistree(tmp_path, texte):
+    """Commande rejouant texte comme la sortie d'un processus."""
+    chemin = tmp_path / "sortie.csv"
+    chemin.write_bytes(texte.encode("utf-8"))
+    return [sys.executable, "-c", RECOPIE, str(chemin)]
+
+
+def convertir_en_csv(lignes, champs=CHAMPS):
+    """Comme ConvertTo-Csv -NoTypeInformation : tout entre guillemets, CRLF."""
+    tampon = io.StringIO(newline="")
+    ecrivain = csv.writer(tampon, quoting=csv.QUOTE_ALL, lineterminator="\r\n")
+    ecrivain.writerow(champs)
+    ecrivain.writerows(lignes)
+    return tampon.getvalue()
+
+
+def aleatoire_texte(aleatoire, longueur_max=30):
+    return "".join(aleatoire.choice(ALPHABET)
+                   for _ in range(aleatoire.randrange(longueur_max)))
+
+
+def normaliser(valeur):
+    # Sortie lue en mode texte : fins de ligne universelles
+    return valeur.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def test_champs_entre_guillemets(tmp_path):
+    texte = convertir_en_csv([
+        ["Microsoft Visual C++ 2015-2022, x64", "14.38", "C:\\Program Files\\VC"],
+        ["Outil \"pro\"", "1.0", ""],
+        ["Nom sur\r\ndeux lignes", "2.0", "D:\\Apps, Outils"],
+    ])
+    lignes = list(lire_csv_processus(sortie_enregistree(tmp_path, texte)))
+    assert [tuple(l) for l in lignes] == [
+        ("Microsoft Visual C++ 2015-2022, x64", "14.38", "C:\\Program Files\\VC"),
+        ("Outil \"pro\"", "1.0", ""),
+        ("Nom sur\ndeux lignes", "2.0", "D:\\Apps, Outils"),
+    ]
+    assert lignes[0].DisplayVersion == "14.38"
+
+
+@pytest.mark.parametrize("graine", range(20))
+def test_fuzz(tmp_path, graine):
+    aleatoire = random.Random(graine)
+    attendu = [[aleatoire_texte(aleatoire) for _ in CHAMPS]
+               for _ in range(aleatoire.randrange(1, 200))]
+    lignes = list(lire_csv_processus(sortie_enregistree(tmp_path, convertir_en_csv(attendu))))
+    assert [list(l) for l in lignes] == [[normaliser(v) for v in l] for l in attendu]
+
+
+def test_enregistrement_10k_programmes(tmp_path):
+    aleatoire = random.Random(10_000)
+    attendu = [[f"Programme {i}, édition {aleatoire_texte(aleatoire, 12)}",
+                f"{i % 30}.{i % 7}", f"C:\\Program Files\\P{i}"]
+               for i in range(10_000)]
+    lignes = list(lire_csv_processus(sortie_enregistree(tmp_path, convertir_en_csv(attendu))))
+    assert len(lignes) == 10_000
+    assert [list(l) for l in lignes] == [[normaliser(v) for v in l] for l in attendu]
+
+
+@pytest.mark.parametrize("fin", [
+    '"Java 7","7.0', '"Java 7","7.0",', '"Java 7', '"Nom\r\nsur deux', '"Java 7","7.0","C:\\'])
+def test_derniere_ligne_tronquee_ignoree(tmp_path, fin):
+    texte = convertir_en_csv([["Complet", "1.0", "C:\\"]]) + fin
+    lignes = list(lire_csv_processus(sortie_enregistree(tmp_path, texte)))
+    assert [tuple(l) for l in lignes] == [("Complet", "1.0", "C:\\")]
+
+
+def test_ligne_courte_completee(tmp_path):
+    texte = '"DisplayName","DisplayVersion","InstallLocation"\r\n"A"\r\n"B","2","x","trop"\r\n'
+    lignes = list(lire_csv_processus(sortie_enregistree(tmp_path, texte)))
+    assert [tuple(l) for l in lignes] == [("A", "", ""), ("B", "2", "x")]
+
+
+def test_sortie_vide(tmp_path):
+    assert list(lire_csv_processus(sortie_enregistree(tmp_path, ""))) == []
+
+
+def test_lignes_transmises_avant_la_fin_du_processus():
+    script = ("import sys, time; print('\"Nom\",\"Version\"'); "
+              "print('\"Premier\",\"1\"', flush=True); time.sleep(30)")
+    debut = time.monotonic()
+    lecture = lire_csv_processus([sys.executable, "-c", script])
+    assert tuple(next(lecture)) == ("Premier", "1")
+    assert time.monotonic() - debut < 10
+    # Fermer le générateur arrête le processus
+    lecture.close()
+    assert time.monotonic() - debut < 10
+
+
+def test_delai_arrete_le_processus():
+    script = "import time; print('\"Nom\"', flush=True); time.sleep(30)"
+    debut = time.monotonic()
+    assert list(lire_csv_processus([sys.executable, "-c", script], delai=0.5)) == []
+    assert time.monotonic() - debut < 10